@@ -0,0 +1 @@
+"""Benchmarks for the dashboard API (not shipped with the bot)"""
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Benchmark the dashboard HTTP API against a fake Discord bot.
+
+Stands up the same ``MonroeApi`` app the entrypoints serve, backed by
+``fake_discord.build_bot`` instead of a gateway connection, and drives each
+endpoint over a real local socket. For every guild count it reports
+requests/sec, p50/p99 latency and traced memory per endpoint. Send endpoints
+also report how long the queued fan-out took to drain.
+
+    python benchmarks/bench_api.py
+    python benchmarks/bench_api.py --guilds 1,100 --latency 0.02 --rate-limit-ratio 0.05
+    python benchmarks/bench_api.py --sync-sends --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_discord import FakeDiscordConfig, build_bot  # noqa: E402
+from monroe_api import ApiSettings, MonroeApi  # noqa: E402
+
+SECRET = 'bench-secret'
+ENDPOINTS = ('status', 'status-cached', 'broadcast', 'qotd', 'announcement', 'moderation',
+             'moderation-during-broadcast')
+SEND_ENDPOINTS = ('broadcast', 'qotd', 'announcement')
+
+
+@dataclass
+class Result:
+    guilds: int
+    endpoint: str
+    requests: int
+    errors: int
+    seconds: float
+    rps: float
+    p50_ms: float
+    p99_ms: float
+    peak_mib: Optional[float] = None
+    fanout_seconds: Optional[float] = None
+    messages: Optional[int] = None
+    messages_per_second: Optional[float] = None
+    rate_limited: Optional[int] = None
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def build_request(endpoint, bot, etag, rng):
+    """(method, path, headers, json body) for one request to an endpoint"""
+    headers = {'Authorization': f'Bearer {SECRET}'}
+    if endpoint == 'status':
+        return 'GET', '/api/status', headers, None
+    if endpoint == 'status-cached':
+        return 'GET', '/api/status', {**headers, 'If-None-Match': etag or ''}, None
+    if endpoint == 'broadcast':
+        return 'POST', '/api/broadcast', headers, {'message': 'Benchmark broadcast', 'dashboard_user': 'bench'}
+    if endpoint == 'qotd':
+        return 'POST', '/api/qotd', headers, {'question': 'Benchmark question?', 'dashboard_user': 'bench'}
+    if endpoint == 'announcement':
+        return 'POST', '/api/announcement', headers, {
+            'title': 'Benchmark', 'content': 'Benchmark announcement', 'dashboard_user': 'bench'}
+    if endpoint in ('moderation', 'moderation-during-broadcast'):
+        guild = rng.choice(bot.guilds)
+        member = rng.choice(guild.members)
+        return 'POST', '/api/moderation', headers, {
+            'action': 'warn', 'user_id': str(member.id), 'guild_id': str(guild.id),
+            'reason': 'Benchmark', 'dashboard_user': 'bench'}
+    raise ValueError(f'Unknown endpoint: {endpoint}')
+
+
+async def drive(session, base_url, endpoint, bot, count, concurrency, etag, rng):
+    """Fire ``count`` requests with ``concurrency`` in flight; returns latencies, errors, bodies"""
+    latencies = []
+    bodies = []
+    errors = 0
+    remaining = iter(range(count))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            method, path, headers, body = build_request(endpoint, bot, etag, rng)
+            started = time.perf_counter()
+            async with session.request(method, base_url + path, headers=headers, json=body) as response:
+                payload = await response.read()
+                latencies.append(time.perf_counter() - started)
+                if response.status >= 400:
+                    errors += 1
+                elif response.status == 202:
+                    bodies.append(json.loads(payload))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, bodies
+
+
+async def wait_for_jobs(api, job_ids, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        jobs = [api.job_queue.get(job_id) for job_id in job_ids]
+        if all(job is None or job.done for job in jobs):
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+async def bench_guild_count(guilds, args) -> List[Result]:
+    config = FakeDiscordConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit_ratio=args.rate_limit_ratio,
+        retry_after=args.retry_after,
+        rate_limit_mode=args.rate_limit_mode,
+    )
+    if args.memory:
+        tracemalloc.start()
+    bot = build_bot(guilds, members_per_guild=args.members, config=config, shard_count=args.shards)
+    api = MonroeApi(bot, ApiSettings(
+        secret=SECRET,
+        host='127.0.0.1',
+        async_sends=not args.sync_sends,
+        max_in_flight=args.max_in_flight,
+        status_guild_limit=args.status_guild_limit,
+        rate_limit_global=args.global_rate or None,
+    ))
+    await bot.connect()
+
+    root = web.Application(client_max_size=api.settings.max_body_size)
+    root.add_subapp('/api', api.create_app())
+    runner = web.AppRunner(root, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base_url = f'http://127.0.0.1:{port}'
+
+    if args.memory:
+        current, _ = tracemalloc.get_traced_memory()
+        print(f'  setup: {guilds} guilds, {current / 2**20:.1f} MiB traced', file=sys.stderr)
+
+    rng = random.Random(config.seed)
+    results = []
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async with session.get(base_url + '/api/status', headers={'Authorization': f'Bearer {SECRET}'}) as response:
+            etag = response.headers.get('ETag')
+
+        for endpoint in args.endpoints:
+            is_send = endpoint in SEND_ENDPOINTS
+            count = args.send_requests if is_send else args.requests
+            concurrency = min(args.concurrency, count)
+            stats_before = asdict(bot.rest.stats)
+            if args.memory:
+                tracemalloc.reset_peak()
+
+            background = []
+            if endpoint == 'moderation-during-broadcast':
+                # Moderation latency while a broadcast to every guild is draining
+                _, _, background = await drive(session, base_url, 'broadcast', bot, 1, 1, etag, rng)
+
+            started = time.perf_counter()
+            latencies, errors, bodies = await drive(session, base_url, endpoint, bot, count, concurrency, etag, rng)
+            elapsed = time.perf_counter() - started
+
+            result = Result(
+                guilds=guilds,
+                endpoint=endpoint,
+                requests=count,
+                errors=errors,
+                seconds=round(elapsed, 3),
+                rps=round(count / elapsed, 1) if elapsed else 0.0,
+                p50_ms=round(percentile(latencies, 50) * 1000, 2),
+                p99_ms=round(percentile(latencies, 99) * 1000, 2),
+            )
+
+            if is_send:
+                job_ids = [body['job_id'] for body in bodies if 'job_id' in body]
+                if job_ids and not await wait_for_jobs(api, job_ids, args.drain_timeout):
+                    print(f'  {endpoint}: jobs still running after {args.drain_timeout}s', file=sys.stderr)
+                fanout = time.perf_counter() - started
+                messages = bot.rest.stats.messages - stats_before['messages']
+                result.fanout_seconds = round(fanout, 3)
+                result.messages = messages
+                result.messages_per_second = round(messages / fanout, 1) if fanout else 0.0
+            if background:
+                await wait_for_jobs(api, [body['job_id'] for body in background], args.drain_timeout)
+            result.rate_limited = bot.rest.stats.rate_limited - stats_before['rate_limited']
+
+            if args.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                result.peak_mib = round(peak / 2**20, 2)
+            results.append(result)
+
+    await runner.cleanup()
+    if args.memory:
+        tracemalloc.stop()
+    return results
+
+
+def print_table(results: List[Result]):
+    columns = ('guilds', 'endpoint', 'requests', 'errors', 'rps', 'p50_ms', 'p99_ms', 'peak_mib',
+               'fanout_seconds', 'messages_per_second', 'rate_limited')
+    rows = [[('-' if getattr(result, column) is None else str(getattr(result, column))) for column in columns]
+            for result in results]
+    widths = [max(len(column), *(len(row[i]) for row in rows)) for i, column in enumerate(columns)]
+    print('  '.join(column.rjust(widths[i]) for i, column in enumerate(columns)))
+    for row in rows:
+        print('  '.join(value.rjust(widths[i]) for i, value in enumerate(row)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--guilds', default='1,100,10000',
+                        help='comma separated guild counts (default: 1,100,10000)')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                        help=f'comma separated endpoints (default: all of {",".join(ENDPOINTS)})')
+    parser.add_argument('--requests', type=int, default=500, help='requests per read endpoint')
+    parser.add_argument('--send-requests', type=int, default=5, help='requests per send endpoint')
+    parser.add_argument('--concurrency', type=int, default=20, help='client requests in flight')
+    parser.add_argument('--members', type=int, default=25, help='members per fake guild')
+    parser.add_argument('--latency', type=float, default=0.02, help='simulated Discord REST latency (s)')
+    parser.add_argument('--jitter', type=float, default=0.01, help='random extra latency (s)')
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0, help='share of REST calls that get a 429')
+    parser.add_argument('--retry-after', type=float, default=0.25, help='simulated 429 retry_after (s)')
+    parser.add_argument('--rate-limit-mode', choices=('retry', 'raise'), default='retry')
+    parser.add_argument('--max-in-flight', type=int, default=ApiSettings.max_in_flight)
+    parser.add_argument('--global-rate', type=float, default=0,
+                        help='scheduler global requests/second; Discord allows 50 (default: 0, unpaced)')
+    parser.add_argument('--shards', type=int, default=None, help='fake an AutoShardedBot with this many shards')
+    parser.add_argument('--status-guild-limit', type=int, default=ApiSettings.status_guild_limit)
+    parser.add_argument('--sync-sends', action='store_true', help='benchmark with async_sends off')
+    parser.add_argument('--drain-timeout', type=float, default=600.0)
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='skip tracemalloc (faster, no memory column)')
+    parser.add_argument('--json', metavar='PATH', help='also write results as JSON')
+    args = parser.parse_args(argv)
+    args.guilds = [int(value) for value in args.guilds.split(',') if value]
+    args.endpoints = [value for value in args.endpoints.split(',') if value]
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f'unknown endpoints: {", ".join(sorted(unknown))}')
+    return args
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    results = []
+    for guilds in args.guilds:
+        print(f'Benchmarking {guilds} guilds...', file=sys.stderr)
+        results.extend(await bench_guild_count(guilds, args))
+
+    print_table(results)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f'\nmax RSS: {max_rss / 1024:.1f} MiB')
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump([asdict(result) for result in results], handle, indent=2)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
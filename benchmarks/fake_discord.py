@@ -0,0 +1,256 @@
+"""
+In-process stand-in for a connected discord.py bot.
+
+Just enough of ``commands.Bot``, ``Guild``, ``TextChannel`` and ``Member`` for
+``MonroeApi`` to run without a gateway connection. Every REST-shaped call
+(send, kick, ban, fetch) sleeps for a simulated latency, and a configurable
+share of them hit a 429 first, so fan-out and moderation paths behave roughly
+like they do against Discord.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import discord
+
+
+@dataclass
+class FakeDiscordConfig:
+    latency: float = 0.05
+    jitter: float = 0.02
+    # Share of REST calls that are rate limited before they go through
+    rate_limit_ratio: float = 0.0
+    retry_after: float = 0.5
+    # 'retry' sleeps retry_after and succeeds, like discord.py's HTTP client;
+    # 'raise' surfaces the 429 as an HTTPException
+    rate_limit_mode: str = 'retry'
+    seed: int = 1
+
+
+@dataclass
+class FakeDiscordStats:
+    calls: int = 0
+    rate_limited: int = 0
+    messages: int = 0
+    dms: int = 0
+    kicks: int = 0
+    bans: int = 0
+    by_route: Dict[str, int] = field(default_factory=dict)
+
+
+def _response(status, reason, headers=None):
+    return SimpleNamespace(status=status, reason=reason, headers=headers or {})
+
+
+class FakeRest:
+    """Shared latency/429 simulation for every fake REST call"""
+
+    def __init__(self, config: FakeDiscordConfig):
+        self.config = config
+        self.stats = FakeDiscordStats()
+        self._random = random.Random(config.seed)
+
+    async def call(self, route: str):
+        self.stats.calls += 1
+        self.stats.by_route[route] = self.stats.by_route.get(route, 0) + 1
+        if self.config.rate_limit_ratio and self._random.random() < self.config.rate_limit_ratio:
+            self.stats.rate_limited += 1
+            if self.config.rate_limit_mode == 'raise':
+                raise discord.HTTPException(
+                    _response(429, 'Too Many Requests', {'Retry-After': str(self.config.retry_after)}),
+                    'You are being rate limited.')
+            await asyncio.sleep(self.config.retry_after)
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class FakeMessage:
+    def __init__(self, rest: FakeRest, channel):
+        self._rest = rest
+        self.channel = channel
+
+    async def add_reaction(self, emoji):
+        await self._rest.call('PUT /channels/{channel_id}/messages/{message_id}/reactions')
+
+
+class FakeChannel:
+    def __init__(self, rest: FakeRest, guild, channel_id: int, name: str, position: int):
+        self._rest = rest
+        self.guild = guild
+        self.id = channel_id
+        self.name = name
+        self.position = position
+        self.mention = f'<#{channel_id}>'
+
+    def permissions_for(self, member):
+        return discord.Permissions(view_channel=True, send_messages=True, embed_links=True)
+
+    async def send(self, content=None, embed=None, **kwargs):
+        await self._rest.call('POST /channels/{channel_id}/messages')
+        self._rest.stats.messages += 1
+        return FakeMessage(self._rest, self)
+
+
+class FakeMember:
+    def __init__(self, rest: FakeRest, guild, user_id: int, name: str):
+        self._rest = rest
+        self.guild = guild
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.mention = f'<@{user_id}>'
+        self.bot = False
+
+    async def send(self, content=None, embed=None, **kwargs):
+        await self._rest.call('POST /users/@me/channels')
+        self._rest.stats.dms += 1
+
+    async def kick(self, reason=None):
+        await self.guild.kick(self, reason=reason)
+
+    async def ban(self, reason=None, **kwargs):
+        await self.guild.ban(self, reason=reason)
+
+
+class FakeGuild:
+    def __init__(self, rest: FakeRest, guild_id: int, name: str, me):
+        self._rest = rest
+        self.id = guild_id
+        self.name = name
+        self.me = me
+        self.chunked = True
+        self.text_channels: List[FakeChannel] = []
+        self._members: Dict[int, FakeMember] = {}
+
+    @property
+    def channels(self):
+        return self.text_channels
+
+    @property
+    def members(self):
+        return list(self._members.values())
+
+    @property
+    def member_count(self):
+        return len(self._members)
+
+    def get_member(self, user_id):
+        return self._members.get(user_id)
+
+    async def fetch_member(self, user_id):
+        await self._rest.call('GET /guilds/{guild_id}/members/{user_id}')
+        member = self._members.get(user_id)
+        if member is None:
+            raise discord.NotFound(_response(404, 'Not Found'), 'Unknown Member')
+        return member
+
+    async def kick(self, user, reason=None):
+        await self._rest.call('DELETE /guilds/{guild_id}/members/{user_id}')
+        if self._members.pop(user.id, None) is None:
+            raise discord.NotFound(_response(404, 'Not Found'), 'Unknown Member')
+        self._rest.stats.kicks += 1
+
+    async def ban(self, user, reason=None, **kwargs):
+        await self._rest.call('PUT /guilds/{guild_id}/bans/{user_id}')
+        self._members.pop(user.id, None)
+        self._rest.stats.bans += 1
+
+    async def bulk_ban(self, users, reason=None, **kwargs):
+        await self._rest.call('POST /guilds/{guild_id}/bulk-ban')
+        for user in users:
+            self._members.pop(user.id, None)
+        self._rest.stats.bans += len(users)
+        return SimpleNamespace(banned=list(users), failed=[])
+
+
+class FakeShardInfo:
+    """The parts of ``discord.ShardInfo`` the API reads"""
+
+    def __init__(self, shard_id: int, shard_count: int, latency: float):
+        self.id = shard_id
+        self.shard_count = shard_count
+        self.latency = latency
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakeBot:
+    """The parts of ``commands.Bot`` the API reads, with listener dispatch"""
+
+    def __init__(self, rest: FakeRest, shard_count: Optional[int] = None):
+        self.rest = rest
+        if shard_count:
+            # Looks like an AutoShardedBot to the API
+            self.shard_count = shard_count
+            self.shards = {shard_id: FakeShardInfo(shard_id, shard_count, 0.04 + shard_id / 1000)
+                           for shard_id in range(shard_count)}
+        self.user = SimpleNamespace(id=1, name='Monroe Bot', display_name='Monroe Bot')
+        self.latency = 0.042
+        self.start_time = None
+        self.guilds: List[FakeGuild] = []
+        self._guilds_by_id: Dict[int, FakeGuild] = {}
+        self._channels: Dict[int, FakeChannel] = {}
+        self._listeners: Dict[str, list] = {}
+        self._ready = False
+
+    def add_listener(self, func, name=None):
+        self._listeners.setdefault(name or func.__name__, []).append(func)
+
+    async def dispatch(self, event: str, *args):
+        for listener in self._listeners.get(event, []):
+            await listener(*args)
+
+    async def connect(self):
+        """Mark ready and fire on_ready, as the gateway would after IDENTIFY"""
+        self._ready = True
+        await self.dispatch('on_ready')
+
+    def is_ready(self):
+        return self._ready
+
+    def is_closed(self):
+        return False
+
+    def get_guild(self, guild_id):
+        return self._guilds_by_id.get(guild_id)
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+    def add_guild(self, guild: FakeGuild):
+        self.guilds.append(guild)
+        self._guilds_by_id[guild.id] = guild
+        for channel in guild.text_channels:
+            self._channels[channel.id] = channel
+
+
+CHANNEL_NAMES = ('general', 'announcements', 'qotd', 'chat', 'mod-log')
+
+
+def build_bot(guilds: int, members_per_guild: int = 25, config: FakeDiscordConfig = None,
+              shard_count: Optional[int] = None) -> FakeBot:
+    """A bot in ``guilds`` synthetic guilds, each with a few channels and members"""
+    rest = FakeRest(config or FakeDiscordConfig())
+    bot = FakeBot(rest, shard_count)
+    me = SimpleNamespace(id=bot.user.id)
+    next_id = 10_000
+    for number in range(guilds):
+        guild = FakeGuild(rest, next_id, f'Guild {number}', me)
+        if shard_count:
+            guild.shard_id = number % shard_count
+        next_id += 1
+        for position, name in enumerate(CHANNEL_NAMES):
+            guild.text_channels.append(FakeChannel(rest, guild, next_id, name, position))
+            next_id += 1
+        for member_number in range(members_per_guild):
+            # Members are shared across guilds the way real users are
+            user_id = 1_000_000 + (number * 7 + member_number) % (guilds * members_per_guild)
+            guild._members[user_id] = FakeMember(rest, guild, user_id, f'user{user_id}')
+        bot.add_guild(guild)
+    return bot
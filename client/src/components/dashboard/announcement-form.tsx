@@ -10,6 +10,7 @@ import { Megaphone, Loader2, Send } from "lucide-react";
 import { announcementSchema, type AnnouncementRequest } from "@shared/schema";
 import { apiRequest } from "@/lib/queryClient";
 import { useToast } from "@/hooks/use-toast";
+import { useIdempotencyKey } from "@/hooks/use-idempotency-key";
 
 interface AnnouncementFormProps {
   onBack: () => void;
@@ -18,6 +19,7 @@ interface AnnouncementFormProps {
 export default function AnnouncementForm({ onBack }: AnnouncementFormProps) {
   const { toast } = useToast();
   const queryClient = useQueryClient();
+  const idempotency = useIdempotencyKey();
 
   const form = useForm<AnnouncementRequest>({
     resolver: zodResolver(announcementSchema),
@@ -30,10 +32,13 @@ export default function AnnouncementForm({ onBack }: AnnouncementFormProps) {
 
   const announcementMutation = useMutation({
     mutationFn: async (data: AnnouncementRequest) => {
-      const response = await apiRequest("POST", "/api/bot/announcement", data);
+      const response = await apiRequest("POST", "/api/bot/announcement", data, {
+        "Idempotency-Key": idempotency.keyFor(data),
+      });
       return response.json();
     },
     onSuccess: (data) => {
+      idempotency.reset();
       toast({
         title: "Announcement sent successfully!",
         description: `Posted to ${data.channel || 'announcement channel'}`,
@@ -10,6 +10,7 @@ import { Megaphone, Loader2 } from "lucide-react";
 import { broadcastSchema, type BroadcastRequest } from "@shared/schema";
 import { apiRequest } from "@/lib/queryClient";
 import { useToast } from "@/hooks/use-toast";
+import { useIdempotencyKey } from "@/hooks/use-idempotency-key";
 
 interface BroadcastFormProps {
   onBack: () => void;
@@ -18,6 +19,7 @@ interface BroadcastFormProps {
 export default function BroadcastForm({ onBack }: BroadcastFormProps) {
   const { toast } = useToast();
   const queryClient = useQueryClient();
+  const idempotency = useIdempotencyKey();
 
   const form = useForm<BroadcastRequest>({
     resolver: zodResolver(broadcastSchema),
@@ -28,10 +30,13 @@ export default function BroadcastForm({ onBack }: BroadcastFormProps) {
 
   const broadcastMutation = useMutation({
     mutationFn: async (data: BroadcastRequest) => {
-      const response = await apiRequest("POST", "/api/bot/broadcast", data);
+      const response = await apiRequest("POST", "/api/bot/broadcast", data, {
+        "Idempotency-Key": idempotency.keyFor(data),
+      });
       return response.json();
     },
     onSuccess: () => {
+      idempotency.reset();
       toast({
         title: "Broadcast sent successfully!",
         description: "Your message has been sent to all connected servers.",
@@ -14,6 +14,7 @@ import { Shield, AlertTriangle, Hammer, Ban, Loader2, CheckCircle } from "lucide
 import { moderationSchema, type ModerationRequest } from "@shared/schema";
 import { apiRequest } from "@/lib/queryClient";
 import { useToast } from "@/hooks/use-toast";
+import { useIdempotencyKey } from "@/hooks/use-idempotency-key";
 import { useAuth } from "@/hooks/use-auth";
 import { z } from "zod";
 
@@ -87,6 +88,7 @@ export default function ModerationPanel() {
   const { toast } = useToast();
   const { isAdmin } = useAuth();
   const queryClient = useQueryClient();
+  const idempotency = useIdempotencyKey();
   const [selectedSeverity, setSelectedSeverity] = useState<string>("1");
 
   const form = useForm<ModerationFormData>({
@@ -104,10 +106,13 @@ export default function ModerationPanel() {
 
   const moderationMutation = useMutation({
     mutationFn: async (data: ModerationRequest) => {
-      const response = await apiRequest("POST", "/api/bot/moderation", data);
+      const response = await apiRequest("POST", "/api/bot/moderation", data, {
+        "Idempotency-Key": idempotency.keyFor(data),
+      });
       return response.json();
     },
     onSuccess: () => {
+      idempotency.reset();
       toast({
         title: "Moderation action completed",
         description: "The moderation action has been executed successfully.",
@@ -9,6 +9,7 @@ import { MessageCircle, Loader2, Send } from "lucide-react";
 import { qotdSchema, type QOTDRequest } from "@shared/schema";
 import { apiRequest } from "@/lib/queryClient";
 import { useToast } from "@/hooks/use-toast";
+import { useIdempotencyKey } from "@/hooks/use-idempotency-key";
 
 const sampleQuestions = [
   "What's your favorite 80s movie and why?",
@@ -30,6 +31,7 @@ interface QOTDFormProps {
 export default function QOTDForm({ onBack }: QOTDFormProps) {
   const { toast } = useToast();
   const queryClient = useQueryClient();
+  const idempotency = useIdempotencyKey();
 
   const form = useForm<QOTDRequest>({
     resolver: zodResolver(qotdSchema),
@@ -41,10 +43,13 @@ export default function QOTDForm({ onBack }: QOTDFormProps) {
 
   const qotdMutation = useMutation({
     mutationFn: async (data: QOTDRequest) => {
-      const response = await apiRequest("POST", "/api/bot/qotd", data);
+      const response = await apiRequest("POST", "/api/bot/qotd", data, {
+        "Idempotency-Key": idempotency.keyFor(data),
+      });
       return response.json();
     },
     onSuccess: (data) => {
+      idempotency.reset();
       toast({
         title: "QOTD sent successfully!",
         description: `Question posted to ${data.channel || 'default channel'}`,
@@ -20,7 +20,7 @@ import {
   CheckCircle2
 } from "lucide-react";
 import { useAuth } from "@/hooks/use-auth";
-import type { BotStatus } from "@shared/schema";
+import { useBotStatus } from "@/hooks/use-bot-status";
 import { cn } from "@/lib/utils";
 import { Zap, ZapOff, Activity } from 'lucide-react';
 
@@ -30,10 +30,7 @@ interface StatsCardsProps {
 
 export default function StatsCards({ onViewChange }: StatsCardsProps) {
   const { isAdmin } = useAuth();
-  const { data: botStatus, isLoading } = useQuery<BotStatus>({
-    queryKey: ["/api/bot/status"],
-    refetchInterval: 30000, // Refresh every 30 seconds
-  });
+  const { data: botStatus, isLoading } = useBotStatus();
 
   const { data: recentActivity = [] } = useQuery({
     queryKey: ["/api/activity"],
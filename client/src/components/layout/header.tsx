@@ -1,8 +1,7 @@
-import { useQuery } from "@tanstack/react-query";
 import { Button } from "@/components/ui/button";
 import { RefreshCw } from "lucide-react";
 import { queryClient } from "@/lib/queryClient";
-import type { BotStatus } from "@shared/schema";
+import { useBotStatus } from "@/hooks/use-bot-status";
 
 interface HeaderProps {
   title: string;
@@ -10,10 +9,7 @@ interface HeaderProps {
 }
 
 export default function Header({ title, subtitle }: HeaderProps) {
-  const { data: botStatus, isLoading } = useQuery<BotStatus>({
-    queryKey: ["/api/bot/status"],
-    refetchInterval: 30000, // Refresh every 30 seconds
-  });
+  const { data: botStatus, isLoading } = useBotStatus();
 
   const handleRefresh = () => {
     queryClient.invalidateQueries({ queryKey: ["/api/bot/status"] });
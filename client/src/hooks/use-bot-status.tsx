@@ -0,0 +1,66 @@
+import { useEffect, useState } from "react";
+import { useQuery } from "@tanstack/react-query";
+import { queryClient } from "@/lib/queryClient";
+import type { BotStatus } from "@shared/schema";
+
+const STATUS_KEY = ["/api/bot/status"];
+const POLL_INTERVAL = 30000;
+
+// One EventSource shared by every component that shows bot status
+let source: EventSource | null = null;
+let connected = false;
+const listeners = new Set<(connected: boolean) => void>();
+
+function setConnected(value: boolean) {
+  connected = value;
+  listeners.forEach((listener) => listener(value));
+}
+
+function openStream() {
+  source = new EventSource("/api/bot/stream", { withCredentials: true });
+  source.onopen = () => setConnected(true);
+  source.onerror = () => setConnected(false);
+
+  source.addEventListener("status", (event) => {
+    const delta = JSON.parse((event as MessageEvent).data) as Partial<BotStatus>;
+    queryClient.setQueryData<BotStatus>(STATUS_KEY, (previous) => ({
+      ...(previous as BotStatus),
+      ...delta,
+      lastSeen: new Date().toISOString(),
+    }));
+  });
+
+  source.addEventListener("job", (event) => {
+    const job = JSON.parse((event as MessageEvent).data);
+    queryClient.setQueryData(["/api/bot/jobs", job.id], job);
+  });
+}
+
+function subscribe(listener: (connected: boolean) => void) {
+  listeners.add(listener);
+  if (!source) {
+    openStream();
+  }
+  listener(connected);
+
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0 && source) {
+      source.close();
+      source = null;
+      connected = false;
+    }
+  };
+}
+
+export function useBotStatus() {
+  const [streaming, setStreaming] = useState(connected);
+
+  useEffect(() => subscribe(setStreaming), []);
+
+  return useQuery<BotStatus>({
+    queryKey: STATUS_KEY,
+    // Only poll while the live stream is down
+    refetchInterval: streaming ? false : POLL_INTERVAL,
+  });
+}
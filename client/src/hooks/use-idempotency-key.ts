@@ -0,0 +1,32 @@
+import { useCallback, useRef } from "react";
+
+function newKey(): string {
+  if (typeof crypto.randomUUID === "function") {
+    return crypto.randomUUID();
+  }
+  // randomUUID needs a secure context; plain-HTTP dashboards fall back to this
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  return Array.from(bytes, (byte) => byte.toString(16).padStart(2, "0")).join("");
+}
+
+// One Idempotency-Key per submission: clicking again or retrying after a
+// timeout reuses it, so the bot answers from the first attempt instead of
+// sending twice. Editing the form starts a new submission, and so does
+// calling reset() once a send succeeds.
+export function useIdempotencyKey() {
+  const current = useRef<{ body: string; key: string } | null>(null);
+
+  const keyFor = useCallback((data: unknown) => {
+    const body = JSON.stringify(data);
+    if (current.current?.body !== body) {
+      current.current = { body, key: newKey() };
+    }
+    return current.current.key;
+  }, []);
+
+  const reset = useCallback(() => {
+    current.current = null;
+  }, []);
+
+  return { keyFor, reset };
+}
@@ -12,7 +12,8 @@ import logging
 import os
 import json
 from datetime import datetime
-from aiohttp import web
+
+from monroe_api import ApiSettings, MonroeApi, create_bot, embeds
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -21,7 +22,6 @@ logger = logging.getLogger(__name__)
 # Configuration
 TOKEN = os.getenv('DISCORD_TOKEN')
 PREFIX = os.getenv('BOT_PREFIX', '!')
-API_SECRET = os.getenv('API_SECRET', 'default-secret')
 
 if not TOKEN:
     logger.error("DISCORD_TOKEN environment variable is required!")
@@ -33,8 +33,8 @@ intents.message_content = True
 intents.guilds = True
 intents.members = True
 
-# Create bot instance
-bot = commands.Bot(
+# Create bot instance (AutoShardedBot when BOT_SHARDED=1)
+bot = create_bot(
     command_prefix=PREFIX,
     intents=intents,
     description="Monroe Bot - Discord Administration Bot with Web Dashboard"
@@ -43,6 +43,9 @@ bot = commands.Bot(
 # Bot startup time for uptime tracking
 bot.start_time = None
 
+# Dashboard API (routing index, status snapshot, member cache, send queue)
+api = MonroeApi(bot, ApiSettings.from_env())
+
 @bot.event
 async def on_ready():
     """Event triggered when bot is ready"""
@@ -146,25 +149,15 @@ async def servers(ctx):
 async def warn(ctx, member: discord.Member, *, reason="No reason provided"):
     """Warn a member"""
     try:
-        embed = discord.Embed(
-            title="⚠️ Warning",
-            description=f"You were warned in {ctx.guild.name}",
-            color=0xfbbf24,
-            timestamp=datetime.utcnow()
-        )
-        embed.add_field(name="Reason", value=reason, inline=False)
-        embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+        embed = embeds.WARNING_NOTICE.render(
+            guild=ctx.guild.name, reason=reason, moderator=ctx.author.mention)
         
         await member.send(embed=embed)
         
         # Log in current channel
-        log_embed = discord.Embed(
-            title="✅ Warning Issued",
-            description=f"{member.mention} has been warned",
-            color=0x10b981
-        )
-        log_embed.add_field(name="Reason", value=reason, inline=False)
-        log_embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+        log_embed = embeds.ACTION_CONFIRMATION.render(
+            heading="Warning Issued", summary=f"{member.mention} has been warned",
+            reason=reason, moderator=ctx.author.mention)
         await ctx.send(embed=log_embed)
         
     except discord.Forbidden:
@@ -176,14 +169,8 @@ async def kick(ctx, member: discord.Member, *, reason="No reason provided"):
     """Kick a member"""
     try:
         # Send DM before kicking
-        embed = discord.Embed(
-            title="👢 Kicked",
-            description=f"You were kicked from {ctx.guild.name}",
-            color=0xf97316,
-            timestamp=datetime.utcnow()
-        )
-        embed.add_field(name="Reason", value=reason, inline=False)
-        embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+        embed = embeds.KICK_NOTICE.render(
+            guild=ctx.guild.name, reason=reason, moderator=ctx.author.mention)
         
         try:
             await member.send(embed=embed)
@@ -193,13 +180,9 @@ async def kick(ctx, member: discord.Member, *, reason="No reason provided"):
         await member.kick(reason=f"Kicked by {ctx.author}: {reason}")
         
         # Log in current channel
-        log_embed = discord.Embed(
-            title="✅ Member Kicked",
-            description=f"{member} has been kicked",
-            color=0x10b981
-        )
-        log_embed.add_field(name="Reason", value=reason, inline=False)
-        log_embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+        log_embed = embeds.ACTION_CONFIRMATION.render(
+            heading="Member Kicked", summary=f"{member} has been kicked",
+            reason=reason, moderator=ctx.author.mention)
         await ctx.send(embed=log_embed)
         
     except discord.Forbidden:
@@ -211,14 +194,8 @@ async def ban(ctx, member: discord.Member, *, reason="No reason provided"):
     """Ban a member"""
     try:
         # Send DM before banning
-        embed = discord.Embed(
-            title="🔨 Banned",
-            description=f"You were banned from {ctx.guild.name}",
-            color=0xef4444,
-            timestamp=datetime.utcnow()
-        )
-        embed.add_field(name="Reason", value=reason, inline=False)
-        embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+        embed = embeds.BAN_NOTICE.render(
+            guild=ctx.guild.name, reason=reason, moderator=ctx.author.mention)
         
         try:
             await member.send(embed=embed)
@@ -228,13 +205,9 @@ async def ban(ctx, member: discord.Member, *, reason="No reason provided"):
         await member.ban(reason=f"Banned by {ctx.author}: {reason}")
         
         # Log in current channel
-        log_embed = discord.Embed(
-            title="✅ Member Banned",
-            description=f"{member} has been banned",
-            color=0x10b981
-        )
-        log_embed.add_field(name="Reason", value=reason, inline=False)
-        log_embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+        log_embed = embeds.ACTION_CONFIRMATION.render(
+            heading="Member Banned", summary=f"{member} has been banned",
+            reason=reason, moderator=ctx.author.mention)
         await ctx.send(embed=log_embed)
         
     except discord.Forbidden:
@@ -242,392 +215,8 @@ async def ban(ctx, member: discord.Member, *, reason="No reason provided"):
 
 # API Server for Dashboard Integration
 async def start_api_server():
-    """Start the API server for dashboard integration"""
-    
-    async def check_auth(request):
-        """Simple authentication check"""
-        auth = request.headers.get('Authorization', '')
-        if not auth.startswith('Bearer ') or auth[7:] != API_SECRET:
-            return web.json_response({'error': 'Unauthorized'}, status=401)
-        return None
-
-    async def handle_status(request):
-        """Bot status endpoint"""
-        auth_error = await check_auth(request)
-        if auth_error:
-            return auth_error
-        
-        try:
-            guild_count = len(bot.guilds)
-            member_count = sum(g.member_count or 0 for g in bot.guilds)
-            uptime_seconds = (datetime.utcnow() - bot.start_time).total_seconds() if bot.start_time else 0
-            uptime_display = f"{int(uptime_seconds // 3600)}h {int((uptime_seconds % 3600) // 60)}m"
-            
-            guilds_info = []
-            for guild in bot.guilds[:5]:  # Limit to first 5 guilds
-                guilds_info.append({
-                    "id": str(guild.id),
-                    "name": guild.name,
-                    "memberCount": guild.member_count or 0
-                })
-            
-            return web.json_response({
-                "online": True,
-                "serverCount": guild_count,
-                "userCount": member_count,
-                "uptime": uptime_display,
-                "lastSeen": datetime.utcnow().isoformat(),
-                "guilds": guilds_info
-            })
-        except Exception as e:
-            logger.error(f"Status endpoint error: {e}")
-            return web.json_response({
-                "online": False,
-                "serverCount": 0,
-                "userCount": 0,
-                "uptime": "Error",
-                "lastSeen": datetime.utcnow().isoformat(),
-                "error": str(e)
-            })
-
-    async def handle_broadcast(request):
-        """Broadcast message endpoint"""
-        auth_error = await check_auth(request)
-        if auth_error:
-            return auth_error
-        
-        try:
-            data = await request.json()
-            message = data.get('message', '').strip()
-            
-            if not message:
-                return web.json_response({'error': 'Message required'}, status=400)
-            
-            sent_count = 0
-            failed_count = 0
-            
-            embed = discord.Embed(
-                title="📢 Monroe Bot Broadcast",
-                description=message,
-                color=0x7c3aed,
-                timestamp=datetime.utcnow()
-            )
-            embed.set_footer(text="Sent from Monroe Dashboard")
-            embed.set_author(name="Monroe Social Club")
-            
-            for guild in bot.guilds:
-                try:
-                    # Find best channel to send to
-                    channel = None
-                    
-                    # Try to find general/announcements channel
-                    for ch_name in ['general', 'announcements', 'chat', 'main']:
-                        channel = discord.utils.get(guild.text_channels, name=ch_name)
-                        if channel and channel.permissions_for(guild.me).send_messages:
-                            break
-                    
-                    # Fallback to first available channel
-                    if not channel:
-                        for ch in guild.text_channels:
-                            if ch.permissions_for(guild.me).send_messages:
-                                channel = ch
-                                break
-                    
-                    if channel:
-                        await channel.send(embed=embed)
-                        sent_count += 1
-                        logger.info(f"Broadcast sent to {guild.name} (#{channel.name})")
-                    else:
-                        failed_count += 1
-                        logger.warning(f"No suitable channel found in {guild.name}")
-                        
-                except Exception as e:
-                    failed_count += 1
-                    logger.error(f"Failed to send broadcast to {guild.name}: {e}")
-            
-            return web.json_response({
-                'success': True,
-                'sent_to': sent_count,
-                'failed': failed_count,
-                'message': f'Broadcast sent to {sent_count} servers, {failed_count} failed'
-            })
-            
-        except Exception as e:
-            logger.error(f"Broadcast endpoint error: {e}")
-            return web.json_response({'error': str(e)}, status=500)
-
-    async def handle_qotd(request):
-        """Question of the Day endpoint"""
-        auth_error = await check_auth(request)
-        if auth_error:
-            return auth_error
-        
-        try:
-            data = await request.json()
-            question = data.get('question', '').strip()
-            category = data.get('category', 'General')
-            
-            if not question:
-                return web.json_response({'error': 'Question required'}, status=400)
-            
-            sent_count = 0
-            failed_count = 0
-            
-            embed = discord.Embed(
-                title=f"🤔 Question of the Day - {category}",
-                description=question,
-                color=0xf59e0b,
-                timestamp=datetime.utcnow()
-            )
-            embed.set_footer(text="Answer in the comments below!")
-            embed.set_author(name="Monroe Social Club")
-            
-            for guild in bot.guilds:
-                try:
-                    # Look for QOTD specific channels first
-                    channel = None
-                    for ch_name in ['qotd', 'question-of-the-day', 'daily-question', 'general', 'chat']:
-                        channel = discord.utils.get(guild.text_channels, name=ch_name)
-                        if channel and channel.permissions_for(guild.me).send_messages:
-                            break
-                    
-                    # Fallback to first available channel
-                    if not channel:
-                        for ch in guild.text_channels:
-                            if ch.permissions_for(guild.me).send_messages:
-                                channel = ch
-                                break
-                    
-                    if channel:
-                        message = await channel.send(embed=embed)
-                        # Add reaction for engagement
-                        try:
-                            await message.add_reaction('🤔')
-                        except:
-                            pass
-                        sent_count += 1
-                        logger.info(f"QOTD sent to {guild.name} (#{channel.name})")
-                    else:
-                        failed_count += 1
-                        
-                except Exception as e:
-                    failed_count += 1
-                    logger.error(f"Failed to send QOTD to {guild.name}: {e}")
-            
-            return web.json_response({
-                'success': True,
-                'sent_to': sent_count,
-                'failed': failed_count,
-                'message': f'QOTD sent to {sent_count} servers, {failed_count} failed'
-            })
-            
-        except Exception as e:
-            logger.error(f"QOTD endpoint error: {e}")
-            return web.json_response({'error': str(e)}, status=500)
-
-    async def handle_announcement(request):
-        """Announcement endpoint"""
-        auth_error = await check_auth(request)
-        if auth_error:
-            return auth_error
-        
-        try:
-            data = await request.json()
-            title = data.get('title', '').strip()
-            content = data.get('content', '').strip()
-            
-            if not title or not content:
-                return web.json_response({'error': 'Title and content required'}, status=400)
-            
-            sent_count = 0
-            failed_count = 0
-            
-            embed = discord.Embed(
-                title=f"📢 {title}",
-                description=content,
-                color=0x7c3aed,
-                timestamp=datetime.utcnow()
-            )
-            embed.set_author(name="Monroe Social Club")
-            embed.set_footer(text="Official Monroe Announcement")
-            
-            for guild in bot.guilds:
-                try:
-                    # Look for announcement channels first
-                    channel = None
-                    for ch_name in ['announcements', 'news', 'updates', 'general', 'main']:
-                        channel = discord.utils.get(guild.text_channels, name=ch_name)
-                        if channel and channel.permissions_for(guild.me).send_messages:
-                            break
-                    
-                    # Fallback to first available channel
-                    if not channel:
-                        for ch in guild.text_channels:
-                            if ch.permissions_for(guild.me).send_messages:
-                                channel = ch
-                                break
-                    
-                    if channel:
-                        await channel.send(embed=embed)
-                        sent_count += 1
-                        logger.info(f"Announcement sent to {guild.name} (#{channel.name})")
-                    else:
-                        failed_count += 1
-                        
-                except Exception as e:
-                    failed_count += 1
-                    logger.error(f"Failed to send announcement to {guild.name}: {e}")
-            
-            return web.json_response({
-                'success': True,
-                'sent_to': sent_count,
-                'failed': failed_count,
-                'message': f'Announcement sent to {sent_count} servers, {failed_count} failed'
-            })
-            
-        except Exception as e:
-            logger.error(f"Announcement endpoint error: {e}")
-            return web.json_response({'error': str(e)}, status=500)
-
-    async def handle_moderation(request):
-        """Moderation endpoint"""
-        auth_error = await check_auth(request)
-        if auth_error:
-            return auth_error
-        
-        try:
-            data = await request.json()
-            action = data.get('action', '').lower()
-            user_id = data.get('user_id', '')
-            reason = data.get('reason', 'No reason provided')
-            guild_id = data.get('guild_id')  # Optional guild ID
-            
-            if not action or not user_id:
-                return web.json_response({'error': 'Action and user_id required'}, status=400)
-            
-            if action not in ['warn', 'kick', 'ban']:
-                return web.json_response({'error': 'Invalid action. Must be warn, kick, or ban'}, status=400)
-            
-            # Select guild
-            if guild_id:
-                guild = bot.get_guild(int(guild_id))
-                if not guild:
-                    return web.json_response({'error': 'Guild not found'}, status=404)
-            else:
-                guild = bot.guilds[0] if bot.guilds else None
-                if not guild:
-                    return web.json_response({'error': 'No guild available'}, status=404)
-            
-            # Get member
-            try:
-                member = await guild.fetch_member(int(user_id))
-            except:
-                return web.json_response({'error': 'User not found in guild'}, status=404)
-            
-            # Execute moderation action
-            result = ""
-            
-            if action == 'warn':
-                try:
-                    embed = discord.Embed(
-                        title="⚠️ Warning",
-                        description=f"You were warned in {guild.name}",
-                        color=0xfbbf24,
-                        timestamp=datetime.utcnow()
-                    )
-                    embed.add_field(name="Reason", value=reason, inline=False)
-                    embed.add_field(name="Server", value=guild.name, inline=True)
-                    
-                    await member.send(embed=embed)
-                    result = f"Warning sent to {member.display_name}"
-                except:
-                    result = f"Warning issued to {member.display_name} (DM failed)"
-                    
-            elif action == 'kick':
-                try:
-                    # Send DM before kicking
-                    embed = discord.Embed(
-                        title="👢 Kicked",
-                        description=f"You were kicked from {guild.name}",
-                        color=0xf97316,
-                        timestamp=datetime.utcnow()
-                    )
-                    embed.add_field(name="Reason", value=reason, inline=False)
-                    
-                    try:
-                        await member.send(embed=embed)
-                    except:
-                        pass
-                    
-                    await member.kick(reason=f"Dashboard moderation: {reason}")
-                    result = f"Kicked {member.display_name} from {guild.name}"
-                except discord.Forbidden:
-                    return web.json_response({'error': 'Insufficient permissions to kick user'}, status=403)
-                    
-            elif action == 'ban':
-                try:
-                    # Send DM before banning
-                    embed = discord.Embed(
-                        title="🔨 Banned",
-                        description=f"You were banned from {guild.name}",
-                        color=0xef4444,
-                        timestamp=datetime.utcnow()
-                    )
-                    embed.add_field(name="Reason", value=reason, inline=False)
-                    
-                    try:
-                        await member.send(embed=embed)
-                    except:
-                        pass
-                    
-                    await member.ban(reason=f"Dashboard moderation: {reason}")
-                    result = f"Banned {member.display_name} from {guild.name}"
-                except discord.Forbidden:
-                    return web.json_response({'error': 'Insufficient permissions to ban user'}, status=403)
-            
-            logger.info(f"Moderation action executed: {action} on {member.display_name} in {guild.name}")
-            
-            return web.json_response({
-                'success': True,
-                'message': result,
-                'action': action,
-                'user': member.display_name,
-                'guild': guild.name
-            })
-            
-        except Exception as e:
-            logger.error(f"Moderation endpoint error: {e}")
-            return web.json_response({'error': str(e)}, status=500)
-
-    # Create web application
-    app = web.Application()
-    
-    # Health endpoint (no auth required)
-    app.router.add_get('/health', lambda req: web.Response(text="Bot is running!"))
-    app.router.add_get('/', lambda req: web.Response(text="Monroe Bot API Server - All endpoints active"))
-    
-    # API endpoints (auth required)
-    app.router.add_get('/api/status', handle_status)
-    app.router.add_post('/api/broadcast', handle_broadcast)
-    app.router.add_post('/api/qotd', handle_qotd)
-    app.router.add_post('/api/announcement', handle_announcement)
-    app.router.add_post('/api/moderation', handle_moderation)
-    
-    # Start server
-    port = int(os.getenv('PORT', 8000))
-    runner = web.AppRunner(app)
-    await runner.setup()
-    site = web.TCPSite(runner, '0.0.0.0', port)
-    await site.start()
-    
-    logger.info(f"Monroe Bot API server started on port {port}")
-    logger.info("Available endpoints:")
-    logger.info("  GET  /health")
-    logger.info("  GET  /api/status")
-    logger.info("  POST /api/broadcast")
-    logger.info("  POST /api/qotd")
-    logger.info("  POST /api/announcement")
-    logger.info("  POST /api/moderation")
+    """Start the API server for dashboard integration (once; on_ready fires again on reconnect)"""
+    await api.start_server()
 
 # Main execution
 if __name__ == "__main__":
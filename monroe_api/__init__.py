@@ -0,0 +1,102 @@
+"""
+Monroe Bot API - shared building blocks for the dashboard HTTP API
+"""
+
+from .app import MonroeApi
+from .audit import AuditStore
+from .chunking import GuildChunker
+from .commandsync import CommandSync
+from .config import LiveConfig
+from .delivery import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DeliveryResult,
+    DeliverySummary,
+    DeliveryTarget,
+    deliver,
+    fan_out,
+)
+from .embeds import EmbedTemplate, FrozenEmbed
+from .extensions import ExtensionLoader
+from .gateway import GatewaySession, ResumableBot
+from .idempotency import IdempotencyStore
+from .jobs import Job, JobQueue, QueueFull
+from .membercache import CompactMemberStore
+from .members import MemberLocator
+from .metrics import ApiMetrics, Registry
+from .moderation import BulkOutcome, bulk_moderate
+from .ratelimit import PURPOSE_PRIORITIES, RateLimitScheduler
+from .roblox import RobloxClient, RobloxProfile
+from .routing import DEFAULT_PREFERENCES, ChannelIndex
+from .schemas import (
+    AnnouncementRequest,
+    BroadcastRequest,
+    BulkModerationRequest,
+    ConfigUpdate,
+    HistoryQuery,
+    ModerationRequest,
+    QotdRequest,
+    ScheduleRequest,
+    StatsHistoryQuery,
+    ValidationError,
+)
+from .schedules import PostScheduler, Schedule
+from .settings import ApiSettings
+from .sharding import ShardSettings, create_bot
+from .status import StatusSnapshot, format_uptime
+from .stream import EventHub, StatusFeed
+from .timeseries import StatsHistory
+
+__all__ = [
+    'MonroeApi',
+    'ApiSettings',
+    'ShardSettings',
+    'CommandSync',
+    'ExtensionLoader',
+    'create_bot',
+    'ResumableBot',
+    'GatewaySession',
+    'DEFAULT_MAX_IN_FLIGHT',
+    'DeliveryResult',
+    'DeliverySummary',
+    'DeliveryTarget',
+    'deliver',
+    'fan_out',
+    'EmbedTemplate',
+    'FrozenEmbed',
+    'Job',
+    'JobQueue',
+    'QueueFull',
+    'MemberLocator',
+    'CompactMemberStore',
+    'GuildChunker',
+    'AuditStore',
+    'ApiMetrics',
+    'Registry',
+    'BulkOutcome',
+    'bulk_moderate',
+    'PURPOSE_PRIORITIES',
+    'RateLimitScheduler',
+    'DEFAULT_PREFERENCES',
+    'ChannelIndex',
+    'BroadcastRequest',
+    'QotdRequest',
+    'AnnouncementRequest',
+    'ModerationRequest',
+    'BulkModerationRequest',
+    'ConfigUpdate',
+    'HistoryQuery',
+    'StatsHistoryQuery',
+    'ScheduleRequest',
+    'ValidationError',
+    'StatusSnapshot',
+    'format_uptime',
+    'EventHub',
+    'StatusFeed',
+    'StatsHistory',
+    'PostScheduler',
+    'Schedule',
+    'RobloxClient',
+    'RobloxProfile',
+    'LiveConfig',
+    'IdempotencyStore',
+]
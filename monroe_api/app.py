@@ -0,0 +1,685 @@
+"""
+The dashboard HTTP API as a reusable aiohttp sub-application.
+
+``MonroeApi`` owns the per-bot state (channel index, status snapshot, member
+locator, job queue, event stream, moderation audit log, stats history, post
+scheduler, Roblox client, live config, idempotency store) and the request
+handlers. Entrypoints build one right after creating their bot, then either
+mount ``create_app()`` under ``/api`` in their own web app or call
+``start_server()``.
+"""
+
+import hmac
+import logging
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import discord
+from aiohttp import web
+
+from . import codec, embeds
+from .audit import AuditEntry, AuditStore
+from .chunking import GuildChunker
+from .config import LiveConfig, apply_to_settings, settings_values
+from .delivery import DeliveryTarget, deliver
+from .idempotency import HEADER as IDEMPOTENCY_HEADER, IdempotencyStore, idempotent
+from .jobs import JobQueue, QueueFull
+from .membercache import CompactMemberStore
+from .members import MemberLocator
+from .metrics import ApiMetrics
+from .moderation import bulk_moderate
+from .ratelimit import BROADCAST, MODERATION, PURPOSE_PRIORITIES, RateLimitScheduler
+from .roblox import RobloxClient, RobloxError
+from .routing import MOD_LOG, ChannelIndex
+from .schedules import PostScheduler, Schedule, ScheduleStore
+from .schemas import (AnnouncementRequest, BroadcastRequest, BulkModerationRequest, ConfigUpdate, HistoryQuery,
+                      ModerationRequest, QotdRequest, ScheduleRequest, StatsHistoryQuery, ValidationError,
+                      validates)
+from .settings import ApiSettings
+from .sharding import route_by_shard
+from .status import StatusSnapshot
+from .stream import EventHub, StatusFeed
+from .timeseries import RESOLUTIONS, StatsHistory
+
+logger = logging.getLogger(__name__)
+
+
+class MonroeApi:
+    """Dashboard API state and handlers for one bot"""
+
+    def __init__(self, bot, settings: Optional[ApiSettings] = None):
+        self.bot = bot
+        self.settings = settings or ApiSettings.from_env()
+
+        # Every Discord call below goes through this, so moderation isn't
+        # stuck behind a large broadcast
+        self.scheduler = RateLimitScheduler(
+            global_rate=self.settings.rate_limit_global,
+            max_concurrency=self.settings.rate_limit_concurrency,
+            max_retries=self.settings.rate_limit_retries,
+        )
+        # The dashboard's saved config overrides the entrypoint's settings
+        self.config = LiveConfig(settings_values(self.settings), self.settings.config_path)
+        apply_to_settings(self.config.values, self.settings)
+        self.channel_index = ChannelIndex(self.settings.channel_preferences)
+        self.config.add_listener(self._apply_config)
+        self.status_snapshot = StatusSnapshot(bot, guild_limit=self.settings.status_guild_limit)
+        self.member_store = CompactMemberStore() if self.settings.member_cache == 'compact' else None
+        self.chunker = GuildChunker(bot, mode=self.settings.member_chunking, store=self.member_store)
+        self.member_locator = MemberLocator(bot, negative_ttl=self.settings.member_negative_ttl,
+                                            scheduler=self.scheduler, store=self.member_store,
+                                            chunker=self.chunker)
+        self.chunker.add_listener(self.member_locator.index_guild)
+        self.job_queue = JobQueue(
+            workers=self.settings.job_workers,
+            maxsize=self.settings.job_queue_size,
+            max_in_flight=self.settings.max_in_flight,
+        )
+        audit_path = self.settings.moderation_audit_path
+        self.audit_store = AuditStore(audit_path) if audit_path else None
+        stats_path = self.settings.stats_history_path
+        self.stats_history = StatsHistory(bot, self.status_snapshot, stats_path) if stats_path else None
+        schedules_path = self.settings.schedules_path
+        self.post_scheduler = (PostScheduler(ScheduleStore(schedules_path), self.fire_schedule)
+                               if schedules_path else None)
+        self.roblox = RobloxClient(
+            api_base=self.settings.roblox_api_base,
+            link_url=self.settings.roblox_link_url,
+            link_api_key=self.settings.roblox_link_api_key,
+            group_id=self.settings.roblox_group_id,
+            ttl=self.settings.roblox_cache_ttl,
+            negative_ttl=self.settings.roblox_negative_ttl,
+        )
+        self.idempotency = IdempotencyStore(self.settings.idempotency_cache_size, self.settings.idempotency_ttl)
+        self.status_feed = StatusFeed(EventHub(), self.status_snapshot, self.job_queue)
+        self.metrics = ApiMetrics()
+        self.metrics.attach(bot, self.status_snapshot, self.job_queue, self.scheduler, self.chunker)
+
+        self.channel_index.attach(bot)
+        self.status_snapshot.attach(bot)
+        self.member_locator.attach(bot)
+        if self.member_store is not None:
+            self.member_store.attach(bot)
+        self.chunker.attach(bot)
+        if self.stats_history is not None:
+            self.stats_history.attach(bot)
+        bot.add_listener(self._on_ready, 'on_ready')
+
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _on_ready(self):
+        # Entrypoints usually set this themselves; make uptime work regardless
+        if not getattr(self.bot, 'start_time', None):
+            self.bot.start_time = datetime.utcnow()
+        if self.post_scheduler is not None:
+            # Not before ready: a post due at startup needs the guild list
+            await self.post_scheduler.start()
+
+    def _apply_config(self, values):
+        apply_to_settings(values, self.settings)
+        self.channel_index.preferences = dict(self.settings.channel_preferences)
+        self.channel_index.rebuild(self.bot.guilds)
+
+    # -- application ---------------------------------------------------------
+
+    def create_app(self) -> web.Application:
+        """Build the API sub-application; mount it at ``/api``"""
+        middlewares = [self.metrics.middleware] if self.settings.metrics_enabled else []
+        middlewares += [self.error_middleware, self.auth_middleware, self.idempotency_middleware,
+                        self.body_middleware]
+        app = web.Application(middlewares=middlewares, client_max_size=self.settings.max_body_size)
+        app.router.add_get('/status', self.handle_status)
+        app.router.add_get('/stream', self.handle_stream)
+        app.router.add_get('/stats/history', self.handle_stats_history)
+        app.router.add_post('/broadcast', self.handle_broadcast)
+        app.router.add_post('/qotd', self.handle_qotd)
+        app.router.add_post('/announcement', self.handle_announcement)
+        app.router.add_post('/moderation', self.handle_moderation)
+        app.router.add_post('/moderation/bulk', self.handle_bulk_moderation)
+        app.router.add_get('/moderation/history', self.handle_moderation_history)
+        app.router.add_get('/jobs/{job_id}', self.handle_job)
+        app.router.add_get('/config', self.handle_config)
+        app.router.add_post('/config', self.handle_update_config)
+        app.router.add_get('/roblox/{discord_id}', self.handle_roblox)
+        app.router.add_get('/schedules', self.handle_schedules)
+        app.router.add_post('/schedules', self.handle_create_schedule)
+        app.router.add_delete('/schedules/{schedule_id}', self.handle_delete_schedule)
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    # -- middlewares ---------------------------------------------------------
+
+    @web.middleware
+    async def error_middleware(self, request, handler):
+        """Turn unhandled handler errors into a JSON 500"""
+        try:
+            return await handler(request)
+        except web.HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"{request.method} {request.path} failed: {e}")
+            return codec.respond(request, {'error': str(e)}, status=500)
+
+    @web.middleware
+    async def auth_middleware(self, request, handler):
+        """Bearer check for every API route, done once here rather than per handler"""
+        auth_error = self.check_auth(request)
+        if auth_error:
+            return auth_error
+        return await handler(request)
+
+    @web.middleware
+    async def idempotency_middleware(self, request, handler):
+        """Run ``@idempotent`` handlers once per Idempotency-Key"""
+        if (IDEMPOTENCY_HEADER not in request.headers
+                or not getattr(request.match_info.handler, 'idempotent', False)):
+            return await handler(request)
+        return await self.idempotency.run(request, handler)
+
+    @web.middleware
+    async def body_middleware(self, request, handler):
+        """Decode and validate the body of handlers marked with ``@validates``"""
+        schema = getattr(request.match_info.handler, 'schema', None)
+        if schema is None:
+            return await handler(request)
+
+        limit = self.settings.max_body_size
+        if request.content_length is not None and request.content_length > limit:
+            return codec.respond(request, {'error': f'Body larger than {limit} bytes'}, status=413)
+        try:
+            raw = await request.read()
+        except web.HTTPRequestEntityTooLarge:
+            return codec.respond(request, {'error': f'Body larger than {limit} bytes'}, status=413)
+        try:
+            request['body'] = schema.parse(codec.decode(raw, request.content_type))
+        except codec.DecodeError as e:
+            return codec.respond(request, {'error': str(e)}, status=400)
+        except ValidationError as e:
+            return codec.respond(request, {'error': 'Invalid input', 'errors': e.errors}, status=400)
+        return await handler(request)
+
+    async def _on_startup(self, app):
+        self.job_queue.start()
+        self.status_feed.start()
+        if self.stats_history is not None:
+            self.stats_history.start()
+
+    async def _on_cleanup(self, app):
+        await self.status_feed.stop()
+        await self.job_queue.stop()
+        await self.roblox.close()
+        if self.post_scheduler is not None:
+            await self.post_scheduler.stop()
+            self.post_scheduler.store.close()
+        if self.stats_history is not None:
+            await self.stats_history.stop()
+            self.stats_history.close()
+        if self.audit_store is not None:
+            # Reopened on next use if the app is started again
+            self.audit_store.close()
+
+    async def start_server(self, host: Optional[str] = None, port: Optional[int] = None):
+        """Serve /health, / and the API on one port (safe to call again on reconnect)"""
+        if self._runner is not None:
+            return
+        host = host or self.settings.host
+        port = port or self.settings.port
+
+        # Request bodies are read under the root app's limit, not the sub-app's
+        root = web.Application(client_max_size=self.settings.max_body_size)
+        root.router.add_get('/health', handle_health)
+        root.router.add_get('/', lambda request: web.Response(text="Monroe Bot API Server"))
+        if self.settings.metrics_enabled:
+            root.router.add_get('/metrics', self.handle_metrics)
+        root.add_subapp('/api', self.create_app())
+
+        self._runner = web.AppRunner(root)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+
+        logger.info(f"Monroe Bot API server listening on {host}:{port}")
+        for resource in root.router.resources():
+            logger.info(f"  {resource.canonical}")
+        if self.settings.secret == 'default-secret':
+            logger.warning("API_SECRET not set, using the default secret")
+
+    async def stop_server(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # -- helpers -------------------------------------------------------------
+
+    def check_auth(self, request) -> Optional[web.Response]:
+        auth = request.headers.get('Authorization', '')
+        # Constant-time, so response timing doesn't leak how much of the secret matched
+        expected = f'Bearer {self.settings.secret}'.encode('utf-8')
+        if not hmac.compare_digest(auth.encode('utf-8', 'surrogateescape'), expected):
+            return codec.respond(request, {'error': 'Unauthorized'}, status=401)
+        return None
+
+    def resolve_targets(self, purpose: str, channel_id=None) -> Tuple[List[DeliveryTarget], int]:
+        """Targets for a send: an explicit channel, fixed channel ids, or the routing index"""
+        if channel_id:
+            channel = self.bot.get_channel(int(channel_id))
+            if channel is None or not hasattr(channel, 'send'):
+                return [], 0
+            return [DeliveryTarget(channel.guild, channel)], 0
+
+        fixed = self.settings.fixed_channels.get(purpose)
+        if fixed:
+            targets = []
+            for fixed_id in fixed:
+                channel = self.bot.get_channel(fixed_id)
+                if channel and channel.permissions_for(channel.guild.me).send_messages:
+                    targets.append(DeliveryTarget(channel.guild, channel))
+            return route_by_shard(self.bot, targets), len(fixed) - len(targets)
+
+        targets, missing = self.channel_index.targets(self.bot.guilds, purpose)
+        return route_by_shard(self.bot, targets), missing
+
+    def sender(self, purpose: str, embed: discord.Embed, reactions=()):
+        content = "@everyone" if purpose in self.settings.mention_everyone else None
+        priority = PURPOSE_PRIORITIES.get(purpose, BROADCAST)
+        run = self.scheduler.run
+
+        async def send(target):
+            channel = target.channel
+            message = await run(lambda: channel.send(content=content, embed=embed),
+                                'POST /channels/{channel_id}/messages', channel.id, priority)
+            for emoji in reactions:
+                try:
+                    await run(lambda: message.add_reaction(emoji),
+                              'PUT /channels/{channel_id}/messages/{message_id}/reactions', channel.id, priority)
+                except discord.HTTPException:
+                    pass
+            return message
+
+        return send
+
+    async def moderation_call(self, call, route: str, major=None):
+        """Run a moderation REST call at the highest scheduler priority"""
+        return await self.scheduler.run(call, route, major, MODERATION)
+
+    async def dispatch(self, request, purpose: str, label: str, channel_id: Optional[str],
+                       embed: discord.Embed, reactions=()):
+        """Queue (or, with async_sends off, run) a fan-out and build the response"""
+        targets, skipped = self.resolve_targets(purpose, channel_id)
+        if channel_id and not targets:
+            return codec.respond(request, {'error': 'No valid channel found'}, status=404)
+        send = self.sender(purpose, embed, reactions)
+
+        if not self.settings.async_sends:
+            summary = await deliver(targets, send, max_in_flight=self.settings.max_in_flight, label=label)
+            failed = summary.failed + skipped
+            return codec.respond(request, {
+                'success': True,
+                'sent_to': summary.sent,
+                'failed': failed,
+                'message': f'{label} sent to {summary.sent} channels, {failed} failed'
+            })
+
+        try:
+            job = self.job_queue.submit(purpose, targets, send, skipped=skipped)
+        except QueueFull as e:
+            logger.warning(f"{label} rejected: {e}")
+            return codec.respond(request, {'error': str(e)}, status=503)
+        logger.info(f"{label} queued as job {job.id} ({len(targets)} channels, {skipped} unreachable)")
+        return codec.respond(request, {
+            'success': True,
+            'job_id': job.id,
+            'status': job.status,
+            'queued_to': len(targets),
+            'failed': skipped,
+            'message': f'{label} queued for {len(targets)} channels, {skipped} failed'
+        }, status=202)
+
+    async def audit(self, *entries: AuditEntry):
+        if self.audit_store is not None:
+            await self.audit_store.record(*entries)
+
+    async def fire_schedule(self, schedule: Schedule) -> Optional[str]:
+        """Queue one run of a scheduled post, spread over its stagger window"""
+        payload, purpose = schedule.payload, schedule.purpose
+        author = self.author_name(schedule.created_by)
+        if purpose == 'qotd':
+            embed = embeds.QOTD.render(question=payload['question'],
+                                       category=embeds.qotd_category(payload.get('category')), author=author)
+            reactions = self.settings.qotd_reactions
+        else:
+            embed = embeds.ANNOUNCEMENT.render(title=payload['title'], content=payload['content'], author=author)
+            reactions = ()
+
+        targets, skipped = self.resolve_targets(purpose, schedule.channel_id)
+        try:
+            job = self.job_queue.submit(purpose, targets, self.sender(purpose, embed, reactions),
+                                        skipped=skipped, spread=schedule.stagger)
+        except QueueFull as e:
+            logger.error(f"Scheduled {purpose} {schedule.id} dropped: {e}")
+            return None
+        logger.info(f"Scheduled {purpose} {schedule.id} queued as job {job.id} "
+                    f"({len(targets)} channels over {schedule.stagger:.0f}s)")
+        return job.id
+
+    def author_name(self, dashboard_user: Optional[str]) -> str:
+        return f"Sent by {dashboard_user}" if dashboard_user else self.settings.brand_name
+
+    # -- handlers ------------------------------------------------------------
+
+    async def handle_status(self, request):
+        try:
+            return self.status_snapshot.response(request)
+        except Exception as e:
+            logger.error(f"Status endpoint error: {e}")
+            return codec.respond(request, {
+                "online": False,
+                "serverCount": 0,
+                "userCount": 0,
+                "uptime": "Error",
+                "lastSeen": datetime.utcnow().isoformat(),
+                "error": str(e)
+            })
+
+    async def handle_metrics(self, request):
+        if not self.settings.metrics_public:
+            auth_error = self.check_auth(request)
+            if auth_error:
+                return auth_error
+
+        return self.metrics.response()
+
+    async def handle_stream(self, request):
+        return await self.status_feed.handle_stream(request)
+
+    async def handle_stats_history(self, request):
+        if self.stats_history is None:
+            return codec.respond(request, {'error': 'Stats history is disabled'}, status=404)
+        try:
+            query = StatsHistoryQuery.parse(dict(request.query))
+        except ValidationError as e:
+            return codec.respond(request, {'error': 'Invalid input', 'errors': e.errors}, status=400)
+        resolution, buckets = await self.stats_history.query(query.range)
+        return codec.respond(request, {
+            'range': query.range,
+            'resolution': next(name for name, seconds in RESOLUTIONS.items() if seconds == resolution),
+            'bucket_seconds': resolution,
+            'points': [bucket.to_dict() for bucket in buckets],
+        })
+
+    async def handle_job(self, request):
+        job = self.job_queue.get(request.match_info['job_id'])
+        if not job:
+            return codec.respond(request, {'error': 'Job not found'}, status=404)
+        return codec.respond(request, job.to_dict())
+
+    async def handle_config(self, request):
+        headers = {'ETag': self.config.etag, 'Cache-Control': 'no-cache'}
+        if request.headers.get('If-None-Match') == self.config.etag:
+            return web.Response(status=304, headers=headers)
+        return codec.respond(request, self.config.to_dict(), headers=headers)
+
+    @validates(ConfigUpdate)
+    async def handle_update_config(self, request):
+        body: ConfigUpdate = request['body']
+        expected = request.headers.get('If-Match')
+        if expected is not None and expected != self.config.etag:
+            return codec.respond(request, {'error': 'Config changed since it was read',
+                                           'version': self.config.version},
+                                 status=412, headers={'ETag': self.config.etag})
+        try:
+            await self.config.update(body.changes(), updated_by=body.dashboard_user)
+        except OSError as e:
+            logger.error(f"Could not save config: {e}")
+            return codec.respond(request, {'error': 'Could not save configuration'}, status=500)
+        return codec.respond(request, {
+            'success': True,
+            'message': 'Configuration updated',
+            'config': self.config.to_dict(),
+        }, headers={'ETag': self.config.etag})
+
+    async def handle_roblox(self, request):
+        discord_id = request.match_info['discord_id']
+        if not discord_id.isdigit():
+            return codec.respond(request, {'error': 'Invalid Discord id'}, status=400)
+        guild = self.bot.guilds[0] if self.bot.guilds else None
+        try:
+            profile = await self.roblox.profile(int(discord_id), guild.id if guild else None)
+        except RobloxError as e:
+            logger.warning(f"Roblox lookup for {discord_id} failed: {e}")
+            return codec.respond(request, {'error': 'Roblox lookup failed'}, status=502)
+        if profile is None:
+            return codec.respond(request, {'error': 'No linked Roblox account'}, status=404)
+        return codec.respond(request, profile.to_dict())
+
+    async def handle_schedules(self, request):
+        if self.post_scheduler is None:
+            return codec.respond(request, {'error': 'Scheduling is disabled'}, status=404)
+        return codec.respond(request, {
+            'schedules': [schedule.to_dict() for schedule in self.post_scheduler.upcoming()]
+        })
+
+    @validates(ScheduleRequest)
+    async def handle_create_schedule(self, request):
+        if self.post_scheduler is None:
+            return codec.respond(request, {'error': 'Scheduling is disabled'}, status=404)
+        body: ScheduleRequest = request['body']
+        fields = ('question', 'category') if body.purpose == 'qotd' else ('title', 'content')
+        schedule = Schedule(
+            purpose=body.purpose,
+            payload={name: getattr(body, name) for name in fields},
+            next_run=body.run_at,
+            every=body.every,
+            stagger=float(body.stagger),
+            channel_id=int(body.channel_id) if body.channel_id else None,
+            created_by=body.dashboard_user,
+        )
+        now = time.time()
+        if schedule.next_run < now:
+            # A repeating schedule may start in the past (e.g. "daily at 09:00")
+            if not schedule.advance(now):
+                return codec.respond(request, {'error': 'Invalid input', 'errors': [
+                    {'path': ['run_at'], 'message': 'run_at is in the past'}]}, status=400)
+        await self.post_scheduler.add(schedule)
+        return codec.respond(request, {'success': True, 'schedule': schedule.to_dict()}, status=201)
+
+    async def handle_delete_schedule(self, request):
+        if self.post_scheduler is None:
+            return codec.respond(request, {'error': 'Scheduling is disabled'}, status=404)
+        schedule_id = request.match_info['schedule_id']
+        if not schedule_id.isdigit() or not await self.post_scheduler.remove(int(schedule_id)):
+            return codec.respond(request, {'error': 'Schedule not found'}, status=404)
+        return codec.respond(request, {'success': True})
+
+    @idempotent
+    @validates(BroadcastRequest)
+    async def handle_broadcast(self, request):
+        body: BroadcastRequest = request['body']
+        # Rendered once; every channel in the fan-out reuses its payload
+        embed = embeds.BROADCAST.render(message=body.message, author=self.author_name(body.dashboard_user))
+        return await self.dispatch(request, 'broadcast', 'Broadcast', body.channel_id, embed)
+
+    @idempotent
+    @validates(QotdRequest)
+    async def handle_qotd(self, request):
+        body: QotdRequest = request['body']
+        embed = embeds.QOTD.render(question=body.question, category=embeds.qotd_category(body.category),
+                                   author=self.author_name(body.dashboard_user))
+        return await self.dispatch(request, 'qotd', 'QOTD', body.channel_id, embed,
+                                   reactions=self.settings.qotd_reactions)
+
+    @idempotent
+    @validates(AnnouncementRequest)
+    async def handle_announcement(self, request):
+        body: AnnouncementRequest = request['body']
+        embed = embeds.ANNOUNCEMENT.render(title=body.title, content=body.content,
+                                           author=self.author_name(body.dashboard_user))
+        return await self.dispatch(request, 'announcement', 'Announcement', body.channel_id, embed)
+
+    async def select_guild(self, guild_id):
+        if guild_id:
+            return self.bot.get_guild(int(guild_id))
+        return self.bot.guilds[0] if self.bot.guilds else None
+
+    @idempotent
+    @validates(ModerationRequest)
+    async def handle_moderation(self, request):
+        body: ModerationRequest = request['body']
+        user_id = int(body.user_id)
+
+        try:
+            if not body.guild_id and self.settings.moderation_search_all_guilds:
+                guild, member = await self.member_locator.locate(user_id)
+                if not member:
+                    return codec.respond(request, {'error': 'User not found in any guild'}, status=404)
+            else:
+                guild = await self.select_guild(body.guild_id)
+                if not guild:
+                    return codec.respond(request, {'error': 'Guild not found'}, status=404)
+                member = await self.member_locator.get_member(guild, user_id)
+                if not member:
+                    return codec.respond(request, {'error': 'User not found in guild'}, status=404)
+        except (discord.HTTPException, discord.RateLimited) as e:
+            # Discord is failing or throttling; not the same as an unknown user
+            status = 503 if isinstance(e, discord.RateLimited) or e.status == 429 else 502
+            return codec.respond(request, {'error': 'Member lookup failed, try again'}, status=status)
+
+        result = await self.moderate(request, guild, member, body)
+        if isinstance(result, web.Response):
+            return result
+
+        logger.info(f"Moderation: {body.action} on {member.display_name} in {guild.name} by {body.dashboard_user}")
+        return codec.respond(request, {
+            'success': True,
+            'message': result,
+            'action': body.action,
+            'user': member.display_name,
+            'guild': guild.name
+        })
+
+    async def moderate(self, request, guild, member, body: ModerationRequest):
+        """Apply one action; returns the result message or an error response"""
+        action, reason, dashboard_user = body.action, body.reason, body.dashboard_user
+        notice = embeds.NOTICES[action].render(guild=guild.name, reason=reason, moderator=dashboard_user)
+        if action == 'warn':
+            try:
+                await self.moderation_call(lambda: member.send(embed=notice), 'POST /users/@me/channels')
+                result = f"Warning sent to {member.display_name}"
+            except discord.HTTPException:
+                result = f"Warning issued to {member.display_name} (DM failed)"
+        else:
+            if self.settings.moderation_dm_before_removal:
+                try:
+                    await self.moderation_call(lambda: member.send(embed=notice), 'POST /users/@me/channels')
+                except discord.HTTPException:
+                    pass
+
+            audit_reason = f"Dashboard moderation by {dashboard_user}: {reason}"
+            try:
+                if action == 'kick':
+                    await self.moderation_call(lambda: member.kick(reason=audit_reason),
+                                               'DELETE /guilds/{guild_id}/members/{user_id}', guild.id)
+                    result = f"Kicked {member.display_name} from {guild.name}"
+                else:
+                    await self.moderation_call(
+                        lambda: member.ban(reason=audit_reason, delete_message_seconds=body.delete_days * 86400),
+                        'PUT /guilds/{guild_id}/bans/{user_id}', guild.id)
+                    result = f"Banned {member.display_name} from {guild.name}"
+            except discord.HTTPException as e:
+                # Every attempt is audited, whatever Discord answered
+                if isinstance(e, discord.Forbidden):
+                    error, status = f'Insufficient permissions to {action} user', 403
+                elif isinstance(e, discord.NotFound):
+                    error, status = f'User is no longer in {guild.name}', 404
+                else:
+                    error, status = f'Discord rejected the {action} ({e.status})', 502
+                    logger.error(f"Moderation: {action} on {member.display_name} in {guild.name} failed: {e}")
+                await self.audit(self.audit_entry(guild, member, body, success=False, message=error))
+                return codec.respond(request, {'error': error}, status=status)
+
+        await self.audit(self.audit_entry(guild, member, body, success=True, message=result))
+        if self.settings.moderation_log_channel:
+            await self.post_mod_log(guild, member, action, reason, dashboard_user)
+        return result
+
+    @staticmethod
+    def audit_entry(guild, member, body: ModerationRequest, success: bool, message: str) -> AuditEntry:
+        return AuditEntry(action=body.action, user_id=member.id, user_name=member.display_name, guild_id=guild.id,
+                          guild_name=guild.name, reason=body.reason, moderator=body.dashboard_user,
+                          success=success, message=message)
+
+    async def post_mod_log(self, guild, member, action, reason, dashboard_user):
+        log_channel = self.channel_index.resolve(guild, MOD_LOG)
+        if not log_channel:
+            return
+
+        embed = embeds.MOD_LOG.render(user=f"{member.mention} ({member.id})", action=action.title(),
+                                      moderator=dashboard_user, reason=reason)
+        try:
+            await self.moderation_call(lambda: log_channel.send(embed=embed),
+                                       'POST /channels/{channel_id}/messages', log_channel.id)
+        except discord.HTTPException as e:
+            logger.warning(f"Could not post to mod log in {guild.name}: {e}")
+
+    @idempotent
+    @validates(BulkModerationRequest)
+    async def handle_bulk_moderation(self, request):
+        body: BulkModerationRequest = request['body']
+        guild = await self.select_guild(body.guild_id)
+        if not guild:
+            return codec.respond(request, {'error': 'Guild not found'}, status=404)
+
+        warn_embed = embeds.WARNING_NOTICE.render(guild=guild.name, reason=body.reason,
+                                                  moderator=body.dashboard_user)
+
+        outcomes = await bulk_moderate(
+            guild, body.action, body.user_ids,
+            reason=f"Dashboard moderation by {body.dashboard_user}: {body.reason}",
+            member_locator=self.member_locator,
+            warn_embed=warn_embed,
+            delete_days=body.delete_days,
+            scheduler=self.scheduler,
+        )
+        succeeded = sum(1 for outcome in outcomes if outcome.success)
+        await self.audit(*(AuditEntry(action=body.action, user_id=int(outcome.user_id), guild_id=guild.id,
+                                      guild_name=guild.name, reason=body.reason, moderator=body.dashboard_user,
+                                      success=outcome.success, message=outcome.message, source='bulk')
+                           for outcome in outcomes))
+        logger.info(f"Bulk moderation: {body.action} on {succeeded}/{len(outcomes)} users in {guild.name}")
+
+        return codec.respond(request, {
+            'success': True,
+            'action': body.action,
+            'guild': guild.name,
+            'requested': len(outcomes),
+            'succeeded': succeeded,
+            'failed': len(outcomes) - succeeded,
+            'results': [outcome.to_dict() for outcome in outcomes]
+        })
+
+    async def handle_moderation_history(self, request):
+        if self.audit_store is None:
+            return codec.respond(request, {'error': 'Moderation audit log is disabled'}, status=404)
+        try:
+            query = HistoryQuery.parse(dict(request.query))
+        except ValidationError as e:
+            return codec.respond(request, {'error': 'Invalid input', 'errors': e.errors}, status=400)
+
+        def snowflake(value):
+            return int(value) if value else None
+
+        entries, next_cursor = await self.audit_store.query(
+            user_id=snowflake(query.user_id), guild_id=snowflake(query.guild_id), moderator=query.moderator,
+            action=query.action, since=query.since, until=query.until, cursor=snowflake(query.cursor),
+            limit=query.limit)
+        return codec.respond(request, {
+            'entries': [entry.to_dict() for entry in entries],
+            'count': len(entries),
+            'next_cursor': str(next_cursor) if next_cursor is not None else None,
+        })
+
+
+async def handle_health(request):
+    return web.Response(text="Bot is running!")
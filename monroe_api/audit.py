@@ -0,0 +1,165 @@
+"""
+Durable moderation history.
+
+The only record of a dashboard moderation action used to be an embed in a
+channel whose name happened to contain "log" or "mod". It could not be
+queried and was lost if the channel was. ``AuditStore`` writes every action
+(single and bulk, successful or not) to a local SQLite file. WAL mode lets
+the history endpoint read while an action is being written. Indexes cover
+the questions the moderation panel asks: by user, by guild and by moderator,
+newest first.
+
+``history()`` pages by row id rather than by offset. The cursor is the id of
+the last row returned, so a page costs an index seek however deep it is, and
+actions recorded while the dashboard pages don't shift later pages.
+
+Writes and queries run in a worker thread (see ``storage.py``).
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from .storage import SqliteStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUDIT_PATH = 'moderation-audit.db'
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS moderation_actions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    guild_id INTEGER,
+    guild_name TEXT,
+    user_id INTEGER NOT NULL,
+    user_name TEXT,
+    action TEXT NOT NULL,
+    reason TEXT,
+    moderator TEXT,
+    source TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS moderation_actions_user ON moderation_actions (user_id, id);
+CREATE INDEX IF NOT EXISTS moderation_actions_guild ON moderation_actions (guild_id, id);
+CREATE INDEX IF NOT EXISTS moderation_actions_moderator ON moderation_actions (moderator, id);
+CREATE INDEX IF NOT EXISTS moderation_actions_created ON moderation_actions (created_at);
+"""
+
+_COLUMNS = ('id', 'created_at', 'guild_id', 'guild_name', 'user_id', 'user_name', 'action', 'reason',
+            'moderator', 'source', 'success', 'message')
+
+
+@dataclass
+class AuditEntry:
+    action: str
+    user_id: int
+    guild_id: Optional[int] = None
+    reason: Optional[str] = None
+    moderator: Optional[str] = None
+    success: bool = True
+    message: Optional[str] = None
+    user_name: Optional[str] = None
+    guild_name: Optional[str] = None
+    # 'single' (POST /moderation) or 'bulk' (POST /moderation/bulk)
+    source: str = 'single'
+    created_at: float = 0.0
+    id: Optional[int] = None
+
+    def to_dict(self):
+        return {
+            'id': str(self.id),
+            'created_at': datetime.fromtimestamp(self.created_at, timezone.utc).isoformat(),
+            'action': self.action,
+            # Snowflakes as strings; they don't fit in a JavaScript number
+            'user_id': str(self.user_id),
+            'user_name': self.user_name,
+            'guild_id': str(self.guild_id) if self.guild_id is not None else None,
+            'guild_name': self.guild_name,
+            'reason': self.reason,
+            'moderator': self.moderator,
+            'source': self.source,
+            'success': self.success,
+            'message': self.message,
+        }
+
+
+class AuditStore(SqliteStore):
+    """Moderation actions in a local SQLite database"""
+
+    SCHEMA = _SCHEMA
+
+    def __init__(self, path: str = DEFAULT_AUDIT_PATH):
+        super().__init__(path)
+
+    # -- writing -------------------------------------------------------------
+
+    def write(self, entries: List[AuditEntry]):
+        now = time.time()
+        rows = [(entry.created_at or now, entry.guild_id, entry.guild_name, entry.user_id, entry.user_name,
+                 entry.action, entry.reason, entry.moderator, entry.source, int(entry.success), entry.message)
+                for entry in entries]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute('BEGIN')
+                connection.executemany(
+                    'INSERT INTO moderation_actions (created_at, guild_id, guild_name, user_id, user_name, '
+                    'action, reason, moderator, source, success, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    rows)
+
+    async def record(self, *entries: AuditEntry):
+        """Write entries in one transaction; a failed write is logged, not raised"""
+        if not entries:
+            return
+        try:
+            await asyncio.to_thread(self.write, list(entries))
+        except sqlite3.Error as e:
+            logger.error(f"Could not record {len(entries)} moderation action(s): {e}")
+
+    # -- reading -------------------------------------------------------------
+
+    def history(self, user_id: Optional[int] = None, guild_id: Optional[int] = None,
+                moderator: Optional[str] = None, action: Optional[str] = None,
+                since: Optional[float] = None, until: Optional[float] = None,
+                cursor: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[AuditEntry], Optional[int]]:
+        """Newest first; returns (entries, cursor for the next page or None)"""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        clauses, params = [], []
+        for column, value in (('user_id', user_id), ('guild_id', guild_id),
+                              ('moderator', moderator), ('action', action)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if since is not None:
+            clauses.append('created_at >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('created_at < ?')
+            params.append(until)
+        if cursor is not None:
+            clauses.append('id < ?')
+            params.append(cursor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        # One row past the page tells us whether there is a next one
+        query = f"SELECT {', '.join(_COLUMNS)} FROM moderation_actions {where} ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            rows = self._connect().execute(query, (*params, limit + 1)).fetchall()
+
+        entries = []
+        for row in rows[:limit]:
+            values = dict(zip(_COLUMNS, row))
+            values['success'] = bool(values['success'])
+            entries.append(AuditEntry(**values))
+        next_cursor = entries[-1].id if len(rows) > limit else None
+        return entries, next_cursor
+
+    async def query(self, **filters) -> Tuple[List[AuditEntry], Optional[int]]:
+        return await asyncio.to_thread(self.history, **filters)
@@ -0,0 +1,161 @@
+"""
+Lazy guild member chunking.
+
+With the members intent, discord.py requests every guild's member list
+before it fires ``on_ready``. On large guilds that takes minutes, and until
+then ``bot.start_time`` is unset and ``/api/status`` says offline. The API
+doesn't need member lists to be online: counts come from
+``guild.member_count``, and moderation can fall back to ``fetch_member``.
+
+``MEMBER_CHUNKING`` picks when member lists are loaded:
+
+* ``startup``: discord.py's default, before ``on_ready``
+* ``background``: after ``on_ready``, smallest guilds first, a couple at a time
+* ``on_demand``: only when a moderation lookup or member search touches the
+  guild
+
+In the last two modes, a lookup in a guild that isn't loaded yet moves that
+guild to the front of the queue. It doesn't wait for it; the lookup itself
+uses REST meanwhile. ``progress()`` feeds the chunking metrics.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+CHUNKING_MODES = ('startup', 'background', 'on_demand')
+DEFAULT_CHUNK_CONCURRENCY = 2
+
+
+def chunking_options(mode: str) -> dict:
+    """Extra ``commands.Bot`` kwargs for a chunking mode"""
+    if mode not in CHUNKING_MODES:
+        raise ValueError(f"Unknown chunking mode {mode!r}; expected one of {', '.join(CHUNKING_MODES)}")
+    return {} if mode == 'startup' else {'chunk_guilds_at_startup': False}
+
+
+class GuildChunker:
+    """Loads guild member lists after startup, one guild at a time on request"""
+
+    def __init__(self, bot, mode: str = 'background', store=None,
+                 concurrency: int = DEFAULT_CHUNK_CONCURRENCY):
+        chunking_options(mode)
+        self.bot = bot
+        self.mode = mode
+        # CompactMemberStore in compact member cache mode; else discord.py's cache
+        self.store = store
+        self.concurrency = max(1, concurrency)
+        # Load every guild after ready. discord.py never chunks into a
+        # disabled cache, so compact mode does it here even in 'startup' mode
+        self.eager = mode == 'background' or (mode == 'startup' and store is not None)
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._done: Set[int] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._listeners = []
+        self.started_at: Optional[float] = None
+
+    def add_listener(self, callback):
+        """Call ``callback(guild)`` after each guild's members are loaded"""
+        self._listeners.append(callback)
+
+    def is_chunked(self, guild) -> bool:
+        if guild.id in self._done:
+            return True
+        if self.store is not None:
+            return self.store.is_complete(guild.id)
+        return bool(guild.chunked)
+
+    def progress(self) -> dict:
+        guilds = self.bot.guilds
+        chunked = [guild for guild in guilds if self.is_chunked(guild)]
+        return {
+            'guilds_total': len(guilds),
+            'guilds_chunked': len(chunked),
+            'guilds_loading': sum(1 for task in self._tasks.values() if not task.done()),
+            'members_expected': sum(guild.member_count or 0 for guild in guilds),
+            'members_loaded': sum(guild.member_count or 0 for guild in chunked),
+        }
+
+    # -- loading -------------------------------------------------------------
+
+    async def _load(self, guild):
+        started = time.perf_counter()
+        if self.store is not None:
+            await self.store.fill_guild(guild)
+        else:
+            await guild.chunk()
+        self._done.add(guild.id)
+        logger.info(f"Chunked {guild.name} ({guild.member_count} members) in "
+                    f"{time.perf_counter() - started:.1f}s")
+        for callback in self._listeners:
+            try:
+                callback(guild)
+            except Exception as e:
+                logger.error(f"Chunk listener failed: {e}")
+
+    def request(self, guild, urgent: bool = False) -> Optional[asyncio.Task]:
+        """Start loading a guild's members (once); urgent requests skip the concurrency limit"""
+        if self.is_chunked(guild):
+            return None
+        task = self._tasks.get(guild.id)
+        if task is not None and not task.done():
+            return task
+
+        async def run():
+            try:
+                if urgent:
+                    await self._load(guild)
+                else:
+                    async with self._limit():
+                        if not self.is_chunked(guild):
+                            await self._load(guild)
+            except Exception as e:
+                logger.warning(f"Could not chunk {guild.name}: {e}")
+
+        task = self._tasks[guild.id] = asyncio.create_task(run())
+        return task
+
+    def _limit(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    def needed(self, guild):
+        """A lookup touched this guild; load it now unless it already is"""
+        if self.mode != 'startup' or self.store is not None:
+            self.request(guild, urgent=True)
+
+    async def load_all(self, guilds: List):
+        """Background mode: every guild not yet loaded, smallest first"""
+        self.started_at = time.perf_counter()
+        pending = sorted((guild for guild in guilds if not self.is_chunked(guild)),
+                         key=lambda guild: guild.member_count or 0)
+        tasks = [task for task in (self.request(guild) for guild in pending) if task is not None]
+        if tasks:
+            await asyncio.gather(*tasks)
+        logger.info(f"Background chunking finished: {len(tasks)} guilds in "
+                    f"{time.perf_counter() - self.started_at:.1f}s")
+
+    def attach(self, bot):
+        """Start background chunking after ready and load guilds joined later"""
+
+        async def on_ready():
+            if self.eager:
+                asyncio.create_task(self.load_all(list(bot.guilds)))
+
+        async def on_guild_join(guild):
+            if self.eager:
+                self.request(guild)
+
+        async def on_guild_remove(guild):
+            self._done.discard(guild.id)
+            task = self._tasks.pop(guild.id, None)
+            if task is not None and not task.done():
+                task.cancel()
+
+        bot.add_listener(on_ready, 'on_ready')
+        bot.add_listener(on_guild_join, 'on_guild_join')
+        bot.add_listener(on_guild_remove, 'on_guild_remove')
@@ -0,0 +1,92 @@
+"""
+Request/response body encoding for the dashboard API.
+
+JSON goes through orjson when it is installed and falls back to the stdlib
+``json`` module otherwise. When ``msgpack`` is installed, clients can send
+``Content-Type: application/msgpack`` and ask for msgpack responses with
+``Accept: application/msgpack``. That lets the Express proxy skip JSON on
+the hop to the bot. Neither package is required.
+"""
+
+import json
+from typing import Any, Optional, Tuple
+
+from aiohttp import web
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional format
+    msgpack = None
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+MSGPACK_TYPES = (MSGPACK, 'application/x-msgpack')
+
+
+class DecodeError(ValueError):
+    """Raised when a request body can't be decoded"""
+
+
+if orjson is not None:
+    def dumps(data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(body: bytes) -> Any:
+        return orjson.loads(body)
+
+    JSON_ERRORS = (orjson.JSONDecodeError,)
+else:
+    def dumps(data: Any) -> bytes:
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def loads(body: bytes) -> Any:
+        return json.loads(body)
+
+    JSON_ERRORS = (json.JSONDecodeError, UnicodeDecodeError)
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def decode(body: bytes, content_type: Optional[str]) -> Any:
+    """Decode a request body according to its Content-Type (JSON by default)"""
+    if content_type in MSGPACK_TYPES:
+        if msgpack is None:
+            raise DecodeError('msgpack bodies are not supported by this server')
+        try:
+            return msgpack.unpackb(body, raw=False)
+        except Exception as e:
+            raise DecodeError(f'Invalid msgpack body: {e}')
+    try:
+        return loads(body)
+    except JSON_ERRORS:
+        raise DecodeError('Invalid JSON body')
+
+
+def negotiate(request) -> str:
+    """The response media type a request asked for"""
+    if msgpack is not None:
+        accept = request.headers.get('Accept', '')
+        if any(media_type in accept for media_type in MSGPACK_TYPES):
+            return MSGPACK
+    return JSON
+
+
+def encode(data: Any, media_type: str = JSON) -> Tuple[bytes, str]:
+    if media_type == MSGPACK and msgpack is not None:
+        return msgpack.packb(data, use_bin_type=True), MSGPACK
+    return dumps(data), JSON
+
+
+def respond(request, data: Any, status: int = 200, headers=None) -> web.Response:
+    """``web.json_response`` replacement that uses the fast encoder and honours Accept"""
+    body, media_type = encode(data, negotiate(request) if request is not None else JSON)
+    response = web.Response(body=body, status=status, headers=headers)
+    response.content_type = media_type
+    return response
@@ -0,0 +1,110 @@
+"""
+Slash-command sync that only talks to Discord when the tree changed.
+
+``bot.tree.sync()`` re-uploads every command on every call, and application
+command writes have a tight rate limit. ``CommandSync`` fingerprints each
+scope (global, or one guild) from the same payload ``sync()`` would send. It
+keeps the last synced fingerprints in a small JSON file and only syncs the
+scopes whose fingerprint differs. Restarts and reconnect-triggered
+``on_ready``s therefore skip straight past it.
+
+Set ``FORCE_COMMAND_SYNC=1`` to sync every scope regardless, e.g. after
+editing commands by hand in the developer portal.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, Iterable, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = '.command-sync.json'
+GLOBAL_SCOPE = 'global'
+
+
+def scope_key(guild: Optional[discord.abc.Snowflake]) -> str:
+    return GLOBAL_SCOPE if guild is None else f'guild:{guild.id}'
+
+
+class CommandSync:
+    """Sync a command tree per scope, skipping scopes whose fingerprint is unchanged"""
+
+    def __init__(self, tree: discord.app_commands.CommandTree, path: Optional[str] = None,
+                 force: Optional[bool] = None):
+        self.tree = tree
+        self.path = path or os.getenv('COMMAND_SYNC_STATE', DEFAULT_STATE_PATH)
+        if force is None:
+            force = os.getenv('FORCE_COMMAND_SYNC', '0').lower() in ('1', 'true', 'yes')
+        self.force = force
+        self._state: Optional[Dict[str, str]] = None
+
+    def fingerprint(self, guild: Optional[discord.abc.Snowflake] = None) -> str:
+        """Hash of the payload ``tree.sync(guild=guild)`` would upload"""
+        payload = sorted((command.to_dict(self.tree) for command in self.tree.get_commands(guild=guild)),
+                         key=lambda command: (command.get('type', 1), command['name']))
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    # -- state file ----------------------------------------------------------
+
+    def _state_key(self) -> str:
+        # A different application (e.g. a staging token) has its own commands
+        return str(self.tree.client.application_id or 'unknown')
+
+    def _load(self) -> Dict[str, str]:
+        if self._state is None:
+            try:
+                with open(self.path, encoding='utf-8') as handle:
+                    data = json.load(handle)
+                self._state = dict(data.get(self._state_key(), {}))
+            except FileNotFoundError:
+                self._state = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable command sync state {self.path}: {e}")
+                self._state = {}
+        return self._state
+
+    def _save(self):
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            data = {}
+        data[self._state_key()] = self._state
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            # Write-then-rename so a crash mid-write can't leave half a file
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.command-sync-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(data, handle, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save command sync state to {self.path}: {e}")
+
+    # -- syncing -------------------------------------------------------------
+
+    async def sync_scope(self, guild: Optional[discord.abc.Snowflake] = None) -> Optional[int]:
+        """Sync one scope if it changed; returns the synced count, or None when skipped"""
+        key = scope_key(guild)
+        fingerprint = self.fingerprint(guild)
+        state = self._load()
+        if not self.force and state.get(key) == fingerprint:
+            logger.info(f"Commands for {key} unchanged, skipping sync")
+            return None
+        synced = await self.tree.sync(guild=guild)
+        state[key] = fingerprint
+        self._save()
+        logger.info(f"Synced {len(synced)} commands for {key}")
+        return len(synced)
+
+    async def sync(self, guilds: Iterable[discord.abc.Snowflake] = ()) -> Dict[str, Optional[int]]:
+        """Sync the global scope plus ``guilds``; returns {scope: count or None if skipped}"""
+        results = {GLOBAL_SCOPE: await self.sync_scope()}
+        for guild in guilds:
+            results[scope_key(guild)] = await self.sync_scope(guild)
+        return results
@@ -0,0 +1,181 @@
+"""
+Live bot configuration for ``GET``/``POST /api/config``.
+
+Channel ids and channel-name preferences used to be constants in the
+entrypoints, so changing one meant a restart: a full gateway reconnect and
+member chunking. ``LiveConfig`` holds them as one versioned dict. The
+entrypoint's ``ApiSettings`` provide the defaults, and the values the
+dashboard changed are layered on top. Every accepted update:
+
+* bumps the version, which is also the ETag, so the dashboard can poll with
+  ``If-None-Match`` and save with ``If-Match`` without overwriting someone
+  else's change;
+* is written to disk with write-then-rename, so a crash leaves the old file
+  or the new one, never half of each. Only overrides are saved, meaning keys
+  whose value differs from the entrypoint's default. An edit to a default in
+  code still takes effect after the next restart, unless the dashboard has
+  overridden that key;
+* is applied to the running ``ApiSettings`` and channel index through
+  listeners, so the next send uses it.
+
+``qotd_message_style`` and ``announcement_style`` are stored for the
+dashboard; the embeds don't have style variants.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = 'bot-config.json'
+CONFIG_PURPOSES = ('broadcast', 'qotd', 'announcement')
+
+
+def settings_values(settings) -> Dict[str, Any]:
+    """The configurable values as ``settings`` has them"""
+    values: Dict[str, Any] = {}
+    for purpose in CONFIG_PURPOSES:
+        values[f'{purpose}_channels'] = list(settings.channel_preferences.get(purpose, []))
+        values[f'{purpose}_channel_ids'] = [str(channel_id) for channel_id in settings.fixed_channels.get(purpose, [])]
+    values['mention_everyone'] = list(settings.mention_everyone)
+    values['qotd_reactions'] = list(settings.qotd_reactions)
+    values['qotd_message_style'] = '80s Beach Vibes'
+    values['announcement_style'] = 'Official Monroe'
+    return values
+
+
+def apply_to_settings(values: Dict[str, Any], settings):
+    """Write config values into a running ``ApiSettings``"""
+    preferences = dict(settings.channel_preferences)
+    fixed = dict(settings.fixed_channels)
+    for purpose in CONFIG_PURPOSES:
+        preferences[purpose] = list(values[f'{purpose}_channels'])
+        channel_ids = [int(channel_id) for channel_id in values[f'{purpose}_channel_ids']]
+        if channel_ids:
+            fixed[purpose] = channel_ids
+        else:
+            fixed.pop(purpose, None)
+    # Replaced, not mutated, so a handler mid-request sees old or new, not a mix
+    settings.channel_preferences = preferences
+    settings.fixed_channels = fixed
+    settings.mention_everyone = tuple(values['mention_everyone'])
+    settings.qotd_reactions = tuple(values['qotd_reactions'])
+
+
+class LiveConfig:
+    """Versioned configuration, persisted atomically and pushed to listeners"""
+
+    def __init__(self, defaults: Dict[str, Any], path: Optional[str] = DEFAULT_CONFIG_PATH):
+        self.path = path
+        self.defaults = dict(defaults)
+        # Keys the dashboard set to something other than the default
+        self.overrides: Dict[str, Any] = {}
+        self.values = dict(defaults)
+        self.version = 0
+        self.updated_at: Optional[float] = None
+        self.updated_by: Optional[str] = None
+        self._listeners = []
+        self._lock = asyncio.Lock()
+        self.load()
+
+    def add_listener(self, callback):
+        """Call ``callback(values)`` after every accepted update"""
+        self._listeners.append(callback)
+
+    @property
+    def etag(self) -> str:
+        digest = hashlib.sha256(json.dumps(self.values, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        return f'"{self.version}-{digest}"'
+
+    def to_dict(self) -> dict:
+        return {
+            **copy.deepcopy(self.values),
+            'version': self.version,
+            'updated_at': (datetime.fromtimestamp(self.updated_at, timezone.utc).isoformat()
+                           if self.updated_at else None),
+            'updated_by': self.updated_by,
+            'overridden': sorted(self.overrides),
+        }
+
+    # -- persistence ---------------------------------------------------------
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable config {self.path}: {e}")
+            return
+        # Files from before overrides were split out hold every value
+        saved = data.get('overrides', data.get('values', {}))
+        self.overrides = self._diff(saved)
+        self.values = {**self.defaults, **self.overrides}
+        self.version = int(data.get('version', 0))
+        self.updated_at = data.get('updated_at')
+        self.updated_by = data.get('updated_by')
+        logger.info(f"Loaded config version {self.version} from {self.path}")
+        if self.overrides:
+            logger.info(f"Dashboard overrides replace the defaults for {', '.join(sorted(self.overrides))}")
+
+    def _diff(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """The entries of ``values`` that differ from the defaults; unknown keys are dropped"""
+        return {key: value for key, value in values.items()
+                if key in self.defaults and value != self.defaults[key]}
+
+    def _save(self, data: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.bot-config-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(data, handle, indent=2, sort_keys=True)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    # -- updates -------------------------------------------------------------
+
+    async def update(self, changes: Dict[str, Any], updated_by: Optional[str] = None):
+        """Merge ``changes``, persist, then apply; unknown keys are ignored"""
+        async with self._lock:
+            # A key set back to its default stops being an override
+            overrides = self._diff({**self.overrides, **changes})
+            values = {**self.defaults, **overrides}
+            version = self.version + 1
+            updated_at = time.time()
+            if self.path:
+                # On disk first: if this fails the running config stays as it was
+                await asyncio.to_thread(self._save, {
+                    'version': version,
+                    'updated_at': updated_at,
+                    'updated_by': updated_by,
+                    'overrides': overrides,
+                })
+            self.values, self.overrides, self.version = values, overrides, version
+            self.updated_at, self.updated_by = updated_at, updated_by
+            self.notify()
+        logger.info(f"Config updated to version {version} by {updated_by or 'unknown'}")
+
+    def notify(self):
+        for callback in self._listeners:
+            try:
+                callback(self.values)
+            except Exception as e:
+                logger.error(f"Config listener failed: {e}")
@@ -0,0 +1,135 @@
+"""
+Concurrent fan-out delivery for dashboard-triggered sends.
+
+Broadcasts, QOTD and announcements used to ``await channel.send(...)`` one
+guild at a time, so a request took N round-trips. ``fan_out`` sends to every
+target at once, bounded by a global in-flight limit, while keeping sends that
+share a Discord rate-limit bucket in order so they don't trip each other's 429s.
+Scheduled posts can also spread their sends' start times over a window, so a
+fan-out to every guild isn't one burst.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Discord allows ~50 requests/second globally; stay comfortably below that
+DEFAULT_MAX_IN_FLIGHT = 25
+
+
+@dataclass
+class DeliveryTarget:
+    """A single channel a fan-out should post to"""
+    guild: Any
+    channel: Any
+
+    @property
+    def bucket(self):
+        # POST /channels/{channel_id}/messages is bucketed per channel
+        return getattr(self.channel, 'id', None)
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of one send, yielded as soon as it finishes"""
+    target: DeliveryTarget
+    ok: bool
+    message: Any = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+
+
+@dataclass
+class DeliverySummary:
+    """Aggregated counts for a finished fan-out"""
+    sent: int = 0
+    failed: int = 0
+    results: list = field(default_factory=list)
+
+    def add(self, result: DeliveryResult):
+        self.results.append(result)
+        if result.ok:
+            self.sent += 1
+        else:
+            self.failed += 1
+
+
+SendFunc = Callable[[DeliveryTarget], Awaitable[Any]]
+
+
+async def fan_out(
+    targets: Iterable[DeliveryTarget],
+    send: SendFunc,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    spread: float = 0.0,
+) -> AsyncIterator[DeliveryResult]:
+    """Send to all targets concurrently and yield results as they complete.
+
+    Targets sharing a rate-limit bucket are sent sequentially; distinct
+    buckets run in parallel, never more than ``max_in_flight`` at once.
+    With ``spread``, target *i* of *n* doesn't start before ``i * spread / n``
+    seconds in.
+    """
+    targets = list(targets)
+    step = spread / len(targets) if spread > 0 and targets else 0.0
+    buckets = {}
+    for index, target in enumerate(targets):
+        buckets.setdefault(target.bucket, []).append((index * step, target))
+    if not buckets:
+        return
+    started_at = time.monotonic()
+
+    semaphore = asyncio.Semaphore(max(1, max_in_flight))
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def drain_bucket(bucket_targets):
+        for offset, target in bucket_targets:
+            delay = started_at + offset - time.monotonic()
+            if delay > 0:
+                # Wait outside the semaphore so waiting sends don't hold slots
+                await asyncio.sleep(delay)
+            started = time.perf_counter()
+            try:
+                async with semaphore:
+                    message = await send(target)
+                result = DeliveryResult(target, True, message=message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                result = DeliveryResult(target, False, error=e)
+            result.elapsed = time.perf_counter() - started
+            results.put_nowait(result)
+
+    tasks = [asyncio.create_task(drain_bucket(group)) for group in buckets.values()]
+    remaining = sum(len(group) for group in buckets.values())
+    try:
+        while remaining:
+            yield await results.get()
+            remaining -= 1
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def deliver(
+    targets: Iterable[DeliveryTarget],
+    send: SendFunc,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    label: str = 'Delivery',
+) -> DeliverySummary:
+    """Run ``fan_out`` to completion, logging each result, and return the counts"""
+    summary = DeliverySummary()
+    async for result in fan_out(targets, send, max_in_flight=max_in_flight):
+        summary.add(result)
+        guild_name = getattr(result.target.guild, 'name', '?')
+        channel_name = getattr(result.target.channel, 'name', '?')
+        if result.ok:
+            logger.info(f"{label} sent to {guild_name} (#{channel_name}) in {result.elapsed * 1000:.0f}ms")
+        else:
+            logger.error(f"Failed to send {label.lower()} to {guild_name}: {result.error}")
+    return summary
@@ -0,0 +1,247 @@
+"""
+Compiled embed templates.
+
+Each embed the bot sends is described once as a Discord embed payload with
+``{placeholders}``. ``EmbedTemplate`` compiles it up front: which strings
+need formatting is worked out once, and rendering formats only those. Every
+render builds its own dicts and lists, so an edited embed never changes the
+template. The result is a ``FrozenEmbed`` whose ``to_dict()`` returns that
+payload instead of re-serializing, so a fan-out to thousands of channels
+serializes the embed once rather than once per send.
+"""
+
+import string
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+import discord
+
+_formatter = string.Formatter()
+
+
+class FrozenEmbed(discord.Embed):
+    """An embed that hands out its precomputed payload on every ``to_dict()``
+
+    The embed shares the dicts and lists of its own payload, so in-place
+    changes such as ``add_field`` show up in ``to_dict()``. Setting an
+    attribute (``set_footer``, ``title = ...``) drops the cached payload.
+    """
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> 'FrozenEmbed':
+        embed = cls.from_dict(payload)
+        object.__setattr__(embed, '_payload', payload)
+        return embed
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name != '_payload' and getattr(self, '_payload', None) is not None:
+            object.__setattr__(self, '_payload', None)
+
+    def to_dict(self):
+        payload = getattr(self, '_payload', None)
+        if payload is not None:
+            return payload
+        return super().to_dict()
+
+
+def _placeholders(text: str) -> FrozenSet[str]:
+    return frozenset(name for _, name, _, _ in _formatter.parse(text) if name)
+
+
+def _compile(node) -> Tuple[Callable[[Dict[str, Any]], Any], FrozenSet[str]]:
+    """Returns (render function, placeholder names); each call builds new dicts and lists"""
+    if isinstance(node, str):
+        names = _placeholders(node)
+        if not names:
+            return (lambda values: node), names
+        return (lambda values: node.format_map(values)), names
+
+    if isinstance(node, dict):
+        parts = tuple((key, _compile(value)) for key, value in node.items())
+        names = frozenset().union(*(part[1] for _, part in parts)) if parts else frozenset()
+        return (lambda values: {key: part[0](values) for key, part in parts}), names
+
+    if isinstance(node, list):
+        parts = tuple(_compile(value) for value in node)
+        names = frozenset().union(*(part[1] for part in parts)) if parts else frozenset()
+        return (lambda values: [part[0](values) for part in parts]), names
+
+    # Numbers, booleans and None are immutable; shared safely
+    return (lambda values: node), frozenset()
+
+
+class EmbedTemplate:
+    """An embed payload with ``{placeholders}``, compiled once and rendered per use"""
+
+    def __init__(self, payload: Dict[str, Any], timestamp: bool = True):
+        payload = dict(payload)
+        payload.setdefault('type', 'rich')
+        self.timestamp = timestamp
+        self._render, self.placeholders = _compile(payload)
+
+    @classmethod
+    def build(cls, title: Optional[str] = None, description: Optional[str] = None,
+              color: Optional[int] = None, fields=(), author: Optional[str] = None,
+              footer: Optional[str] = None, footer_icon: Optional[str] = None,
+              thumbnail: Optional[str] = None, timestamp: bool = True) -> 'EmbedTemplate':
+        """Describe a template with the same pieces ``discord.Embed`` takes"""
+        payload: Dict[str, Any] = {}
+        if title is not None:
+            payload['title'] = title
+        if description is not None:
+            payload['description'] = description
+        if color is not None:
+            payload['color'] = color
+        if fields:
+            payload['fields'] = [
+                {'name': name, 'value': value, 'inline': inline} for name, value, inline in fields
+            ]
+        if author is not None:
+            payload['author'] = {'name': author}
+        if footer is not None:
+            payload['footer'] = {'text': footer}
+            if footer_icon is not None:
+                payload['footer']['icon_url'] = footer_icon
+        if thumbnail is not None:
+            payload['thumbnail'] = {'url': thumbnail}
+        return cls(payload, timestamp=timestamp)
+
+    def payload(self, **values) -> Dict[str, Any]:
+        """The Discord payload with ``values`` filled in"""
+        missing = self.placeholders.difference(values)
+        if missing:
+            raise KeyError(f"Missing embed values: {', '.join(sorted(missing))}")
+        payload = self._render(values)
+        if self.timestamp:
+            payload['timestamp'] = discord.utils.utcnow().isoformat()
+        return payload
+
+    def render(self, **values) -> FrozenEmbed:
+        return FrozenEmbed.from_payload(self.payload(**values))
+
+
+# -- dashboard sends ---------------------------------------------------------
+
+BROADCAST = EmbedTemplate.build(
+    title="📢 Monroe Bot Broadcast",
+    description="{message}",
+    color=0x7c3aed,
+    author="{author}",
+    footer="Sent from Monroe Dashboard",
+)
+
+QOTD = EmbedTemplate.build(
+    title="🤔 Question of the Day{category}",
+    description="{question}",
+    color=0xf59e0b,
+    author="{author}",
+    footer="Answer in the comments below!",
+)
+
+ANNOUNCEMENT = EmbedTemplate.build(
+    title="📢 {title}",
+    description="{content}",
+    color=0x7c3aed,
+    author="{author}",
+    footer="Official Monroe Announcement",
+)
+
+# -- moderation notices (DMed to the member) ---------------------------------
+
+WARNING_NOTICE = EmbedTemplate.build(
+    title="⚠️ Warning",
+    description="You were warned in {guild}",
+    color=0xfbbf24,
+    fields=[("Reason", "{reason}", False), ("Moderator", "{moderator}", True)],
+)
+
+KICK_NOTICE = EmbedTemplate.build(
+    title="👢 Kicked",
+    description="You were kicked from {guild}",
+    color=0xf97316,
+    fields=[("Reason", "{reason}", False), ("Moderator", "{moderator}", True)],
+)
+
+BAN_NOTICE = EmbedTemplate.build(
+    title="🔨 Banned",
+    description="You were banned from {guild}",
+    color=0xef4444,
+    fields=[("Reason", "{reason}", False), ("Moderator", "{moderator}", True)],
+)
+
+NOTICES = {'warn': WARNING_NOTICE, 'kick': KICK_NOTICE, 'ban': BAN_NOTICE}
+
+# -- moderation confirmations and logs ---------------------------------------
+
+ACTION_CONFIRMATION = EmbedTemplate.build(
+    title="✅ {heading}",
+    description="{summary}",
+    color=0x10b981,
+    fields=[("Reason", "{reason}", False), ("Moderator", "{moderator}", True)],
+    timestamp=False,
+)
+
+MOD_LOG = EmbedTemplate.build(
+    title="🔨 Moderation Action: {action}",
+    color=0xE74C3C,
+    fields=[
+        ("User", "{user}", True),
+        ("Action", "{action}", True),
+        ("Moderator", "{moderator}", True),
+        ("Reason", "{reason}", False),
+    ],
+)
+
+# -- community ---------------------------------------------------------------
+
+WELCOME = EmbedTemplate.build(
+    title="🌴 Welcome to Monroe Social Club! 🌴",
+    description="Hey {mention}! Welcome to our retro beach hangout!",
+    color=0xFF69B4,  # Hot pink for 80s vibe
+    fields=[
+        ("🌊 We are now members strong!", "Get ready for some awesome 80s vibes!", False),
+        ("🎮 Join Our Roblox Experience",
+         "**Monroe Social Club**\nExperience the ultimate 80s beach party!", True),
+        ("👥 Join Our Roblox Group",
+         "**Monroe Social Club Group**\nGet exclusive perks and stay updated!", True),
+        ("👑 Management Team",
+         "• **Samu** - Chairman 👑\n• **Luca** - Vice Chairman 💎\n• **Fra** - President 🏆\n"
+         "• **Rev** - Vice President 🔨", False),
+        ("🔧 Important Commands",
+         "• **/verify** - Link your Roblox account\n• **/profile** - View your Roblox profile\n"
+         "• **/help** - Get help with commands", False),
+        ("🚀 Getting Started",
+         "1. Read the rules\n2. Verify your Roblox account\n3. Get your ping roles\n"
+         "4. Join our Roblox game\n5. Have fun in the community!", False),
+    ],
+    thumbnail="{avatar_url}",
+    footer="Monroe Social Club - 80s Beach Vibes 🌴",
+    footer_icon="{bot_avatar_url}",
+)
+
+MANAGEMENT = EmbedTemplate.build(
+    title="👑 Monroe Social Club Management Team",
+    description="Meet the leadership team operating from our beachfront yacht!",
+    color=0x00CED1,  # Dark turquoise for ocean theme
+    fields=[
+        ("👑 Chairman", "**Samu** - Server Owner\nLeading the club from the yacht's bridge", True),
+        ("💎 Vice Chairman", "**Luca** - Second in Command\nEnsuring smooth operations", True),
+        ("🏆 President", "**Fra** - Club President\nManaging daily activities", True),
+        ("🔨 Vice President", "**Rev** - Assistant President\nSupporting club initiatives", True),
+    ],
+    footer="Monroe Social Club - 1980s Beach Paradise 🌴",
+)
+
+
+def welcome_embed(member, bot_user) -> FrozenEmbed:
+    """The welcome embed for a member who just joined"""
+    return WELCOME.render(
+        mention=member.mention,
+        avatar_url=member.display_avatar.url,
+        bot_avatar_url=bot_user.display_avatar.url,
+    )
+
+
+def qotd_category(category: Optional[str]) -> str:
+    return f" - {category}" if category else ""
+
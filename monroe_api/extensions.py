@@ -0,0 +1,226 @@
+"""
+Parallel, timed and deferred extension loading.
+
+``bot.load_extension`` runs an extension's imports, module body and
+``setup()`` one extension after another, so a slow third-party import in
+one cog delays every cog after it. ``ExtensionLoader`` does it in three
+steps:
+
+1. Each extension's source is read to find what it imports, and those
+   modules are imported in worker threads in parallel. They land in
+   ``sys.modules``, so each is executed once.
+2. ``load_extension`` then runs for every extension concurrently. By then
+   it only executes the extension's own module body and its ``setup()``.
+   Async setups that wait on I/O overlap.
+3. Extensions marked as deferred are left out of startup entirely. They load
+   in the background once the gateway is ready, or earlier if a prefix
+   command isn't found before then.
+
+Every step is timed per extension. ``report_lines()`` is the startup
+report.
+"""
+
+import ast
+import asyncio
+import importlib
+import importlib.util
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from discord.ext import commands
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExtensionTiming:
+    name: str
+    deferred: bool = False
+    loaded: bool = False
+    error: Optional[str] = None
+    # Importing the extension's dependencies (worker thread)
+    import_seconds: float = 0.0
+    # load_extension: the module body plus setup()
+    setup_seconds: float = 0.0
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'deferred': self.deferred,
+            'loaded': self.loaded,
+            'error': self.error,
+            'import_ms': round(self.import_seconds * 1000, 1),
+            'setup_ms': round(self.setup_seconds * 1000, 1),
+        }
+
+
+def imported_modules(name: str) -> List[str]:
+    """Absolute names of the modules an extension imports, read from its source"""
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.origin or not spec.origin.endswith('.py'):
+        return []
+    with open(spec.origin, encoding='utf-8') as handle:
+        tree = ast.parse(handle.read(), filename=spec.origin)
+
+    package = name if spec.submodule_search_locations else name.rpartition('.')[0]
+    found: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                try:
+                    module = importlib.util.resolve_name('.' * node.level + (node.module or ''), package)
+                except ImportError:
+                    continue
+            else:
+                module = node.module
+            if module:
+                found.append(module)
+                # ``from package import name`` may name a submodule
+                found.extend(f'{module}.{alias.name}' for alias in node.names if alias.name != '*')
+    return [module for module in dict.fromkeys(found) if module != name]
+
+
+def _prefetch(modules: Iterable[str]):
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            # Optional imports behind try/except, platform-only modules, ...;
+            # load_extension reports anything that actually breaks the cog
+            pass
+
+
+class ExtensionLoader:
+    """Load a bot's extensions in parallel, deferring the rarely used ones"""
+
+    def __init__(self, bot: commands.Bot, extensions: Iterable[str], deferred: Iterable[str] = ()):
+        self.bot = bot
+        self.deferred = list(dict.fromkeys(deferred))
+        self.extensions = [name for name in dict.fromkeys(extensions) if name not in self.deferred]
+        self.timings: Dict[str, ExtensionTiming] = {
+            name: ExtensionTiming(name, deferred=name in self.deferred)
+            for name in [*self.extensions, *self.deferred]
+        }
+        self.started_at: Optional[float] = None
+        self.eager_seconds = 0.0
+        self._deferred_task: Optional[asyncio.Task] = None
+        self._attached = False
+
+    @property
+    def loaded(self) -> int:
+        return sum(1 for timing in self.timings.values() if timing.loaded)
+
+    @property
+    def deferred_done(self) -> bool:
+        return self._deferred_task is not None and self._deferred_task.done()
+
+    async def _load_all(self, names: List[str]):
+        async def prefetch(name):
+            timing = self.timings[name]
+            started = time.perf_counter()
+            try:
+                # Extensions are always executed fresh by load_extension, so
+                # importing one here would run its module body twice
+                modules = [module for module in imported_modules(name) if module not in self.timings]
+            except (ImportError, SyntaxError, OSError, ValueError):
+                modules = []
+            await asyncio.to_thread(_prefetch, modules)
+            timing.import_seconds = time.perf_counter() - started
+
+        async def load(name):
+            timing = self.timings[name]
+            started = time.perf_counter()
+            try:
+                await self.bot.load_extension(name)
+                timing.loaded = True
+            except commands.ExtensionAlreadyLoaded:
+                timing.loaded = True
+            except Exception as e:
+                timing.error = str(e)
+                logger.error(f"Failed to load extension {name}: {e}")
+            timing.setup_seconds = time.perf_counter() - started
+
+        await asyncio.gather(*(prefetch(name) for name in names))
+        await asyncio.gather(*(load(name) for name in names))
+
+    async def load(self):
+        """Load the eager extensions; call before ``bot.start``"""
+        self.started_at = time.perf_counter()
+        await self._load_all(self.extensions)
+        self.eager_seconds = time.perf_counter() - self.started_at
+        if self.deferred:
+            self.attach()
+
+    def load_deferred(self) -> asyncio.Task:
+        """Start loading the deferred extensions (once); await the task to wait for them"""
+        if self._deferred_task is None:
+            async def run():
+                started = time.perf_counter()
+                await self._load_all(self.deferred)
+                logger.info(f"Deferred extensions loaded in {(time.perf_counter() - started) * 1000:.0f}ms")
+            self._deferred_task = asyncio.create_task(run())
+        return self._deferred_task
+
+    def attach(self):
+        """Load deferred extensions on ready, or on the first unknown prefix command"""
+        if self._attached:
+            return
+        self._attached = True
+
+        async def on_ready():
+            self.load_deferred()
+
+        async def on_command_error(ctx, error):
+            task = self._deferred_task
+            if not isinstance(error, commands.CommandNotFound) or (task is not None and task.done()):
+                self.report_command_error(ctx, error)
+                return
+            await self.load_deferred()
+            # The command may have come from a deferred extension; try it again
+            if self.bot.get_command(ctx.invoked_with or '') is not None:
+                await self.bot.process_commands(ctx.message)
+            else:
+                self.report_command_error(ctx, error)
+
+        self.bot.add_listener(on_ready, 'on_ready')
+        self.bot.add_listener(on_command_error, 'on_command_error')
+
+    def report_command_error(self, ctx, error):
+        """Log what discord.py's default on_command_error would have
+
+        The default handler stays silent whenever an ``on_command_error``
+        listener exists, and ``attach`` adds one.
+        """
+        bot = self.bot
+        if 'on_command_error' in vars(bot) or type(bot).on_command_error is not commands.Bot.on_command_error:
+            # The entrypoint handles command errors itself
+            return
+        if len(bot.extra_events.get('on_command_error', ())) > 1:
+            return
+        command, cog = ctx.command, ctx.cog
+        if (command and command.has_error_handler()) or (cog and cog.has_error_handler()):
+            return
+        logger.error(f"Ignoring exception in command {command}", exc_info=error)
+
+    def report(self) -> List[dict]:
+        return [timing.to_dict() for timing in self.timings.values()]
+
+    def report_lines(self) -> List[str]:
+        """The startup report: one line per extension, slowest first"""
+        lines = []
+        ordered = sorted(self.timings.values(), key=lambda t: t.import_seconds + t.setup_seconds, reverse=True)
+        for timing in ordered:
+            if timing.deferred and not timing.loaded and timing.error is None:
+                state = 'deferred'
+            else:
+                state = 'ok' if timing.loaded else f'failed: {timing.error}'
+            lines.append(f"{timing.name:<28} import {timing.import_seconds * 1000:7.1f}ms  "
+                         f"setup {timing.setup_seconds * 1000:7.1f}ms  {state}")
+        eager = [timing for timing in self.timings.values() if not timing.deferred]
+        lines.append(f"{sum(1 for t in eager if t.loaded)}/{len(eager)} extensions loaded in "
+                     f"{self.eager_seconds * 1000:.0f}ms ({len(self.deferred)} deferred)")
+        return lines
@@ -0,0 +1,337 @@
+"""
+Gateway session resume across restarts.
+
+Every start used to IDENTIFY from scratch. That means a new session, a
+READY carrying every guild, and member chunking. Any events sent while the
+bot was down (joins, leaves, messages) are lost. Discord keeps a session
+resumable for a short while after its socket closes. With
+``GATEWAY_RESUME=1``, ``create_bot`` builds a ``ResumableBot``, which uses
+that window:
+
+* On a clean shutdown (``close()``, SIGTERM or SIGINT) it writes the session
+  id, sequence number and resume URL to ``GATEWAY_SESSION_PATH``. It then
+  closes the socket with code 4000 instead of 1000, because a 1000 close
+  ends the session.
+* On the next start it takes (reads and deletes) that file. If the session
+  is recent enough, it sends RESUME instead of IDENTIFY. Discord then replays
+  the events missed in between and sends RESUMED.
+
+A resumed session gets no READY, so the new process would start with an
+empty cache. Before resuming, the guilds the old process was in are loaded
+over REST (guild, channels, the bot's own member), so the replayed events
+have somewhere to land. ``on_ready`` fires once RESUMED arrives, as it does
+after a READY.
+
+A session that is missing, too old, or covers too many guilds to load, and
+a RESUME that Discord rejects, all fall back to a normal IDENTIFY.
+
+Resuming relies on discord.py internals (``ConnectionState`` guild loading
+and ready handling, ``DiscordWebSocket.from_client``, ``_handle_ready``).
+They are checked at import. If this discord.py lacks any of them, sessions
+are neither saved nor resumed and the bot always IDENTIFYs.
+``bot.gateway_startup`` records which path was taken and why, and the same
+report is logged. Not available with ``BOT_SHARDED``.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import signal
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+import aiohttp
+import discord
+import yarl
+from discord.ext import commands
+from discord.gateway import DiscordWebSocket, ReconnectWebSocket
+from discord.http import HTTPClient
+from discord.state import ConnectionState
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_PATH = '.gateway-session.json'
+# Discord drops a disconnected session after a few minutes
+MAX_SESSION_AGE = 300.0
+# Past this many guilds, loading them over REST costs more than an IDENTIFY
+MAX_RESUME_GUILDS = 100
+HYDRATE_CONCURRENCY = 5
+
+# Failures that end a resume attempt; the bot then IDENTIFYs
+RESUME_ERRORS = (ReconnectWebSocket, discord.ConnectionClosed, discord.HTTPException, discord.GatewayNotFound,
+                 OSError, aiohttp.ClientError, asyncio.TimeoutError)
+
+
+def _missing_internals() -> List[str]:
+    """The discord.py internals the resume path uses that this version lacks"""
+    required = {
+        ConnectionState: ('_add_guild_from_data', 'call_handlers', '_guild_needs_chunking'),
+        HTTPClient: ('get_guild', 'get_all_guild_channels', 'get_member'),
+        commands.Bot: ('_handle_ready',),
+    }
+    missing = [f'{owner.__name__}.{name}' for owner, names in required.items()
+               for name in names if not hasattr(owner, name)]
+    try:
+        parameters = inspect.signature(DiscordWebSocket.from_client).parameters
+    except (TypeError, ValueError):
+        parameters = {}
+    missing += [f'DiscordWebSocket.from_client({name}=)'
+                for name in ('gateway', 'session', 'sequence', 'resume', 'shard_id') if name not in parameters]
+    return missing
+
+
+MISSING_INTERNALS = _missing_internals()
+if MISSING_INTERNALS:
+    logger.warning(f"discord.py {discord.__version__} lacks {', '.join(MISSING_INTERNALS)}; "
+                   f"GATEWAY_RESUME will always identify")
+
+
+def _describe(error: BaseException) -> str:
+    if isinstance(error, ReconnectWebSocket):
+        return 'session invalidated'
+    if isinstance(error, discord.ConnectionClosed):
+        return f'gateway closed with {error.code}'
+    return type(error).__name__
+
+
+@dataclass
+class GatewaySession:
+    session_id: str
+    sequence: Optional[int]
+    resume_url: str
+    user_id: int
+    guild_ids: List[int] = field(default_factory=list)
+    saved_at: float = field(default_factory=time.time)
+
+
+class SessionStore:
+    """One saved session in a JSON file, written atomically and read once"""
+
+    def __init__(self, path: str = DEFAULT_SESSION_PATH):
+        self.path = path
+
+    def save(self, session: GatewaySession):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.gateway-session-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(asdict(session), handle)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def take(self) -> Optional[GatewaySession]:
+        """The saved session, removed from disk so it is only tried once"""
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable gateway session {self.path}: {e}")
+            data = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        if data is None:
+            return None
+        try:
+            return GatewaySession(**data)
+        except TypeError as e:
+            logger.warning(f"Ignoring malformed gateway session {self.path}: {e}")
+            return None
+
+
+class ResumableBot(commands.Bot):
+    """``commands.Bot`` that saves its gateway session on close and resumes it on start"""
+
+    def __init__(self, *args, session_store: Optional[SessionStore] = None,
+                 max_session_age: float = MAX_SESSION_AGE, max_resume_guilds: int = MAX_RESUME_GUILDS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session_store = session_store or SessionStore()
+        self.max_session_age = max_session_age
+        self.max_resume_guilds = max_resume_guilds
+        # {'path': 'resume' | 'identify', 'reason', 'seconds', 'guilds'}, set at the first ready
+        self.gateway_startup: Optional[dict] = None
+        self._startup: Optional[dict] = None
+        self._restoring = False
+        # Set once close() has started: stops connect() reconnecting under it
+        self._parking = False
+        self._closing: Optional[asyncio.Task] = None
+        self.add_listener(self._on_gateway_resumed, 'on_resumed')
+
+    def is_closed(self) -> bool:
+        return self._parking or super().is_closed()
+
+    # -- shutdown ------------------------------------------------------------
+
+    async def start(self, token: str, *, reconnect: bool = True):
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, lambda: asyncio.ensure_future(self.close()))
+            except (NotImplementedError, RuntimeError):
+                # Windows, or not the main thread: close() still saves when called
+                pass
+        await super().start(token, reconnect=reconnect)
+        if self._closing is not None:
+            # connect() returns as soon as the socket is parked; finish closing
+            # before the caller's event loop shuts down
+            await self._closing
+
+    async def close(self):
+        if self._closing is None:
+            self._parking = True
+            self._closing = asyncio.create_task(self._park_and_close())
+        await self._closing
+
+    async def _park_and_close(self):
+        await self._park()
+        await super().close()
+
+    async def _park(self):
+        """Save the session and close the socket without ending it"""
+        ws = self.ws
+        if MISSING_INTERNALS or ws is None or not ws.open or not ws.session_id or self.user is None:
+            return
+        session = GatewaySession(
+            session_id=ws.session_id,
+            sequence=ws.sequence,
+            resume_url=str(ws.gateway),
+            user_id=self.user.id,
+            guild_ids=[guild.id for guild in self.guilds],
+        )
+        try:
+            await asyncio.to_thread(self.session_store.save, session)
+        except OSError as e:
+            logger.error(f"Could not save gateway session to {self.session_store.path}: {e}")
+            return
+        await ws.close(code=4000)
+        logger.info(f"Saved gateway session {session.session_id} at sequence {session.sequence}")
+
+    # -- startup -------------------------------------------------------------
+
+    async def connect(self, *, reconnect: bool = True):
+        started = time.monotonic()
+        session, reason = await self._usable_session()
+        if session is not None:
+            self._startup = {'path': 'resume', 'reason': None, 'started': started}
+            try:
+                await self._resume(session)
+                return
+            except RESUME_ERRORS as e:
+                if self._restoring:
+                    reason = f'resume failed: {_describe(e)}'
+                    logger.warning(f"Gateway resume failed ({e!r}); identifying instead")
+                else:
+                    # Resumed fine earlier; this is an ordinary disconnect later on
+                    logger.warning(f"Resumed gateway session lost ({e!r}); identifying")
+            self._restoring = False
+            if self.is_closed():
+                return
+        if self.gateway_startup is None:
+            self._startup = {'path': 'identify', 'reason': reason, 'started': started}
+        await super().connect(reconnect=reconnect)
+
+    async def _usable_session(self):
+        """(session, None) if it is worth resuming, else (None, why not)"""
+        try:
+            session = await asyncio.to_thread(self.session_store.take)
+        except OSError as e:
+            return None, f'session unreadable: {e}'
+        if session is None:
+            return None, 'no saved session'
+        if MISSING_INTERNALS:
+            return None, f'discord.py {discord.__version__} cannot resume'
+        age = time.time() - session.saved_at
+        if age > self.max_session_age:
+            return None, f'saved session expired ({age:.0f}s old)'
+        if self.user is None or session.user_id != self.user.id:
+            return None, 'saved session belongs to another bot user'
+        if len(session.guild_ids) > self.max_resume_guilds:
+            return None, f'{len(session.guild_ids)} guilds is too many to load over REST'
+        return session, None
+
+    async def _resume(self, session: GatewaySession):
+        """RESUME and run the session; raises one of RESUME_ERRORS when it can't go on"""
+        self._restoring = True
+        await self._hydrate(session.guild_ids)
+        params = {'gateway': yarl.URL(session.resume_url), 'session': session.session_id,
+                  'sequence': session.sequence}
+        while not self.is_closed():
+            try:
+                coro = DiscordWebSocket.from_client(self, resume=True, shard_id=self.shard_id, **params)
+                self.ws = await asyncio.wait_for(coro, timeout=60.0)
+                while True:
+                    await self.ws.poll_event()
+            except ReconnectWebSocket as e:
+                if not e.resume:
+                    # INVALID_SESSION: Discord won't resume this session
+                    raise
+                self.dispatch('disconnect')
+                params = {'gateway': self.ws.gateway, 'session': self.ws.session_id, 'sequence': self.ws.sequence}
+
+    async def _hydrate(self, guild_ids: List[int]):
+        """Load the guilds a resumed session covers, since no READY will bring them"""
+        state = self._connection
+        semaphore = asyncio.Semaphore(HYDRATE_CONCURRENCY)
+
+        async def load(guild_id: int):
+            async with semaphore:
+                try:
+                    data = await self.http.get_guild(guild_id, with_counts=True)
+                    data['channels'] = await self.http.get_all_guild_channels(guild_id)
+                    data['members'] = [await self.http.get_member(guild_id, self.user.id)]
+                except (discord.NotFound, discord.Forbidden):
+                    # Left or was removed while offline; the replay will say so
+                    return
+            data['member_count'] = data.get('approximate_member_count')
+            state._add_guild_from_data(data)
+
+        await asyncio.gather(*(load(guild_id) for guild_id in guild_ids))
+        logger.info(f"Loaded {len(self.guilds)} guilds over REST for gateway resume")
+
+    async def _on_gateway_resumed(self):
+        if not self._restoring:
+            return
+        self._restoring = False
+        # What READY would have done: mark ready, dispatch on_ready, then chunk
+        self._connection.call_handlers('ready')
+        self.dispatch('ready')
+        state = self._connection
+        pending = [guild for guild in self.guilds if state._guild_needs_chunking(guild)]
+        if pending:
+            asyncio.create_task(self._chunk(pending))
+
+    async def _chunk(self, guilds):
+        for guild in guilds:
+            try:
+                await guild.chunk()
+            except Exception as e:
+                logger.warning(f"Could not load members of {guild.name} after resume: {e}")
+
+    def _handle_ready(self):
+        startup, self._startup = self._startup, None
+        if startup is not None and self.gateway_startup is None:
+            self.gateway_startup = {
+                'path': startup['path'],
+                'reason': startup['reason'],
+                'seconds': round(time.monotonic() - startup['started'], 3),
+                'guilds': len(self.guilds),
+            }
+            if startup['path'] == 'resume':
+                logger.info(f"Gateway session resumed in {self.gateway_startup['seconds']}s")
+            else:
+                logger.info(f"Gateway identified in {self.gateway_startup['seconds']}s ({startup['reason']})")
+        super()._handle_ready()
@@ -0,0 +1,140 @@
+"""
+``Idempotency-Key`` support for the send and moderation endpoints.
+
+If the dashboard proxy gives up on a slow ``/api/broadcast`` and the user
+clicks again, the bot used to run the whole fan-out a second time. Handlers
+marked ``@idempotent`` now honour an ``Idempotency-Key`` request header:
+
+* The first request with a key runs as usual. Its response is kept in a
+  size-bounded TTL cache, keyed by method, path and key.
+* A repeat while the first is still running waits for it and gets the same
+  response. It doesn't start a second operation.
+* A repeat after it finished gets the stored response, marked with
+  ``Idempotent-Replayed: true``. A queued send's replay carries the original
+  ``job_id``, so the dashboard can keep following that job.
+* The same key with a different body is a client bug and gets a 422.
+
+Only answers below 500 are stored. A 503 from a full queue, or a handler
+that raised, can be retried with the same key. Requests without the header
+behave as before.
+"""
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, Hashable, Tuple
+
+from aiohttp import web
+
+from . import codec
+from .ttlcache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+# Long enough to cover a user retrying the next day; responses are small
+DEFAULT_TTL = 24 * 3600.0
+DEFAULT_CACHE_SIZE = 2000
+# Response headers worth replaying (content type is set separately)
+_KEPT_HEADERS = ('ETag', 'Location', 'Retry-After')
+
+
+def idempotent(handler):
+    """Mark a handler as honouring ``Idempotency-Key`` (see the module docstring)"""
+    handler.idempotent = True
+    return handler
+
+
+@dataclass
+class StoredResponse:
+    # Hash of the request body, so a reused key with a new body is caught
+    fingerprint: str
+    status: int
+    body: bytes
+    content_type: str
+    headers: Tuple[Tuple[str, str], ...] = ()
+
+    @classmethod
+    def capture(cls, fingerprint: str, response: web.Response) -> 'StoredResponse':
+        headers = tuple((name, response.headers[name]) for name in _KEPT_HEADERS if name in response.headers)
+        return cls(fingerprint, response.status, bytes(response.body or b''), response.content_type, headers)
+
+    def build(self, replayed: bool) -> web.Response:
+        response = web.Response(body=self.body, status=self.status, headers=dict(self.headers))
+        response.content_type = self.content_type
+        if replayed:
+            response.headers[REPLAYED_HEADER] = 'true'
+        return response
+
+
+class IdempotencyStore:
+    """Finished responses in a TTL LRU, plus the operations still running"""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_TTL):
+        self.cache = TTLCache(max_size, ttl)
+        self._inflight: Dict[Hashable, Tuple[str, asyncio.Task]] = {}
+        self.executed = 0
+        self.replayed = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def fingerprint(request, body: bytes) -> str:
+        digest = hashlib.sha256(request.content_type.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(body)
+        return digest.hexdigest()
+
+    async def run(self, request, handler) -> web.StreamResponse:
+        key = request.headers[HEADER]
+        if not key or len(key) > MAX_KEY_LENGTH or not key.isprintable():
+            return codec.respond(request, {'error': f'Invalid {HEADER} header'}, status=400)
+        cache_key = (request.method, request.path, key)
+        fingerprint = self.fingerprint(request, await request.read())
+
+        stored = self.cache.get(cache_key)
+        if stored is not MISSING:
+            if stored.fingerprint != fingerprint:
+                return self._mismatch(request)
+            self.replayed += 1
+            return stored.build(replayed=True)
+
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            if inflight[0] != fingerprint:
+                return self._mismatch(request)
+            self.coalesced += 1
+            _, stored = await asyncio.shield(inflight[1])
+            return stored.build(replayed=True)
+
+        self.executed += 1
+        # Its own task, so a client that disconnects doesn't cancel the
+        # operation the other callers are waiting on
+        task = asyncio.create_task(self._execute(request, handler, cache_key, fingerprint))
+        self._inflight[cache_key] = (fingerprint, task)
+        task.add_done_callback(lambda done: self._finished(cache_key, done))
+        response, _ = await asyncio.shield(task)
+        return response
+
+    async def _execute(self, request, handler, cache_key, fingerprint):
+        """Run the handler once; returns its response and a copy for the callers waiting on it"""
+        response = await handler(request)
+        if not isinstance(response, web.Response):
+            raise TypeError(f'{request.path} returned a {type(response).__name__}, which cannot be replayed')
+        stored = StoredResponse.capture(fingerprint, response)
+        if response.status < 500:
+            self.cache.set(cache_key, stored)
+        return response, stored
+
+    def _finished(self, cache_key, task: asyncio.Task):
+        self._inflight.pop(cache_key, None)
+        if not task.cancelled() and task.exception() is not None:
+            # Raised to whoever awaited it; logged here in case its caller went away
+            logger.debug(f"Idempotent request {cache_key[1]} failed: {task.exception()!r}")
+
+    @staticmethod
+    def _mismatch(request) -> web.Response:
+        return codec.respond(request, {'error': f'{HEADER} was already used with a different request'},
+                             status=422)
@@ -0,0 +1,208 @@
+"""
+In-process job queue for dashboard-triggered sends.
+
+Send endpoints enqueue a job and answer ``202`` straight away; a small pool of
+workers running on the bot's event loop drains the queue through ``fan_out``
+and keeps per-job progress that ``GET /api/jobs/{id}`` reports.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from .delivery import DEFAULT_MAX_IN_FLIGHT, DeliveryTarget, SendFunc, fan_out
+from .ratelimit import throttle_observer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 100
+# Finished jobs kept around so their status can still be queried
+DEFAULT_HISTORY = 200
+CANCELLED = 'The job queue stopped before the job finished'
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+
+@dataclass
+class Job:
+    """A queued fan-out and its live progress counters"""
+    kind: str
+    targets: List[DeliveryTarget]
+    send: SendFunc
+    # Seconds to spread the sends' start times over (0 = all at once)
+    spread: float = 0.0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = 'queued'
+    total: int = 0
+    sent: int = 0
+    failed: int = 0
+    error: Optional[str] = None
+    # 429s the scheduler absorbed while sending, and how long they held us up
+    rate_limited: int = 0
+    throttled_seconds: float = 0.0
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def pending(self):
+        return max(0, self.total - self.sent - self.failed)
+
+    @property
+    def done(self):
+        return self.status in ('completed', 'failed', 'cancelled')
+
+    def note_rate_limited(self, retry_after: float):
+        self.rate_limited += 1
+        self.throttled_seconds += retry_after
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'total': self.total,
+            'sent': self.sent,
+            'failed': self.failed,
+            'pending': self.pending,
+            'error': self.error,
+            'spread_seconds': self.spread,
+            'rate_limited': self.rate_limited,
+            'throttled_seconds': round(self.throttled_seconds, 3),
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobQueue:
+    """Bounded queue plus a fixed pool of worker tasks"""
+
+    def __init__(self, workers=DEFAULT_WORKERS, maxsize=DEFAULT_QUEUE_SIZE,
+                 history=DEFAULT_HISTORY, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        self.worker_count = workers
+        self.max_in_flight = max_in_flight
+        self.history = history
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._workers: List[asyncio.Task] = []
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Call ``callback(job)`` whenever a job's progress changes"""
+        self._listeners.append(callback)
+
+    def _notify(self, job: Job):
+        for callback in self._listeners:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.error(f"Job listener failed: {e}")
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    def start(self):
+        """Spawn the worker tasks on the running loop (idempotent)"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f'monroe-job-worker-{i}')
+            for i in range(self.worker_count)
+        ]
+        logger.info(f"Job queue started with {self.worker_count} workers")
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # Jobs still waiting will never run
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            self._queue.task_done()
+            self._cancel(job)
+
+    def _cancel(self, job: Job):
+        job.status = 'cancelled'
+        job.error = CANCELLED
+        job.finished_at = datetime.utcnow()
+        job.targets = []
+        self._notify(job)
+
+    def submit(self, kind: str, targets: List[DeliveryTarget], send: SendFunc, skipped: int = 0,
+               spread: float = 0.0) -> Job:
+        """Queue a fan-out and return its job; raises QueueFull when saturated"""
+        targets = list(targets)
+        # Targets we already know we can't reach count as failures up front
+        job = Job(kind=kind, targets=targets, send=send, spread=spread,
+                  total=len(targets) + skipped, failed=skipped)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull(f'Job queue is full ({self._queue.maxsize} pending)')
+        self._remember(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def _remember(self, job: Job):
+        self.jobs[job.id] = job
+        # Evict the oldest finished jobs once history is exceeded; jobs still
+        # queued or running are kept, but don't hold back the ones after them
+        excess = len(self.jobs) - self.history
+        if excess > 0:
+            finished = [job_id for job_id, old in self.jobs.items() if old.done][:excess]
+            for job_id in finished:
+                del self.jobs[job_id]
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        job.status = 'running'
+        job.started_at = datetime.utcnow()
+        self._notify(job)
+        # Sends started below inherit this, so their 429s are counted on the job
+        observer = throttle_observer.set(job)
+        try:
+            async for result in fan_out(job.targets, job.send, max_in_flight=self.max_in_flight,
+                                        spread=job.spread):
+                guild_name = getattr(result.target.guild, 'name', '?')
+                if result.ok:
+                    job.sent += 1
+                    logger.info(f"{job.kind} job {job.id[:8]}: sent to {guild_name}")
+                else:
+                    job.failed += 1
+                    logger.error(f"{job.kind} job {job.id[:8]}: failed in {guild_name}: {result.error}")
+                self._notify(job)
+            job.status = 'completed'
+        except asyncio.CancelledError:
+            job.status = 'cancelled'
+            job.error = CANCELLED
+            logger.warning(f"{job.kind} job {job.id[:8]} cancelled after {job.sent} sends")
+            raise
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+            logger.error(f"{job.kind} job {job.id[:8]} crashed: {e}")
+        finally:
+            throttle_observer.reset(observer)
+            job.finished_at = datetime.utcnow()
+            # Drop references to Discord objects once the job is finished
+            job.targets = []
+            self._notify(job)
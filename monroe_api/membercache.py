@@ -0,0 +1,116 @@
+"""
+Compact member cache for large guilds.
+
+With the members intent, discord.py keeps a full ``Member`` (and ``User``)
+object per member per guild. That costs about a kilobyte each. The API only
+needs three things from it: member counts, which already come from
+``guild.member_count``; whether a user is in a guild, for moderation lookups;
+and the odd ``Member`` to act on.
+
+In ``compact`` mode, discord.py's member cache is switched off and
+``CompactMemberStore`` keeps one sorted ``array('Q')`` of member ids per
+guild, 8 bytes a member. The store is filled from ``guild.chunk(cache=False)``
+(by ``GuildChunker``) and kept current from join/leave events. A full
+``Member`` is materialized only when a handler needs one (see
+``MemberLocator``).
+"""
+
+import logging
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Set
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+MEMBER_CACHE_MODES = ('full', 'compact')
+
+
+def member_cache_options(mode: str) -> dict:
+    """Extra ``commands.Bot`` kwargs for a member cache mode"""
+    if mode not in MEMBER_CACHE_MODES:
+        raise ValueError(f"Unknown member cache mode {mode!r}; expected one of {', '.join(MEMBER_CACHE_MODES)}")
+    if mode == 'compact':
+        # Only the bot's own member stays cached (discord.py always keeps guild.me)
+        return {'member_cache_flags': discord.MemberCacheFlags.none(), 'chunk_guilds_at_startup': False}
+    return {}
+
+
+class CompactMemberStore:
+    """Member ids per guild as sorted 64-bit arrays"""
+
+    def __init__(self):
+        self._members: Dict[int, array] = {}
+        # Guilds whose member list has been fully loaded; for these a miss is authoritative
+        self._complete: Set[int] = set()
+
+    def __len__(self):
+        return sum(len(ids) for ids in self._members.values())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(ids.itemsize * len(ids) for ids in self._members.values())
+
+    # -- membership ----------------------------------------------------------
+
+    def load(self, guild_id: int, user_ids: Iterable[int]):
+        self._members[guild_id] = array('Q', sorted(set(user_ids)))
+        self._complete.add(guild_id)
+
+    def forget(self, guild_id: int):
+        self._members.pop(guild_id, None)
+        self._complete.discard(guild_id)
+
+    def add(self, guild_id: int, user_id: int):
+        ids = self._members.get(guild_id)
+        if ids is None:
+            ids = self._members[guild_id] = array('Q')
+        index = bisect_left(ids, user_id)
+        if index == len(ids) or ids[index] != user_id:
+            ids.insert(index, user_id)
+
+    def discard(self, guild_id: int, user_id: int):
+        ids = self._members.get(guild_id)
+        if ids is None:
+            return
+        index = bisect_left(ids, user_id)
+        if index < len(ids) and ids[index] == user_id:
+            del ids[index]
+
+    def contains(self, guild_id: int, user_id: int) -> bool:
+        ids = self._members.get(guild_id)
+        if not ids:
+            return False
+        index = bisect_left(ids, user_id)
+        return index < len(ids) and ids[index] == user_id
+
+    def is_complete(self, guild_id: int) -> bool:
+        return guild_id in self._complete
+
+    def guild_ids_for(self, user_id: int) -> List[int]:
+        return [guild_id for guild_id in self._members if self.contains(guild_id, user_id)]
+
+    # -- filling -------------------------------------------------------------
+
+    async def fill_guild(self, guild):
+        """Load one guild's member ids over the gateway without caching Member objects"""
+        members = await guild.chunk(cache=False)
+        self.load(guild.id, (member.id for member in members))
+        logger.info(f"Member store loaded {len(members)} members for {guild.name}")
+
+    def attach(self, bot):
+        """Keep the store current from member events (GuildChunker fills it)"""
+
+        async def on_guild_remove(guild):
+            self.forget(guild.id)
+
+        async def on_member_join(member):
+            self.add(member.guild.id, member.id)
+
+        async def on_raw_member_remove(payload):
+            self.discard(payload.guild_id, payload.user.id)
+
+        bot.add_listener(on_guild_remove, 'on_guild_remove')
+        bot.add_listener(on_member_join, 'on_member_join')
+        bot.add_listener(on_raw_member_remove, 'on_raw_member_remove')
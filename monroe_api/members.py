@@ -0,0 +1,199 @@
+"""
+Member lookups for the moderation endpoints.
+
+``fetch_member`` is a rate-limited REST call, but with the members intent the
+member is almost always already cached. ``MemberLocator`` checks the cache
+first, keeps a user id -> guild ids index from join/leave events so it knows
+where to look, and only falls back to REST on a miss. Misses are remembered
+for a while so repeated lookups of a departed user don't hit Discord again.
+
+With a ``CompactMemberStore`` (the ``compact`` member cache mode) there are
+no cached ``Member`` objects. The store answers "is this user in that
+guild", and the ``Member`` is fetched only for users who are.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import discord
+
+from .ratelimit import MODERATION, scheduled
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NEGATIVE_TTL = 300.0
+DEFAULT_NEGATIVE_SIZE = 10_000
+
+
+class MemberLocator:
+    """Cache-first member resolution with a bounded negative cache"""
+
+    def __init__(self, bot, negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 negative_size: int = DEFAULT_NEGATIVE_SIZE, scheduler=None, store=None, chunker=None):
+        self.bot = bot
+        # Optional GuildChunker, told about guilds whose members aren't loaded yet
+        self.chunker = chunker
+        # Optional CompactMemberStore, when discord.py's member cache is off
+        self.store = store
+        # Optional RateLimitScheduler for fetch_member calls
+        self.scheduler = scheduler
+        self.negative_ttl = negative_ttl
+        self.negative_size = negative_size
+        # user id -> guild id, or a set of guild ids for users in several guilds
+        self._guilds_by_user = {}
+        self._misses: "OrderedDict[Tuple[int, int], float]" = OrderedDict()
+        self.rest_lookups = 0
+
+    # -- reverse index -------------------------------------------------------
+
+    def _add(self, user_id: int, guild_id: int):
+        current = self._guilds_by_user.get(user_id)
+        if current is None:
+            self._guilds_by_user[user_id] = guild_id
+        elif isinstance(current, set):
+            current.add(guild_id)
+        elif current != guild_id:
+            self._guilds_by_user[user_id] = {current, guild_id}
+        self._misses.pop((user_id, guild_id), None)
+
+    def _discard(self, user_id: int, guild_id: int):
+        current = self._guilds_by_user.get(user_id)
+        if isinstance(current, set):
+            current.discard(guild_id)
+            if len(current) == 1:
+                self._guilds_by_user[user_id] = next(iter(current))
+        elif current == guild_id:
+            del self._guilds_by_user[user_id]
+
+    def guild_ids_for(self, user_id: int):
+        current = self._guilds_by_user.get(user_id)
+        if current is None:
+            return ()
+        return tuple(current) if isinstance(current, set) else (current,)
+
+    def index_guild(self, guild):
+        for member in guild.members:
+            self._add(member.id, guild.id)
+
+    def forget_guild(self, guild):
+        for member in guild.members:
+            self._discard(member.id, guild.id)
+
+    def rebuild(self, guilds):
+        self._guilds_by_user = {}
+        for guild in guilds:
+            self.index_guild(guild)
+        logger.info(f"Member index built for {len(self._guilds_by_user)} users")
+
+    # -- negative cache ------------------------------------------------------
+
+    def _is_known_miss(self, user_id: int, guild_id: int) -> bool:
+        expires = self._misses.get((user_id, guild_id))
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._misses[(user_id, guild_id)]
+            return False
+        return True
+
+    def _remember_miss(self, user_id: int, guild_id: int):
+        key = (user_id, guild_id)
+        self._misses[key] = time.monotonic() + self.negative_ttl
+        self._misses.move_to_end(key)
+        while len(self._misses) > self.negative_size:
+            self._misses.popitem(last=False)
+
+    # -- lookups -------------------------------------------------------------
+
+    async def get_member(self, guild, user_id: int) -> Optional[discord.Member]:
+        """Resolve a member of one guild, using REST only on a cache miss
+
+        None means the user isn't in the guild. Any other REST failure is
+        raised, so an outage doesn't look like a wrong user id.
+        """
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+        if self.store is not None and not self.store.contains(guild.id, user_id) \
+                and self.store.is_complete(guild.id):
+            return None
+        # A fully chunked guild's cache is authoritative
+        if guild.chunked or self._is_known_miss(user_id, guild.id):
+            return None
+        if self.chunker is not None:
+            # Load this guild's members in the background; REST answers meanwhile
+            self.chunker.needed(guild)
+
+        self.rest_lookups += 1
+        try:
+            member = await scheduled(self.scheduler, lambda: guild.fetch_member(user_id),
+                                     'GET /guilds/{guild_id}/members/{user_id}', guild.id, MODERATION)
+        except discord.NotFound:
+            self._remember_miss(user_id, guild.id)
+            return None
+        except discord.HTTPException as e:
+            logger.warning(f"fetch_member({user_id}) in {guild.name} failed: {e}")
+            raise
+        self._add(user_id, guild.id)
+        return member
+
+    async def locate(self, user_id: int) -> Tuple[Optional[discord.Guild], Optional[discord.Member]]:
+        """Find the first guild the user is a member of
+
+        A REST failure is raised only if no other guild has the user.
+        """
+        error: Optional[discord.HTTPException] = None
+        # Guilds the index says the user is in, straight from the member cache
+        for guild_id in self.guild_ids_for(user_id):
+            guild = self.bot.get_guild(guild_id)
+            member = guild.get_member(user_id) if guild else None
+            if member is not None:
+                return guild, member
+
+        if self.store is not None:
+            for guild_id in self.store.guild_ids_for(user_id):
+                guild = self.bot.get_guild(guild_id)
+                try:
+                    member = await self.get_member(guild, user_id) if guild else None
+                except discord.HTTPException as e:
+                    error, member = error or e, None
+                if member is not None:
+                    return guild, member
+
+        # Not indexed anywhere; only guilds whose cache is incomplete cost a REST call
+        for guild in self.bot.guilds:
+            try:
+                member = await self.get_member(guild, user_id)
+            except discord.HTTPException as e:
+                error, member = error or e, None
+            if member is not None:
+                return guild, member
+        if error is not None:
+            raise error
+        return None, None
+
+    def attach(self, bot):
+        """Register the gateway listeners that keep the reverse index current"""
+
+        async def on_ready():
+            self.rebuild(bot.guilds)
+
+        async def on_member_join(member):
+            self._add(member.id, member.guild.id)
+
+        async def on_raw_member_remove(payload):
+            self._discard(payload.user.id, payload.guild_id)
+
+        async def on_guild_join(guild):
+            self.index_guild(guild)
+
+        async def on_guild_remove(guild):
+            self.forget_guild(guild)
+
+        bot.add_listener(on_ready, 'on_ready')
+        bot.add_listener(on_member_join, 'on_member_join')
+        bot.add_listener(on_raw_member_remove, 'on_raw_member_remove')
+        bot.add_listener(on_guild_join, 'on_guild_join')
+        bot.add_listener(on_guild_remove, 'on_guild_remove')
@@ -0,0 +1,280 @@
+"""
+Prometheus text-format metrics for the dashboard API.
+
+A small in-process registry (counters, gauges, histograms with labels) so
+the bot doesn't need prometheus_client. ``ApiMetrics`` wires it to the
+parts of the API worth watching under load: each aiohttp route, every
+Discord REST call the rate-limit scheduler makes, the job queue and the
+gateway. ``GET /metrics`` renders the lot.
+"""
+
+import bisect
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from aiohttp import web
+
+from .sharding import is_sharded
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple:
+        return tuple(labels.get(name, '') for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+                for key, value in sorted(self._values.items())]
+
+
+class Gauge(Metric):
+    """A gauge that is either set directly or read from a callback at scrape time"""
+    kind = 'gauge'
+
+    def __init__(self, name, help, labels=(), callback: Optional[Callable[[], object]] = None):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple, float] = {}
+        # Returns a number, or {label values tuple: number} for labelled gauges
+        self.callback = callback
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def samples(self):
+        values = self._values
+        if self.callback is not None:
+            result = self.callback()
+            if result is None:
+                return []
+            values = result if isinstance(result, dict) else {(): result}
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(float(value))}'
+                for key, value in sorted(values.items())
+                if value is not None and not math.isnan(float(value))]
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self):
+        lines = []
+        for key, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labels=()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name, help, labels=(), callback=None) -> Gauge:
+        return self.register(Gauge(name, help, labels, callback))
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        return '\n'.join(metric.render() for metric in self.metrics) + '\n'
+
+
+class ApiMetrics:
+    """The dashboard API's metrics and the hooks that feed them"""
+
+    def __init__(self, registry: Optional[Registry] = None):
+        self.registry = registry or Registry()
+        r = self.registry
+        self.http_requests = r.counter(
+            'monroe_http_requests_total', 'Dashboard API requests', ('method', 'route', 'status'))
+        self.http_latency = r.histogram(
+            'monroe_http_request_duration_seconds', 'Dashboard API request latency', ('method', 'route'))
+        self.discord_requests = r.counter(
+            'monroe_discord_requests_total', 'Discord REST calls made by the API', ('route', 'outcome'))
+        self.discord_latency = r.histogram(
+            'monroe_discord_request_duration_seconds', 'Discord REST call latency', ('route',))
+        self.discord_rate_limited = r.counter(
+            'monroe_discord_rate_limited_total', 'Discord 429 responses', ('route', 'scope'))
+        self.jobs = r.counter('monroe_jobs_total', 'Finished send jobs', ('kind', 'status'))
+
+    def attach(self, bot, status_snapshot=None, job_queue=None, scheduler=None, chunker=None):
+        """Register scrape-time gauges and the listeners that feed the counters"""
+        r = self.registry
+
+        def gateway_latency():
+            latency = getattr(bot, 'latency', None)
+            return latency if latency is not None and math.isfinite(latency) else None
+
+        r.gauge('monroe_gateway_latency_seconds', 'Gateway heartbeat latency (bot.latency)',
+                callback=gateway_latency)
+        r.gauge('monroe_bot_ready', 'Whether the bot is connected and ready',
+                callback=lambda: 1 if bot.is_ready() else 0)
+
+        def gateway_startup():
+            startup = getattr(bot, 'gateway_startup', None)
+            return {(startup['path'],): startup['seconds']} if startup else None
+
+        r.gauge('monroe_gateway_startup_seconds', 'Seconds from connect to ready, by path (resume or identify)',
+                ('path',), callback=gateway_startup)
+
+        if is_sharded(bot):
+            def shard_latencies():
+                return {(shard_id,): info.latency for shard_id, info in bot.shards.items()
+                        if math.isfinite(info.latency)}
+
+            r.gauge('monroe_shard_latency_seconds', 'Gateway heartbeat latency per shard', ('shard',),
+                    callback=shard_latencies)
+            r.gauge('monroe_shard_connected', 'Whether each shard is connected', ('shard',),
+                    callback=lambda: {(shard_id,): 0 if info.is_closed() else 1
+                                      for shard_id, info in bot.shards.items()})
+            if status_snapshot is not None:
+                r.gauge('monroe_shard_guilds', 'Guilds per shard', ('shard',),
+                        callback=lambda: {(shard_id,): count
+                                          for shard_id, count in status_snapshot.shard_guild_counts().items()})
+
+        if status_snapshot is not None:
+            r.gauge('monroe_guilds', 'Guilds the bot is in', callback=lambda: status_snapshot.server_count)
+            r.gauge('monroe_members', 'Members across all guilds', callback=lambda: status_snapshot.user_count)
+        else:
+            r.gauge('monroe_guilds', 'Guilds the bot is in', callback=lambda: len(bot.guilds))
+
+        if job_queue is not None:
+            r.gauge('monroe_job_queue_depth', 'Send jobs waiting for a worker', callback=lambda: job_queue.depth)
+            r.gauge('monroe_jobs_running', 'Send jobs being delivered',
+                    callback=lambda: sum(1 for job in job_queue.jobs.values() if job.status == 'running'))
+
+            def on_job(job):
+                if job.done and job.finished_at is not None:
+                    self.jobs.inc(kind=job.kind, status=job.status)
+
+            job_queue.add_listener(on_job)
+
+        if chunker is not None:
+            r.gauge('monroe_member_chunking_guilds', 'Guilds by member list state', ('state',),
+                    callback=lambda: self._chunking_guilds(chunker.progress()))
+            r.gauge('monroe_member_chunking_members_loaded', 'Members in guilds whose member list is loaded',
+                    callback=lambda: chunker.progress()['members_loaded'])
+            r.gauge('monroe_member_chunking_members_expected', 'Members across all guilds (guild.member_count)',
+                    callback=lambda: chunker.progress()['members_expected'])
+
+        if scheduler is not None:
+            r.gauge('monroe_discord_calls_queued', 'Discord calls waiting for the rate-limit scheduler',
+                    callback=lambda: scheduler.queued)
+            r.gauge('monroe_discord_calls_in_flight', 'Discord calls in flight',
+                    callback=lambda: scheduler.in_flight)
+            scheduler.add_listener(self.observe_discord_call)
+
+    @staticmethod
+    def _chunking_guilds(progress):
+        return {
+            ('chunked',): progress['guilds_chunked'],
+            ('loading',): progress['guilds_loading'],
+            ('pending',): progress['guilds_total'] - progress['guilds_chunked'] - progress['guilds_loading'],
+        }
+
+    def observe_discord_call(self, route: str, elapsed: float, outcome: str, is_global: bool = False):
+        self.discord_requests.inc(route=route, outcome=outcome)
+        self.discord_latency.observe(elapsed, route=route)
+        if outcome == 'rate_limited':
+            self.discord_rate_limited.inc(route=route, scope='global' if is_global else 'route')
+
+    @web.middleware
+    async def middleware(self, request, handler):
+        """Count and time every request, labelled by route template rather than path"""
+        resource = request.match_info.route.resource
+        route = resource.canonical if resource is not None else 'unmatched'
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await handler(request)
+            status = response.status
+            return response
+        except web.HTTPException as e:
+            status = e.status
+            raise
+        finally:
+            self.http_requests.inc(method=request.method, route=route, status=status)
+            self.http_latency.observe(time.perf_counter() - started, method=request.method, route=route)
+
+    def response(self) -> web.Response:
+        return web.Response(body=self.registry.render().encode(), headers={'Content-Type': CONTENT_TYPE})
@@ -0,0 +1,176 @@
+"""
+Bulk moderation for ``POST /api/moderation/bulk``.
+
+Bans go through Discord's bulk-ban route (up to 200 users per call). Kicks
+only need the user id, so they skip member lookups entirely. Warnings need a
+DM and therefore a member, resolved through ``MemberLocator``. Per-user calls
+run concurrently under a small limit so discord.py's bucket handling, not our
+loop, decides the pace.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+import discord
+
+from .ratelimit import MODERATION, scheduled
+
+logger = logging.getLogger(__name__)
+
+BULK_ACTIONS = ('warn', 'kick', 'ban')
+# Discord's bulk-ban endpoint accepts at most this many users per request
+BULK_BAN_CHUNK = 200
+MAX_BULK_USERS = 1000
+DEFAULT_CONCURRENCY = 5
+
+
+@dataclass
+class BulkOutcome:
+    user_id: str
+    success: bool
+    message: str
+
+    def to_dict(self):
+        return {'user_id': self.user_id, 'success': self.success, 'message': self.message}
+
+
+def parse_user_ids(raw) -> List[str]:
+    """Accept a list of ids (or a comma/space separated string), de-duplicated in order"""
+    if isinstance(raw, str):
+        raw = raw.replace(',', ' ').split()
+    seen = []
+    for value in raw or []:
+        value = str(value).strip()
+        if value and value not in seen:
+            seen.append(value)
+    return seen
+
+
+async def _bounded(concurrency, user_ids, action):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(user_id):
+        async with semaphore:
+            return await action(user_id)
+
+    return list(await asyncio.gather(*(run(user_id) for user_id in user_ids)))
+
+
+async def _bulk_ban(guild, user_ids, reason, delete_message_seconds, concurrency, scheduler):
+    outcomes = {}
+    ids = [int(user_id) for user_id in user_ids]
+    for start in range(0, len(ids), BULK_BAN_CHUNK):
+        chunk = ids[start:start + BULK_BAN_CHUNK]
+        try:
+            result = await scheduled(scheduler, lambda: guild.bulk_ban(
+                [discord.Object(id=user_id) for user_id in chunk],
+                reason=reason,
+                delete_message_seconds=delete_message_seconds,
+            ), 'POST /guilds/{guild_id}/bulk-ban', guild.id, MODERATION)
+        except discord.Forbidden:
+            # Single bans would fail the same way, one call per user
+            for user_id in chunk:
+                outcomes[str(user_id)] = BulkOutcome(str(user_id), False, 'Insufficient permissions')
+            continue
+        except discord.HTTPException as e:
+            if not isinstance(e, discord.NotFound) and e.status != 405:
+                for user_id in chunk:
+                    outcomes[str(user_id)] = BulkOutcome(str(user_id), False, str(e))
+                continue
+            # The route is unavailable: ban one by one
+            logger.warning(f"Bulk ban unavailable in {guild.name}, falling back to single bans: {e}")
+            await _fallback(outcomes, chunk, guild, reason, delete_message_seconds, concurrency, scheduler)
+            continue
+        except AttributeError as e:
+            # Older discord.py without Guild.bulk_ban
+            logger.warning(f"Bulk ban unavailable in {guild.name}, falling back to single bans: {e}")
+            await _fallback(outcomes, chunk, guild, reason, delete_message_seconds, concurrency, scheduler)
+            continue
+        for user in result.banned:
+            outcomes[str(user.id)] = BulkOutcome(str(user.id), True, 'Banned')
+        for user in result.failed:
+            outcomes[str(user.id)] = BulkOutcome(str(user.id), False, 'Ban failed')
+    return outcomes
+
+
+async def _fallback(outcomes, chunk, guild, reason, delete_message_seconds, concurrency, scheduler):
+    for outcome in await _bounded(concurrency, chunk, lambda user_id: _single_ban(
+            guild, user_id, reason, delete_message_seconds, scheduler)):
+        outcomes[outcome.user_id] = outcome
+
+
+async def _single_ban(guild, user_id, reason, delete_message_seconds, scheduler=None):
+    try:
+        await scheduled(scheduler, lambda: guild.ban(discord.Object(id=int(user_id)), reason=reason,
+                                                     delete_message_seconds=delete_message_seconds),
+                        'PUT /guilds/{guild_id}/bans/{user_id}', guild.id, MODERATION)
+        return BulkOutcome(str(user_id), True, 'Banned')
+    except discord.NotFound:
+        return BulkOutcome(str(user_id), False, 'User not found')
+    except discord.Forbidden:
+        return BulkOutcome(str(user_id), False, 'Insufficient permissions')
+    except discord.HTTPException as e:
+        return BulkOutcome(str(user_id), False, str(e))
+
+
+async def bulk_moderate(guild, action: str, user_ids: List[str], reason: str,
+                        member_locator=None, warn_embed: Optional[discord.Embed] = None,
+                        delete_days: int = 0, concurrency: int = DEFAULT_CONCURRENCY,
+                        scheduler=None) -> List[BulkOutcome]:
+    """Apply one action to many users in a guild; outcomes follow ``user_ids`` order
+
+    With a ``RateLimitScheduler`` every call runs at moderation priority.
+    """
+    valid = [user_id for user_id in user_ids if user_id.isdigit()]
+    outcomes = {
+        user_id: BulkOutcome(user_id, False, 'Invalid user id')
+        for user_id in user_ids if not user_id.isdigit()
+    }
+
+    if action == 'ban':
+        outcomes.update(await _bulk_ban(guild, valid, reason, delete_days * 86400, concurrency, scheduler))
+
+    elif action == 'kick':
+        async def kick(user_id):
+            try:
+                await scheduled(scheduler, lambda: guild.kick(discord.Object(id=int(user_id)), reason=reason),
+                                'DELETE /guilds/{guild_id}/members/{user_id}', guild.id, MODERATION)
+                return BulkOutcome(user_id, True, 'Kicked')
+            except discord.NotFound:
+                return BulkOutcome(user_id, False, 'User not found in guild')
+            except discord.Forbidden:
+                return BulkOutcome(user_id, False, 'Insufficient permissions')
+            except discord.HTTPException as e:
+                return BulkOutcome(user_id, False, str(e))
+
+        for outcome in await _bounded(concurrency, valid, kick):
+            outcomes[outcome.user_id] = outcome
+
+    elif action == 'warn':
+        async def warn(user_id):
+            if member_locator is not None:
+                try:
+                    member = await member_locator.get_member(guild, int(user_id))
+                except (discord.HTTPException, discord.RateLimited) as e:
+                    return BulkOutcome(user_id, False, f'Member lookup failed: {e}')
+            else:
+                member = guild.get_member(int(user_id))
+            if member is None:
+                return BulkOutcome(user_id, False, 'User not found in guild')
+            try:
+                await scheduled(scheduler, lambda: member.send(embed=warn_embed),
+                                'POST /users/@me/channels', None, MODERATION)
+                return BulkOutcome(user_id, True, f'Warning sent to {member.display_name}')
+            except discord.HTTPException:
+                return BulkOutcome(user_id, True, f'Warning issued to {member.display_name} (DM failed)')
+
+        for outcome in await _bounded(concurrency, valid, warn):
+            outcomes[outcome.user_id] = outcome
+
+    else:
+        raise ValueError(f'Invalid action: {action}')
+
+    # Users Discord didn't mention in a bulk response are reported as failures
+    return [outcomes.get(user_id) or BulkOutcome(user_id, False, 'No result') for user_id in user_ids]
@@ -0,0 +1,295 @@
+"""
+Priority-aware scheduling for API-originated Discord calls.
+
+discord.py retries 429s on its own, but it has no notion of what a call is
+for: a 10,000-channel broadcast and a ban issued from the dashboard queue up
+behind each other in the same HTTP client. Every Discord call the API makes
+goes through ``RateLimitScheduler.run`` instead. Calls are admitted in
+priority order (moderation, then QOTD and announcements, then broadcasts),
+paced under Discord's global request limit, and held back per route bucket
+while that bucket is cooling down after a 429.
+
+Give the bot a low ``max_ratelimit_timeout`` and long waits surface here as
+``discord.RateLimited``. The scheduler then retries them, rather than the
+HTTP client sleeping while it holds the request.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Priority classes; lower runs first
+MODERATION = 0
+QOTD = 1
+ANNOUNCEMENT = 1
+BROADCAST = 2
+
+PRIORITY_NAMES = {MODERATION: 'moderation', QOTD: 'qotd', BROADCAST: 'broadcast'}
+PURPOSE_PRIORITIES = {
+    'moderation': MODERATION,
+    'qotd': QOTD,
+    'announcement': ANNOUNCEMENT,
+    'broadcast': BROADCAST,
+}
+
+# Discord's global limit is 50 requests/second per bot
+DEFAULT_GLOBAL_RATE = 50.0
+DEFAULT_MAX_CONCURRENCY = 50
+DEFAULT_MAX_RETRIES = 3
+
+# Whoever should hear about throttling for the current task (e.g. a Job)
+throttle_observer: ContextVar[Optional[Any]] = ContextVar('throttle_observer', default=None)
+
+
+@dataclass
+class PriorityStats:
+    calls: int = 0
+    rate_limited: int = 0
+    waited: float = 0.0
+    max_wait: float = 0.0
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'rate_limited': self.rate_limited,
+            'waited_seconds': round(self.waited, 3),
+            'max_wait_seconds': round(self.max_wait, 3),
+        }
+
+
+class _Bucket:
+    __slots__ = ('blocked_until', 'users')
+
+    def __init__(self):
+        self.blocked_until = 0.0
+        # Calls in run() holding this bucket; an unused bucket past its
+        # cooldown is dropped, so per-guild routes don't pile up
+        self.users = 0
+
+    def idle(self, now: float) -> bool:
+        return self.users == 0 and self.blocked_until <= now
+
+    async def wait(self):
+        delay = self.blocked_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def retry_info(error: Exception) -> Optional[Tuple[float, bool]]:
+    """(retry_after, is_global) for a rate-limit error, or None for anything else"""
+    if isinstance(error, discord.RateLimited):
+        return error.retry_after, False
+    if isinstance(error, discord.HTTPException) and error.status == 429:
+        headers = getattr(error.response, 'headers', None) or {}
+        try:
+            retry_after = float(headers.get('Retry-After', 1.0))
+        except (TypeError, ValueError):
+            retry_after = 1.0
+        is_global = str(headers.get('X-RateLimit-Global', '')).lower() == 'true'
+        return retry_after, is_global
+    return None
+
+
+class RateLimitScheduler:
+    """Priority admission, global pacing and per-bucket cooldowns"""
+
+    def __init__(self, global_rate: Optional[float] = DEFAULT_GLOBAL_RATE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_retries: int = DEFAULT_MAX_RETRIES):
+        # None turns global pacing off (429 cooldowns still apply)
+        self.global_rate = global_rate
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.stats: Dict[int, PriorityStats] = {}
+        self.global_blocks = 0
+
+        self._tokens = float(global_rate or 0)
+        self._refilled = time.monotonic()
+        self._global_until = 0.0
+        self._in_flight = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._buckets: Dict[Tuple[str, Any], _Bucket] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._listeners = []
+
+    @property
+    def queued(self):
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def snapshot(self):
+        """Counters per priority class, for logs and metrics"""
+        return {
+            'in_flight': self._in_flight,
+            'queued': self.queued,
+            'global_blocks': self.global_blocks,
+            'priorities': {
+                PRIORITY_NAMES.get(priority, str(priority)): stats.to_dict()
+                for priority, stats in sorted(self.stats.items())
+            },
+        }
+
+    # -- admission -----------------------------------------------------------
+
+    def _take_token(self, now: float) -> float:
+        """Consume a global token; returns 0 on success or the seconds until one frees up"""
+        if now < self._global_until:
+            return self._global_until - now
+        if not self.global_rate:
+            return 0.0
+        self._tokens = min(self.global_rate, self._tokens + (now - self._refilled) * self.global_rate)
+        self._refilled = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.global_rate
+
+    def _pump(self):
+        self._timer = None
+        while self._waiters and self._in_flight < self.max_concurrency:
+            priority, sequence, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            delay = self._take_token(time.monotonic())
+            if delay:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._pump)
+                return
+            heapq.heappop(self._waiters)
+            self._in_flight += 1
+            future.set_result(None)
+
+    async def _acquire(self, priority: int):
+        if not self._waiters and self._in_flight < self.max_concurrency \
+                and not self._take_token(time.monotonic()):
+            self._in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._timer is None:
+            self._pump()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        self._in_flight -= 1
+        if self._timer is None:
+            self._pump()
+
+    # -- calls ---------------------------------------------------------------
+
+    def add_listener(self, callback):
+        """Call ``callback(route, elapsed, outcome, is_global)`` after every Discord call"""
+        self._listeners.append(callback)
+
+    def _report(self, route: str, elapsed: float, outcome: str, is_global: bool = False):
+        for callback in self._listeners:
+            try:
+                callback(route, elapsed, outcome, is_global)
+            except Exception as e:
+                logger.error(f"Scheduler listener failed: {e}")
+
+    def bucket(self, route: str, major=None) -> _Bucket:
+        key = (route, major)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        return bucket
+
+    def _drop_if_idle(self, route: str, major=None):
+        key = (route, major)
+        bucket = self._buckets.get(key)
+        if bucket is not None and bucket.idle(time.monotonic()):
+            del self._buckets[key]
+
+    def _sweep(self, now: float):
+        """Forget buckets nobody is using whose cooldown has passed"""
+        for key in [key for key, bucket in self._buckets.items() if bucket.idle(now)]:
+            del self._buckets[key]
+
+    def _note_rate_limit(self, route, major, retry_after, is_global, stats):
+        stats.rate_limited += 1
+        now = time.monotonic()
+        self._sweep(now)
+        if is_global:
+            self.global_blocks += 1
+            self._global_until = max(self._global_until, now + retry_after)
+            logger.warning(f"Global rate limit hit, pausing all Discord calls for {retry_after:.2f}s")
+        else:
+            bucket = self.bucket(route, major)
+            bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+            logger.info(f"Rate limited on {route} ({major}), retrying in {retry_after:.2f}s")
+        observer = throttle_observer.get()
+        if observer is not None:
+            observer.note_rate_limited(retry_after)
+
+    async def run(self, call: Callable[[], Awaitable[Any]], route: str, major=None,
+                  priority: int = BROADCAST):
+        """Run ``call()`` once admitted; 429s cool the bucket down and are retried"""
+        stats = self.stats.get(priority)
+        if stats is None:
+            stats = self.stats[priority] = PriorityStats()
+        stats.calls += 1
+        bucket = self.bucket(route, major)
+        bucket.users += 1
+        try:
+            return await self._run(call, route, major, priority, stats, bucket)
+        finally:
+            bucket.users -= 1
+            self._drop_if_idle(route, major)
+
+    async def _run(self, call, route, major, priority, stats, bucket):
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            await bucket.wait()
+            await self._acquire(priority)
+            waited = time.monotonic() - queued_at
+            stats.waited += waited
+            stats.max_wait = max(stats.max_wait, waited)
+            started = time.monotonic()
+            try:
+                result = await call()
+            except (discord.HTTPException, discord.RateLimited) as e:
+                info = retry_info(e)
+                if info is None:
+                    self._report(route, time.monotonic() - started, 'error')
+                    raise
+                self._report(route, time.monotonic() - started, 'rate_limited', info[1])
+                self._note_rate_limit(route, major, info[0], info[1], stats)
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+            except Exception:
+                self._report(route, time.monotonic() - started, 'error')
+                raise
+            else:
+                self._report(route, time.monotonic() - started, 'ok')
+                return result
+            finally:
+                self._release()
+
+
+async def scheduled(scheduler: Optional[RateLimitScheduler], call: Callable[[], Awaitable[Any]],
+                    route: str, major=None, priority: int = BROADCAST):
+    """``scheduler.run`` when there is a scheduler, otherwise just ``call()``"""
+    if scheduler is None:
+        return await call()
+    return await scheduler.run(call, route, major, priority)
@@ -0,0 +1,203 @@
+"""
+Roblox profiles for ``GET /api/roblox/{discordId}``.
+
+The dashboard's Roblox panel asks for a Discord user's linked Roblox account.
+Answering takes one call to the verification service that holds the
+Discord -> Roblox link, then three Roblox calls (user, avatar, group role).
+``RobloxClient`` keeps that off the hot path:
+
+* One shared ``aiohttp`` session with a pooled connector, so each call
+  reuses a kept-alive TLS connection instead of opening its own.
+* Concurrent lookups of the same Discord user share one upstream lookup.
+* Profiles are cached in a size-bounded TTL LRU. "Not linked" answers are
+  cached too, with a shorter TTL, so a user who just verified shows up
+  soon. Upstream errors are never cached.
+
+Both upstreams are URL templates, so tests (or a self-hosted proxy) can
+point them at a local stub server. ``api_base`` is formatted with
+``{service}`` (``users``, ``thumbnails`` or ``groups``), and ``link_url``
+with ``{guild_id}`` and ``{discord_id}``.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import aiohttp
+
+from .ttlcache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_BASE = 'https://{service}.roblox.com'
+# RoVer's Discord -> Roblox lookup; needs an API key (the Authorization header)
+DEFAULT_LINK_URL = 'https://registry.rover.link/api/guilds/{guild_id}/discord-to-roblox/{discord_id}'
+# The Monroe Social Club group
+DEFAULT_GROUP_ID = 35828136
+DEFAULT_TTL = 600.0
+DEFAULT_NEGATIVE_TTL = 120.0
+DEFAULT_CACHE_SIZE = 5000
+DEFAULT_TIMEOUT = 10.0
+# Connections kept open across all upstream hosts
+DEFAULT_POOL_SIZE = 20
+
+
+class RobloxError(Exception):
+    """An upstream call failed (timeout, 5xx, 429, ...); not cached"""
+
+
+@dataclass
+class RobloxProfile:
+    roblox_id: int
+    username: str
+    display_name: str
+    avatar: Optional[str] = None
+    group_role: Optional[str] = None
+    group_rank: Optional[int] = None
+
+    def to_dict(self):
+        # Field names of RobloxProfile in shared/schema.ts
+        return {
+            'robloxId': str(self.roblox_id),
+            'username': self.username,
+            'displayName': self.display_name,
+            'avatar': self.avatar,
+            'groupRole': self.group_role,
+            'groupRank': self.group_rank,
+        }
+
+
+class RobloxClient:
+    """Pooled, coalescing, caching lookups of linked Roblox profiles"""
+
+    def __init__(self, api_base: str = DEFAULT_API_BASE, link_url: str = DEFAULT_LINK_URL,
+                 link_api_key: Optional[str] = None, group_id: Optional[int] = DEFAULT_GROUP_ID,
+                 ttl: float = DEFAULT_TTL, negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 cache_size: int = DEFAULT_CACHE_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                 pool_size: int = DEFAULT_POOL_SIZE):
+        self.api_base = api_base.rstrip('/')
+        self.link_url = link_url
+        # Sent verbatim as the link service's Authorization header
+        self.link_api_key = link_api_key
+        self.group_id = group_id
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.cache = TTLCache(cache_size, ttl)
+        self._inflight: Dict[int, asyncio.Task] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.upstream_lookups = 0
+        self.coalesced = 0
+
+    # -- session -------------------------------------------------------------
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': 'MonroeBot (dashboard API)', 'Accept': 'application/json'},
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get_json(self, url: str, params=None, headers=None) -> Optional[dict]:
+        """GET JSON; None on 404, RobloxError on anything else that isn't a 2xx"""
+        try:
+            async with self._get_session().get(url, params=params, headers=headers) as response:
+                if response.status == 404:
+                    return None
+                if response.status >= 400:
+                    raise RobloxError(f'{url} responded with {response.status}')
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            raise RobloxError(f'{url} failed: {e}') from e
+
+    def _url(self, service: str, path: str) -> str:
+        return self.api_base.format(service=service) + path
+
+    # -- lookups -------------------------------------------------------------
+
+    async def profile(self, discord_id: int, guild_id: Optional[int] = None) -> Optional[RobloxProfile]:
+        """The Discord user's linked Roblox profile, or None if they haven't linked one"""
+        cached = self.cache.get(discord_id)
+        if cached is not MISSING:
+            return cached
+
+        task = self._inflight.get(discord_id)
+        if task is None:
+            task = self._inflight[discord_id] = asyncio.create_task(self._lookup(discord_id, guild_id))
+            task.add_done_callback(lambda _: self._inflight.pop(discord_id, None))
+        else:
+            self.coalesced += 1
+        # Shielded so one caller disconnecting doesn't cancel the others' lookup
+        return await asyncio.shield(task)
+
+    async def _lookup(self, discord_id: int, guild_id: Optional[int]) -> Optional[RobloxProfile]:
+        self.upstream_lookups += 1
+        roblox_id = await self.linked_id(discord_id, guild_id)
+        if roblox_id is None:
+            self.cache.set(discord_id, None, ttl=self.negative_ttl)
+            return None
+
+        user, avatar, role = await asyncio.gather(
+            self._get_json(self._url('users', f'/v1/users/{roblox_id}')),
+            self._avatar(roblox_id),
+            self._group_role(roblox_id),
+        )
+        if user is None:
+            # Linked to an account Roblox no longer has
+            self.cache.set(discord_id, None, ttl=self.negative_ttl)
+            return None
+        profile = RobloxProfile(
+            roblox_id=roblox_id,
+            username=user.get('name', ''),
+            display_name=user.get('displayName') or user.get('name', ''),
+            avatar=avatar,
+            group_role=role.get('name') if role else None,
+            group_rank=role.get('rank') if role else None,
+        )
+        self.cache.set(discord_id, profile)
+        return profile
+
+    async def linked_id(self, discord_id: int, guild_id: Optional[int]) -> Optional[int]:
+        url = self.link_url.format(guild_id=guild_id or 0, discord_id=discord_id)
+        headers = {'Authorization': self.link_api_key} if self.link_api_key else None
+        data = await self._get_json(url, headers=headers)
+        if not data:
+            return None
+        # RoVer says robloxId, Bloxlink robloxID
+        roblox_id = data.get('robloxId') or data.get('robloxID')
+        return int(roblox_id) if roblox_id else None
+
+    async def _avatar(self, roblox_id: int) -> Optional[str]:
+        """Headshot URL; a failure here leaves the profile without one"""
+        try:
+            data = await self._get_json(self._url('thumbnails', '/v1/users/avatar-headshot'), params={
+                'userIds': str(roblox_id), 'size': '150x150', 'format': 'Png'})
+        except RobloxError as e:
+            logger.warning(f"Roblox avatar lookup failed: {e}")
+            return None
+        for entry in (data or {}).get('data', []):
+            if entry.get('state') == 'Completed':
+                return entry.get('imageUrl')
+        return None
+
+    async def _group_role(self, roblox_id: int) -> Optional[dict]:
+        """The user's role in the configured group, if they are in it"""
+        if not self.group_id:
+            return None
+        try:
+            data = await self._get_json(self._url('groups', f'/v1/users/{roblox_id}/groups/roles'))
+        except RobloxError as e:
+            logger.warning(f"Roblox group lookup failed: {e}")
+            return None
+        for entry in (data or {}).get('data', []):
+            if entry.get('group', {}).get('id') == self.group_id:
+                return entry.get('role')
+        return None
@@ -0,0 +1,131 @@
+"""
+Per-guild channel routing index.
+
+Instead of re-running ``discord.utils.get(guild.text_channels, ...)`` and a
+permission scan on every send, the index resolves each (guild, purpose) pair
+to a sendable channel once and keeps that answer current from gateway events.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .delivery import DeliveryTarget
+
+logger = logging.getLogger(__name__)
+
+# Channel names tried in order for each kind of post
+DEFAULT_PREFERENCES = {
+    'broadcast': ['general', 'announcements', 'chat', 'main'],
+    'qotd': ['qotd', 'question-of-the-day', 'daily-question', 'general', 'chat'],
+    'announcement': ['announcements', 'news', 'updates', 'general', 'main'],
+}
+
+# Route for the moderation log: the first channel whose name contains one of
+# these words (it isn't a send purpose, so it never falls back)
+MOD_LOG = 'mod_log'
+MOD_LOG_KEYWORDS = ('log', 'mod')
+
+
+class ChannelIndex:
+    """Maps (guild id, purpose) to the channel a post should go to"""
+
+    def __init__(self, preferences: Optional[Dict[str, List[str]]] = None, fallback: bool = True):
+        self.preferences = dict(preferences or DEFAULT_PREFERENCES)
+        # When no preferred name matches, use the first channel we can post in
+        self.fallback = fallback
+        self._routes: Dict[int, Dict[str, object]] = {}
+
+    def __len__(self):
+        return len(self._routes)
+
+    def resolve(self, guild, purpose: str):
+        """Return the routed channel for a guild, or None"""
+        routes = self._routes.get(guild.id)
+        if routes is None:
+            # Guild we haven't indexed yet (e.g. event raced the request)
+            routes = self.refresh_guild(guild)
+        return routes.get(purpose)
+
+    def targets(self, guilds: Iterable, purpose: str) -> Tuple[List[DeliveryTarget], int]:
+        """Resolve every guild for a purpose; returns (targets, guilds without a channel)"""
+        targets = []
+        missing = 0
+        for guild in guilds:
+            channel = self.resolve(guild, purpose)
+            if channel is not None:
+                targets.append(DeliveryTarget(guild, channel))
+            else:
+                missing += 1
+        return targets, missing
+
+    def rebuild(self, guilds: Iterable):
+        self._routes = {}
+        for guild in guilds:
+            self.refresh_guild(guild)
+        logger.info(f"Channel index built for {len(self._routes)} guilds")
+
+    def refresh_guild(self, guild) -> Dict[str, object]:
+        """Recompute routes for one guild in a single pass over its channels"""
+        me = guild.me
+        by_name = {}
+        first_sendable = None
+        mod_log = None
+        for channel in guild.text_channels:
+            if mod_log is None and any(word in channel.name.lower() for word in MOD_LOG_KEYWORDS):
+                mod_log = channel
+        if me is not None:
+            for channel in guild.text_channels:
+                if not channel.permissions_for(me).send_messages:
+                    continue
+                by_name.setdefault(channel.name, channel)
+                if first_sendable is None:
+                    first_sendable = channel
+
+        routes = {}
+        for purpose, names in self.preferences.items():
+            channel = next((by_name[name] for name in names if name in by_name), None)
+            if channel is None and self.fallback:
+                channel = first_sendable
+            if channel is not None:
+                routes[purpose] = channel
+        if mod_log is not None:
+            routes[MOD_LOG] = mod_log
+        self._routes[guild.id] = routes
+        return routes
+
+    def remove_guild(self, guild):
+        self._routes.pop(guild.id, None)
+
+    def attach(self, bot):
+        """Register the gateway listeners that keep the index current"""
+
+        async def on_ready():
+            self.rebuild(bot.guilds)
+
+        async def on_guild_join(guild):
+            self.refresh_guild(guild)
+
+        async def on_guild_remove(guild):
+            self.remove_guild(guild)
+
+        async def on_guild_channel_change(channel, *args):
+            # Covers create/delete and renames or overwrite edits on update
+            self.refresh_guild(channel.guild)
+
+        async def on_guild_role_change(role, *args):
+            self.refresh_guild(role.guild)
+
+        async def on_member_update(before, after):
+            if bot.user is not None and after.id == bot.user.id:
+                self.refresh_guild(after.guild)
+
+        bot.add_listener(on_ready, 'on_ready')
+        bot.add_listener(on_guild_join, 'on_guild_join')
+        bot.add_listener(on_guild_join, 'on_guild_available')
+        bot.add_listener(on_guild_remove, 'on_guild_remove')
+        bot.add_listener(on_guild_channel_change, 'on_guild_channel_create')
+        bot.add_listener(on_guild_channel_change, 'on_guild_channel_update')
+        bot.add_listener(on_guild_channel_change, 'on_guild_channel_delete')
+        bot.add_listener(on_guild_role_change, 'on_guild_role_update')
+        bot.add_listener(on_guild_role_change, 'on_guild_role_delete')
+        bot.add_listener(on_member_update, 'on_member_update')
@@ -0,0 +1,265 @@
+"""
+Scheduled QOTD and announcement posts.
+
+Posts used to go out only when someone pressed send on the dashboard.
+``PostScheduler`` fires them at set times from inside the bot process.
+
+* Schedules live in a SQLite table, so a restart doesn't lose them.
+* In memory they sit in a heap ordered by next run time. The loop sleeps
+  until the earliest one is due, or until a schedule is added or removed. It
+  never polls the table.
+* A schedule runs once (``run_at``) or repeats every ``every`` seconds.
+  Runs missed while the bot was down are skipped, unless they are less than
+  ``MISFIRE_GRACE`` late. A QOTD from yesterday isn't worth posting.
+* Each run is queued as a normal job whose sends are spread over the
+  schedule's ``stagger`` window. Every guild is posted to, but not in the
+  same second.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .storage import SqliteStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCHEDULES_PATH = 'schedules.db'
+SCHEDULE_PURPOSES = ('qotd', 'announcement')
+# Default window a scheduled fan-out is spread over (seconds)
+DEFAULT_STAGGER = 60.0
+# How late a run may start after a restart before it is skipped
+MISFIRE_GRACE = 15 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    purpose TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    channel_id INTEGER,
+    next_run REAL NOT NULL,
+    every INTEGER,
+    stagger REAL NOT NULL,
+    created_by TEXT,
+    created_at REAL NOT NULL,
+    last_run REAL,
+    last_job_id TEXT
+);
+"""
+
+_COLUMNS = ('id', 'purpose', 'payload', 'channel_id', 'next_run', 'every', 'stagger', 'created_by',
+            'created_at', 'last_run', 'last_job_id')
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp is not None else None
+
+
+@dataclass
+class Schedule:
+    purpose: str
+    # The post's fields: question/category for QOTD, title/content for announcements
+    payload: Dict[str, Optional[str]]
+    next_run: float
+    every: Optional[int] = None
+    stagger: float = DEFAULT_STAGGER
+    channel_id: Optional[int] = None
+    created_by: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    last_run: Optional[float] = None
+    last_job_id: Optional[str] = None
+    id: Optional[int] = None
+    # Why the last run queued nothing; kept in memory only
+    last_error: Optional[str] = None
+
+    def advance(self, now: float) -> bool:
+        """Move next_run past ``now``; False for a one-off schedule that is finished"""
+        if not self.every:
+            return False
+        missed = int((now - self.next_run) // self.every) + 1
+        self.next_run += max(1, missed) * self.every
+        return True
+
+    def to_dict(self):
+        return {
+            'id': str(self.id),
+            'purpose': self.purpose,
+            **self.payload,
+            'channel_id': str(self.channel_id) if self.channel_id is not None else None,
+            'next_run': _iso(self.next_run),
+            'every_seconds': self.every,
+            'stagger_seconds': self.stagger,
+            'created_by': self.created_by,
+            'created_at': _iso(self.created_at),
+            'last_run': _iso(self.last_run),
+            'last_job_id': self.last_job_id,
+            'last_error': self.last_error,
+        }
+
+
+class ScheduleStore(SqliteStore):
+    """The persistent schedule table"""
+
+    SCHEMA = _SCHEMA
+
+    def __init__(self, path: str = DEFAULT_SCHEDULES_PATH):
+        super().__init__(path)
+
+    def load(self) -> List[Schedule]:
+        with self._lock:
+            rows = self._connect().execute(f"SELECT {', '.join(_COLUMNS)} FROM schedules").fetchall()
+        schedules = []
+        for row in rows:
+            values = dict(zip(_COLUMNS, row))
+            values['payload'] = json.loads(values['payload'])
+            schedules.append(Schedule(**values))
+        return schedules
+
+    def save(self, schedule: Schedule):
+        """Insert a new schedule (setting its id) or update an existing one"""
+        values = (schedule.purpose, json.dumps(schedule.payload), schedule.channel_id, schedule.next_run,
+                  schedule.every, schedule.stagger, schedule.created_by, schedule.created_at,
+                  schedule.last_run, schedule.last_job_id)
+        with self._lock:
+            connection = self._connect()
+            if schedule.id is None:
+                cursor = connection.execute(
+                    'INSERT INTO schedules (purpose, payload, channel_id, next_run, every, stagger, created_by, '
+                    'created_at, last_run, last_job_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', values)
+                schedule.id = cursor.lastrowid
+            else:
+                connection.execute(
+                    'UPDATE schedules SET purpose = ?, payload = ?, channel_id = ?, next_run = ?, every = ?, '
+                    'stagger = ?, created_by = ?, created_at = ?, last_run = ?, last_job_id = ? WHERE id = ?',
+                    (*values, schedule.id))
+
+    def delete(self, schedule_id: int):
+        with self._lock:
+            self._connect().execute('DELETE FROM schedules WHERE id = ?', (schedule_id,))
+
+
+# Fires one run and returns the queued job's id (or None if nothing was queued)
+FireFunc = Callable[[Schedule], Awaitable[Optional[str]]]
+
+
+class PostScheduler:
+    """Timer-heap loop that fires schedules at their next run time"""
+
+    def __init__(self, store: ScheduleStore, fire: FireFunc):
+        self.store = store
+        self.fire = fire
+        self.schedules: Dict[int, Schedule] = {}
+        # (next_run, id); entries whose time no longer matches the schedule are stale
+        self._heap: List[Tuple[float, int]] = []
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def upcoming(self) -> List[Schedule]:
+        return sorted(self.schedules.values(), key=lambda schedule: schedule.next_run)
+
+    def _push(self, schedule: Schedule):
+        heapq.heappush(self._heap, (schedule.next_run, schedule.id))
+        self._wake.set()
+
+    async def add(self, schedule: Schedule) -> Schedule:
+        await asyncio.to_thread(self.store.save, schedule)
+        self.schedules[schedule.id] = schedule
+        self._push(schedule)
+        logger.info(f"Scheduled {schedule.purpose} {schedule.id} for {_iso(schedule.next_run)}")
+        return schedule
+
+    async def remove(self, schedule_id: int) -> bool:
+        if self.schedules.pop(schedule_id, None) is None:
+            return False
+        await asyncio.to_thread(self.store.delete, schedule_id)
+        # Its heap entry is dropped as stale when it comes up
+        self._wake.set()
+        return True
+
+    async def start(self):
+        """Load the table and start the loop (idempotent)"""
+        if self._task is not None:
+            return
+        try:
+            schedules = await asyncio.to_thread(self.store.load)
+        except sqlite3.Error as e:
+            logger.error(f"Could not load schedules from {self.store.path}: {e}")
+            schedules = []
+        # The table is the source of truth; schedules added before start are in it too
+        self.schedules = {}
+        self._heap = []
+        now = time.time()
+        for schedule in schedules:
+            if schedule.next_run < now - MISFIRE_GRACE:
+                logger.warning(f"Skipping missed {schedule.purpose} run of schedule {schedule.id}")
+                if not schedule.advance(now):
+                    await asyncio.to_thread(self.store.delete, schedule.id)
+                    continue
+                await asyncio.to_thread(self.store.save, schedule)
+            self.schedules[schedule.id] = schedule
+            heapq.heappush(self._heap, (schedule.next_run, schedule.id))
+        logger.info(f"Post scheduler started with {len(self.schedules)} schedules")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            due = self._pop_due(time.time())
+            if due is None:
+                delay = self._heap[0][0] - time.time() if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._fire(due)
+            except Exception as e:
+                logger.error(f"Schedule {due.id} failed: {e}")
+
+    def _pop_due(self, now: float) -> Optional[Schedule]:
+        while self._heap:
+            run_at, schedule_id = self._heap[0]
+            schedule = self.schedules.get(schedule_id)
+            if schedule is None or schedule.next_run != run_at:
+                heapq.heappop(self._heap)
+                continue
+            if run_at > now:
+                return None
+            heapq.heappop(self._heap)
+            return schedule
+        return None
+
+    async def _fire(self, schedule: Schedule):
+        now = time.time()
+        schedule.last_run = now
+        try:
+            schedule.last_job_id = await self.fire(schedule)
+            schedule.last_error = None if schedule.last_job_id else 'Nothing was queued'
+        except Exception as e:
+            # A failed run must not stop a repeating schedule; it was already
+            # taken off the heap
+            schedule.last_job_id = None
+            schedule.last_error = str(e) or type(e).__name__
+            logger.error(f"Schedule {schedule.id} failed: {e}")
+        try:
+            if schedule.advance(now):
+                self._push(schedule)
+                await asyncio.to_thread(self.store.save, schedule)
+            else:
+                self.schedules.pop(schedule.id, None)
+                await asyncio.to_thread(self.store.delete, schedule.id)
+        except sqlite3.Error as e:
+            logger.error(f"Could not save schedule {schedule.id}: {e}")
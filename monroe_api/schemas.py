@@ -0,0 +1,427 @@
+"""
+Typed request bodies for the dashboard API.
+
+These mirror the zod schemas in ``shared/schema.ts``. The proxy validates
+with those before forwarding, and the bot validates again here because the
+API is reachable without the proxy. Each request is a dataclass with a
+``FIELDS`` spec. ``parse()`` checks a decoded body against the spec and
+returns the dataclass, or raises ``ValidationError`` with zod-style issues
+(``{'path': [...], 'message': ...}``). Unknown keys are dropped, as zod does.
+
+Handlers opt in with ``@validates(Schema)``. The body middleware in
+``MonroeApi`` decodes and validates before the handler runs, then hands it
+the result as ``request['body']``. Query strings are checked the same way,
+by calling ``parse()`` on ``request.query`` in the handler.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .audit import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from .config import CONFIG_PURPOSES
+from .moderation import BULK_ACTIONS, MAX_BULK_USERS, parse_user_ids
+from .schedules import DEFAULT_STAGGER, SCHEDULE_PURPOSES
+from .timeseries import DEFAULT_RANGE, RANGES
+
+# Discord limits, so bad input fails here instead of as a 400 from Discord
+MAX_TITLE = 250
+MAX_DESCRIPTION = 4096
+MAX_FIELD = 1024
+MAX_NAME = 100
+# Scheduled posts: shortest repeat interval and longest stagger window (seconds)
+MIN_SCHEDULE_INTERVAL = 60
+MAX_STAGGER = 3600
+# /config: channel names or ids per purpose, reactions per QOTD
+MAX_CONFIG_CHANNELS = 25
+MAX_REACTIONS = 5
+
+
+class ValidationError(ValueError):
+    """A request body that doesn't match its schema"""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__('; '.join(f"{'.'.join(map(str, e['path'])) or 'body'}: {e['message']}" for e in errors))
+        self.errors = errors
+
+
+class _Invalid(Exception):
+    def __init__(self, message: str, path: Tuple = ()):
+        super().__init__(message)
+        self.message = message
+        self.path = list(path)
+
+
+# -- field types -------------------------------------------------------------
+
+class Text:
+    """A string, stripped, with optional length bounds"""
+
+    def __init__(self, required: bool = True, min: int = 0, max: Optional[int] = None,
+                 message: Optional[str] = None, default: Optional[str] = None):
+        self.required = required
+        self.min = min
+        self.max = max
+        self.message = message
+        self.default = default
+
+    def check(self, value):
+        if not isinstance(value, str):
+            raise _Invalid('Expected string')
+        value = value.strip()
+        if len(value) < self.min:
+            raise _Invalid(self.message or f'String must contain at least {self.min} character(s)')
+        if self.max is not None and len(value) > self.max:
+            raise _Invalid(f'String must contain at most {self.max} character(s)')
+        return value
+
+
+class Choice(Text):
+    """One of a fixed set of strings (case-insensitive, normalised to lower case)"""
+
+    def __init__(self, choices, **kwargs):
+        super().__init__(**kwargs)
+        self.choices = tuple(choices)
+
+    def check(self, value):
+        value = super().check(value).lower()
+        if value not in self.choices:
+            options = ' | '.join(f"'{choice}'" for choice in self.choices)
+            raise _Invalid(f'Invalid enum value. Expected {options}')
+        return value
+
+
+class Snowflake(Text):
+    """A Discord id; numbers are accepted and turned into strings"""
+
+    def check(self, value):
+        if isinstance(value, int) and not isinstance(value, bool):
+            value = str(value)
+        value = super().check(value)
+        if not value.isdigit():
+            raise _Invalid('Invalid Discord id')
+        return value
+
+
+class Integer:
+    def __init__(self, required: bool = True, min: Optional[int] = None, max: Optional[int] = None,
+                 default: Optional[int] = None, coerce: bool = False):
+        self.required = required
+        self.min = min
+        self.max = max
+        self.default = default
+        # Accept digit strings too (query parameters are always strings)
+        self.coerce = coerce
+
+    def check(self, value):
+        if self.coerce and isinstance(value, str) and value.strip().isdigit():
+            value = int(value.strip())
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value != int(value):
+            raise _Invalid('Expected integer')
+        value = int(value)
+        if self.min is not None and value < self.min:
+            raise _Invalid(f'Number must be greater than or equal to {self.min}')
+        if self.max is not None and value > self.max:
+            raise _Invalid(f'Number must be less than or equal to {self.max}')
+        return value
+
+
+class Timestamp(Text):
+    """An ISO 8601 datetime or Unix seconds, as Unix seconds"""
+
+    def check(self, value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        value = super().check(value)
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            raise _Invalid('Invalid datetime')
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+
+
+class Items:
+    """A list whose items all match ``item``"""
+
+    def __init__(self, item, required: bool = True, min: int = 0, max: Optional[int] = None,
+                 message: Optional[str] = None, default=None):
+        self.item = item
+        self.required = required
+        self.min = min
+        self.max = max
+        self.message = message
+        self.default = default
+
+    def check(self, value):
+        if not isinstance(value, list):
+            raise _Invalid('Expected array')
+        if len(value) < self.min:
+            raise _Invalid(self.message or f'Array must contain at least {self.min} element(s)')
+        if self.max is not None and len(value) > self.max:
+            raise _Invalid(f'Array must contain at most {self.max} element(s)')
+        result = []
+        for index, item in enumerate(value):
+            try:
+                result.append(self.item.check(item))
+            except _Invalid as e:
+                raise _Invalid(e.message, (index, *e.path))
+        return result
+
+
+class UserIds(Items):
+    """Snowflakes as a list or a comma/space separated string, de-duplicated"""
+
+    def __init__(self, **kwargs):
+        super().__init__(Snowflake(), **kwargs)
+
+    def check(self, value):
+        if isinstance(value, str):
+            value = parse_user_ids(value)
+        return parse_user_ids(super().check(value))
+
+
+# -- schemas -----------------------------------------------------------------
+
+class Schema:
+    FIELDS: Dict[str, Any] = {}
+
+    @classmethod
+    def parse(cls, data):
+        """Validate a decoded body; returns an instance or raises ValidationError"""
+        if not isinstance(data, dict):
+            raise ValidationError([{'path': [], 'message': 'Expected object'}])
+        values = {}
+        errors = []
+        for name, spec in cls.FIELDS.items():
+            raw = data.get(name)
+            if raw is None or (raw == '' and not spec.required):
+                if spec.required:
+                    errors.append({'path': [name], 'message': 'Required'})
+                else:
+                    values[name] = spec.default
+                continue
+            try:
+                values[name] = spec.check(raw)
+            except _Invalid as e:
+                errors.append({'path': [name, *e.path], 'message': e.message})
+        if not errors:
+            errors = cls.check_fields(values)
+        if errors:
+            raise ValidationError(errors)
+        return cls(**values)
+
+    @classmethod
+    def check_fields(cls, values) -> List[Dict[str, Any]]:
+        """Rules spanning several fields (like zod's ``refine``); returns issues"""
+        return []
+
+
+def validates(schema):
+    """Mark a handler as taking a ``schema`` body (see the module docstring)"""
+    def decorator(handler):
+        handler.schema = schema
+        return handler
+    return decorator
+
+
+_dashboard_user = Text(required=False, max=MAX_NAME)
+
+
+@dataclass
+class BroadcastRequest(Schema):
+    message: str
+    channel_id: Optional[str] = None
+    dashboard_user: Optional[str] = None
+
+    FIELDS = {
+        'message': Text(min=1, max=MAX_DESCRIPTION, message='Message is required'),
+        'channel_id': Snowflake(required=False),
+        'dashboard_user': _dashboard_user,
+    }
+
+
+@dataclass
+class QotdRequest(Schema):
+    question: str
+    channel_id: Optional[str] = None
+    category: Optional[str] = None
+    dashboard_user: Optional[str] = None
+
+    FIELDS = {
+        'question': Text(min=1, max=MAX_DESCRIPTION, message='Question is required'),
+        'channel_id': Snowflake(required=False),
+        'category': Text(required=False, max=MAX_NAME),
+        'dashboard_user': _dashboard_user,
+    }
+
+
+@dataclass
+class AnnouncementRequest(Schema):
+    title: str
+    content: str
+    channel_id: Optional[str] = None
+    dashboard_user: Optional[str] = None
+
+    FIELDS = {
+        'title': Text(min=1, max=MAX_TITLE, message='Title is required'),
+        'content': Text(min=1, max=MAX_DESCRIPTION, message='Content is required'),
+        'channel_id': Snowflake(required=False),
+        'dashboard_user': _dashboard_user,
+    }
+
+
+@dataclass
+class ModerationRequest(Schema):
+    action: str
+    user_id: str
+    reason: str
+    rule_violations: Optional[List[str]] = None
+    delete_days: int = 0
+    guild_id: Optional[str] = None
+    dashboard_user: str = 'Dashboard Admin'
+
+    FIELDS = {
+        'action': Choice(BULK_ACTIONS),
+        'user_id': Snowflake(min=1),
+        'reason': Text(min=1, max=MAX_FIELD, message='Reason is required'),
+        'rule_violations': Items(Text(max=MAX_NAME), required=False),
+        'delete_days': Integer(required=False, min=0, max=7, default=0),
+        'guild_id': Snowflake(required=False),
+        'dashboard_user': Text(required=False, max=MAX_NAME, default='Dashboard Admin'),
+    }
+
+
+@dataclass
+class BulkModerationRequest(Schema):
+    action: str
+    user_ids: List[str]
+    reason: str
+    guild_id: Optional[str] = None
+    delete_days: int = 0
+    dashboard_user: str = 'Dashboard Admin'
+
+    FIELDS = {
+        'action': Choice(BULK_ACTIONS),
+        'user_ids': UserIds(min=1, max=MAX_BULK_USERS, message='At least one user id is required'),
+        'reason': Text(min=1, max=MAX_FIELD, message='Reason is required'),
+        'guild_id': Snowflake(required=False),
+        'delete_days': Integer(required=False, min=0, max=7, default=0),
+        'dashboard_user': Text(required=False, max=MAX_NAME, default='Dashboard Admin'),
+    }
+
+
+@dataclass
+class HistoryQuery(Schema):
+    """Query string of ``GET /api/moderation/history``"""
+    user_id: Optional[str] = None
+    guild_id: Optional[str] = None
+    moderator: Optional[str] = None
+    action: Optional[str] = None
+    since: Optional[float] = None
+    until: Optional[float] = None
+    cursor: Optional[str] = None
+    limit: int = DEFAULT_PAGE_SIZE
+
+    FIELDS = {
+        'user_id': Snowflake(required=False),
+        'guild_id': Snowflake(required=False),
+        'moderator': Text(required=False, max=MAX_NAME),
+        'action': Choice(BULK_ACTIONS, required=False),
+        'since': Timestamp(required=False),
+        'until': Timestamp(required=False),
+        # The id of the last entry on the previous page (its next_cursor)
+        'cursor': Snowflake(required=False),
+        'limit': Integer(required=False, min=1, max=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE, coerce=True),
+    }
+
+
+@dataclass
+class StatsHistoryQuery(Schema):
+    """Query string of ``GET /api/stats/history``"""
+    range: str = DEFAULT_RANGE
+
+    FIELDS = {
+        'range': Choice(RANGES, required=False, default=DEFAULT_RANGE),
+    }
+
+
+@dataclass
+class ScheduleRequest(Schema):
+    """Body of ``POST /api/schedules``"""
+    purpose: str
+    run_at: float
+    every: Optional[int] = None
+    stagger: int = int(DEFAULT_STAGGER)
+    channel_id: Optional[str] = None
+    question: Optional[str] = None
+    category: Optional[str] = None
+    title: Optional[str] = None
+    content: Optional[str] = None
+    dashboard_user: Optional[str] = None
+
+    FIELDS = {
+        'purpose': Choice(SCHEDULE_PURPOSES),
+        'run_at': Timestamp(),
+        # Repeat interval in seconds; omit for a one-off post
+        'every': Integer(required=False, min=MIN_SCHEDULE_INTERVAL),
+        # Seconds the fan-out is spread over
+        'stagger': Integer(required=False, min=0, max=MAX_STAGGER, default=int(DEFAULT_STAGGER)),
+        'channel_id': Snowflake(required=False),
+        'question': Text(required=False, min=1, max=MAX_DESCRIPTION),
+        'category': Text(required=False, max=MAX_NAME),
+        'title': Text(required=False, min=1, max=MAX_TITLE),
+        'content': Text(required=False, min=1, max=MAX_DESCRIPTION),
+        'dashboard_user': _dashboard_user,
+    }
+
+    @classmethod
+    def check_fields(cls, values):
+        if values['purpose'] == 'qotd':
+            required = {'question': 'Question is required'}
+        else:
+            required = {'title': 'Title is required', 'content': 'Content is required'}
+        return [{'path': [name], 'message': message} for name, message in required.items() if not values.get(name)]
+
+
+_channel_names = Items(Text(min=1, max=MAX_NAME), required=False, max=MAX_CONFIG_CHANNELS)
+_channel_ids = Items(Snowflake(min=1), required=False, max=MAX_CONFIG_CHANNELS)
+
+
+@dataclass
+class ConfigUpdate(Schema):
+    """Body of ``POST /api/config``; omitted keys keep their current value"""
+    broadcast_channels: Optional[List[str]] = None
+    qotd_channels: Optional[List[str]] = None
+    announcement_channels: Optional[List[str]] = None
+    broadcast_channel_ids: Optional[List[str]] = None
+    qotd_channel_ids: Optional[List[str]] = None
+    announcement_channel_ids: Optional[List[str]] = None
+    mention_everyone: Optional[List[str]] = None
+    qotd_reactions: Optional[List[str]] = None
+    qotd_message_style: Optional[str] = None
+    announcement_style: Optional[str] = None
+    dashboard_user: Optional[str] = None
+
+    FIELDS = {
+        'broadcast_channels': _channel_names,
+        'qotd_channels': _channel_names,
+        'announcement_channels': _channel_names,
+        'broadcast_channel_ids': _channel_ids,
+        'qotd_channel_ids': _channel_ids,
+        'announcement_channel_ids': _channel_ids,
+        'mention_everyone': Items(Choice(CONFIG_PURPOSES), required=False),
+        'qotd_reactions': Items(Text(min=1, max=MAX_NAME), required=False, max=MAX_REACTIONS),
+        'qotd_message_style': Text(required=False, max=MAX_NAME),
+        'announcement_style': Text(required=False, max=MAX_NAME),
+        'dashboard_user': _dashboard_user,
+    }
+
+    def changes(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS
+                if name != 'dashboard_user' and getattr(self, name) is not None}
@@ -0,0 +1,142 @@
+"""
+Configuration for the dashboard API.
+
+Everything the old entrypoint copies did differently is an option here, so a
+variant is a settings object rather than a fork of the handlers.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .audit import DEFAULT_AUDIT_PATH
+from .config import DEFAULT_CONFIG_PATH
+from .delivery import DEFAULT_MAX_IN_FLIGHT
+from .idempotency import DEFAULT_CACHE_SIZE as IDEMPOTENCY_CACHE_SIZE, DEFAULT_TTL as IDEMPOTENCY_TTL
+from .jobs import DEFAULT_QUEUE_SIZE, DEFAULT_WORKERS
+from .members import DEFAULT_NEGATIVE_TTL
+from .ratelimit import DEFAULT_GLOBAL_RATE, DEFAULT_MAX_CONCURRENCY, DEFAULT_MAX_RETRIES
+from .routing import DEFAULT_PREFERENCES
+from .roblox import DEFAULT_API_BASE, DEFAULT_GROUP_ID, DEFAULT_LINK_URL
+from .roblox import DEFAULT_NEGATIVE_TTL as ROBLOX_NEGATIVE_TTL, DEFAULT_TTL as ROBLOX_TTL
+from .schedules import DEFAULT_SCHEDULES_PATH
+from .status import DEFAULT_GUILD_LIMIT
+from .timeseries import DEFAULT_STATS_PATH
+
+
+@dataclass
+class ApiSettings:
+    secret: str = 'default-secret'
+    host: str = '0.0.0.0'
+    port: int = 8000
+
+    # /api/status: how many guilds to list (None = all, 0 = omit the list)
+    status_guild_limit: Optional[int] = DEFAULT_GUILD_LIMIT
+
+    # Largest request body the API accepts (bytes); bigger ones get a 413
+    max_body_size: int = 64 * 1024
+
+    # Sends. With async_sends off, handlers wait for the whole fan-out and
+    # answer with final counts (the old, slow behaviour).
+    async_sends: bool = True
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    job_workers: int = DEFAULT_WORKERS
+    job_queue_size: int = DEFAULT_QUEUE_SIZE
+    # Channel names tried per purpose, and fixed channel ids that override them
+    channel_preferences: Dict[str, List[str]] = field(
+        default_factory=lambda: {purpose: list(names) for purpose, names in DEFAULT_PREFERENCES.items()})
+    fixed_channels: Dict[str, List[int]] = field(default_factory=dict)
+    # Purposes whose posts ping @everyone
+    mention_everyone: Tuple[str, ...] = ()
+    qotd_reactions: Tuple[str, ...] = ('🤔',)
+    brand_name: str = 'Monroe Social Club'
+
+    # Moderation
+    # Look the user up across every guild when no guild_id is given,
+    # instead of using the first guild
+    moderation_search_all_guilds: bool = False
+    moderation_dm_before_removal: bool = True
+    # Post an embed to the first channel named like *log*/*mod* after each action
+    moderation_log_channel: bool = False
+    # SQLite file every moderation action is recorded in, for
+    # GET /moderation/history (None = no audit log)
+    moderation_audit_path: Optional[str] = DEFAULT_AUDIT_PATH
+    member_negative_ttl: float = DEFAULT_NEGATIVE_TTL
+    # 'full' (discord.py's member cache) or 'compact' (ids only, see
+    # membercache.py); must match what the bot was created with
+    member_cache: str = 'full'
+    # When member lists load: 'startup' (before on_ready), 'background'
+    # (after it) or 'on_demand' (see chunking.py); must match the bot too
+    member_chunking: str = 'startup'
+
+    # SQLite file for the minute/hour/day stats behind GET /stats/history
+    # (None = don't record history)
+    stats_history_path: Optional[str] = DEFAULT_STATS_PATH
+
+    # SQLite file holding scheduled QOTD/announcement posts (None = no
+    # scheduling, /schedules answers 404)
+    schedules_path: Optional[str] = DEFAULT_SCHEDULES_PATH
+
+    # GET /roblox/{discordId}: URL templates for Roblox's APIs ({service})
+    # and the Discord -> Roblox link service ({guild_id}, {discord_id}), the
+    # link service's Authorization header, the group whose role is shown, and
+    # how long profiles and "not linked" answers are cached (seconds)
+    roblox_api_base: str = DEFAULT_API_BASE
+    roblox_link_url: str = DEFAULT_LINK_URL
+    roblox_link_api_key: Optional[str] = None
+    roblox_group_id: Optional[int] = DEFAULT_GROUP_ID
+    roblox_cache_ttl: float = ROBLOX_TTL
+    roblox_negative_ttl: float = ROBLOX_NEGATIVE_TTL
+
+    # JSON file the dashboard's /config changes are saved to (None = keep
+    # them in memory only)
+    config_path: Optional[str] = DEFAULT_CONFIG_PATH
+
+    # Discord call scheduling: global requests/second (None = no pacing),
+    # calls in flight across all priorities, retries after a 429
+    rate_limit_global: Optional[float] = DEFAULT_GLOBAL_RATE
+    rate_limit_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    rate_limit_retries: int = DEFAULT_MAX_RETRIES
+
+    # GET /metrics (Prometheus text format); public skips the bearer check
+    metrics_enabled: bool = True
+    metrics_public: bool = False
+
+    # Responses kept for Idempotency-Key replays on the send and moderation
+    # endpoints: how many, and for how long (seconds)
+    idempotency_cache_size: int = IDEMPOTENCY_CACHE_SIZE
+    idempotency_ttl: float = IDEMPOTENCY_TTL
+
+    @classmethod
+    def from_env(cls, **overrides):
+        """Read the common environment variables; keyword overrides win"""
+        values = {
+            'secret': os.getenv('API_SECRET', 'default-secret'),
+            'port': int(os.getenv('PORT', 8000)),
+        }
+        if os.getenv('MODERATION_AUDIT_DB') is not None:
+            values['moderation_audit_path'] = os.environ['MODERATION_AUDIT_DB'] or None
+        if os.getenv('STATS_HISTORY_DB') is not None:
+            values['stats_history_path'] = os.environ['STATS_HISTORY_DB'] or None
+        if os.getenv('SCHEDULES_DB') is not None:
+            values['schedules_path'] = os.environ['SCHEDULES_DB'] or None
+        if os.getenv('ROBLOX_API_BASE'):
+            values['roblox_api_base'] = os.environ['ROBLOX_API_BASE']
+        if os.getenv('ROBLOX_LINK_URL'):
+            values['roblox_link_url'] = os.environ['ROBLOX_LINK_URL']
+        if os.getenv('ROBLOX_LINK_API_KEY'):
+            values['roblox_link_api_key'] = os.environ['ROBLOX_LINK_API_KEY']
+        if os.getenv('ROBLOX_GROUP_ID'):
+            values['roblox_group_id'] = int(os.environ['ROBLOX_GROUP_ID'])
+        if os.getenv('BOT_CONFIG_PATH') is not None:
+            values['config_path'] = os.environ['BOT_CONFIG_PATH'] or None
+        if os.getenv('MEMBER_CACHE'):
+            values['member_cache'] = os.environ['MEMBER_CACHE']
+        if os.getenv('MEMBER_CHUNKING'):
+            values['member_chunking'] = os.environ['MEMBER_CHUNKING']
+        if os.getenv('METRICS_PUBLIC') is not None:
+            values['metrics_public'] = os.getenv('METRICS_PUBLIC', '0').lower() in ('1', 'true', 'yes')
+        if os.getenv('API_ASYNC_SENDS') is not None:
+            values['async_sends'] = os.getenv('API_ASYNC_SENDS', '1').lower() not in ('0', 'false', 'no')
+        values.update(overrides)
+        return cls(**values)
@@ -0,0 +1,151 @@
+"""
+Opt-in gateway sharding.
+
+Every entrypoint used to build a single-connection ``commands.Bot``. Past
+Discord's per-shard guild limit, one connection won't do. ``create_bot``
+builds a ``commands.AutoShardedBot`` instead when sharding is enabled
+(``BOT_SHARDED=1``, optionally ``SHARD_COUNT`` and ``SHARD_IDS``). The API
+works the same with either: ``/api/status`` adds a ``shards`` list when the
+bot is sharded, and fan-outs are ordered by owning shard.
+
+REST calls don't travel over a shard's gateway connection, so routing a
+send to its shard means ordering, not a different transport. Targets are
+interleaved across shards so no shard's guilds wait behind another's.
+Guilds on a shard that is reconnecting go last, which gives its cache time
+to catch up.
+
+A process only sees the guilds on the shards it runs. When ``SHARD_IDS``
+splits shards across processes, each process's API covers just its own
+guilds.
+"""
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from discord.ext import commands
+
+from .chunking import chunking_options
+from .delivery import DeliveryTarget
+from .gateway import DEFAULT_SESSION_PATH, ResumableBot, SessionStore
+from .membercache import member_cache_options
+
+
+def parse_shard_ids(spec: Optional[str]) -> Optional[List[int]]:
+    """``"0-3"``, ``"0,2,4"`` or a mix of both; empty means every shard"""
+    if not spec or not spec.strip():
+        return None
+    shard_ids = []
+    for part in spec.replace(' ', '').split(','):
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            shard_ids.extend(range(int(start), int(end) + 1))
+        else:
+            shard_ids.append(int(part))
+    return sorted(set(shard_ids))
+
+
+@dataclass
+class ShardSettings:
+    enabled: bool = False
+    # None lets Discord recommend a count
+    shard_count: Optional[int] = None
+    # Shards this process runs (None = all of them); needs shard_count
+    shard_ids: Optional[List[int]] = None
+
+    @classmethod
+    def from_env(cls, **overrides):
+        """Read BOT_SHARDED, SHARD_COUNT and SHARD_IDS; keyword overrides win"""
+        values = {
+            'enabled': os.getenv('BOT_SHARDED', '0').lower() in ('1', 'true', 'yes'),
+            'shard_ids': parse_shard_ids(os.getenv('SHARD_IDS')),
+        }
+        if os.getenv('SHARD_COUNT'):
+            values['shard_count'] = int(os.environ['SHARD_COUNT'])
+        values.update(overrides)
+        return cls(**values)
+
+    def bot_kwargs(self) -> dict:
+        if self.shard_ids is not None and self.shard_count is None:
+            raise ValueError('SHARD_IDS needs SHARD_COUNT')
+        kwargs = {}
+        if self.shard_count is not None:
+            kwargs['shard_count'] = self.shard_count
+        if self.shard_ids is not None:
+            kwargs['shard_ids'] = self.shard_ids
+        return kwargs
+
+
+def create_bot(shards: Optional[ShardSettings] = None, member_cache: Optional[str] = None,
+               member_chunking: Optional[str] = None, gateway_resume: Optional[bool] = None,
+               **kwargs) -> commands.Bot:
+    """``commands.Bot``, or ``commands.AutoShardedBot`` when sharding is on
+
+    ``member_cache`` and ``member_chunking`` default to the MEMBER_CACHE and
+    MEMBER_CHUNKING environment variables (else ``full`` and ``startup``);
+    see ``monroe_api.membercache`` and ``monroe_api.chunking``.
+    ``gateway_resume`` defaults to GATEWAY_RESUME and builds a
+    ``ResumableBot`` (see ``monroe_api.gateway``).
+    """
+    shards = shards or ShardSettings.from_env()
+    kwargs.update(chunking_options(member_chunking or os.getenv('MEMBER_CHUNKING', 'startup')))
+    kwargs.update(member_cache_options(member_cache or os.getenv('MEMBER_CACHE', 'full')))
+    if gateway_resume is None:
+        gateway_resume = os.getenv('GATEWAY_RESUME', '0').lower() in ('1', 'true', 'yes')
+    if gateway_resume:
+        if shards.enabled:
+            raise ValueError('GATEWAY_RESUME is not supported with BOT_SHARDED')
+        store = SessionStore(os.getenv('GATEWAY_SESSION_PATH') or DEFAULT_SESSION_PATH)
+        return ResumableBot(session_store=store, **kwargs)
+    if not shards.enabled:
+        return commands.Bot(**kwargs)
+    return commands.AutoShardedBot(**kwargs, **shards.bot_kwargs())
+
+
+def is_sharded(bot) -> bool:
+    return isinstance(getattr(bot, 'shards', None), dict)
+
+
+def shard_of(guild) -> int:
+    return getattr(guild, 'shard_id', None) or 0
+
+
+def shard_connected(bot, shard_id: int) -> bool:
+    info = bot.shards.get(shard_id) if is_sharded(bot) else None
+    if info is None:
+        return not bot.is_closed()
+    return not info.is_closed()
+
+
+def shard_statuses(bot, guild_counts: Dict[int, int]) -> List[dict]:
+    """One entry per shard this process runs, for ``/api/status``"""
+    statuses = []
+    for shard_id, info in sorted(bot.shards.items()):
+        latency = info.latency
+        statuses.append({
+            "id": shard_id,
+            "connected": not info.is_closed(),
+            "latency": round(latency * 1000) if math.isfinite(latency) else None,
+            "guildCount": guild_counts.get(shard_id, 0),
+        })
+    return statuses
+
+
+def route_by_shard(bot, targets: List[DeliveryTarget]) -> List[DeliveryTarget]:
+    """Interleave targets across shards; shards that are down go last"""
+    if not is_sharded(bot) or len(bot.shards) < 2:
+        return targets
+    by_shard: Dict[int, List[DeliveryTarget]] = {}
+    for target in targets:
+        by_shard.setdefault(shard_of(target.guild), []).append(target)
+
+    up = [group for shard_id, group in sorted(by_shard.items()) if shard_connected(bot, shard_id)]
+    down = [group for shard_id, group in sorted(by_shard.items()) if not shard_connected(bot, shard_id)]
+    ordered = []
+    for groups in (up, down):
+        for index in range(max((len(group) for group in groups), default=0)):
+            ordered.extend(group[index] for group in groups if index < len(group))
+    return ordered
@@ -0,0 +1,193 @@
+"""
+Incrementally maintained ``/api/status`` snapshot.
+
+Guild and member totals are updated from gateway events instead of being
+summed over every guild per request. The JSON body is serialized once per
+change (or once a minute, for the uptime field) and served with an ETag so
+polling dashboards get a ``304`` when nothing moved.
+"""
+
+import logging
+import time
+from datetime import datetime
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from aiohttp import web
+
+from . import codec
+from .sharding import is_sharded, shard_of, shard_statuses
+
+logger = logging.getLogger(__name__)
+
+# How many guilds to list in the payload; None lists all of them
+DEFAULT_GUILD_LIMIT = 5
+
+
+def format_uptime(seconds: float) -> str:
+    return f"{int(seconds // 3600)}h {int((seconds % 3600) // 60)}m"
+
+
+class StatusSnapshot:
+    """Running bot totals plus a cached, pre-serialized status body"""
+
+    def __init__(self, bot, guild_limit: Optional[int] = DEFAULT_GUILD_LIMIT):
+        self.bot = bot
+        self.guild_limit = guild_limit
+        self.version = 0
+        self._guilds: Dict[int, dict] = {}
+        self._guild_shards: Dict[int, int] = {}
+        self._member_total = 0
+        # Distinguishes ETags across restarts, when version starts over
+        self._boot = format(int(time.time()), 'x')
+        self._cache_key = None
+        self._bodies: Dict[str, bytes] = {}
+        self._etag = ''
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Call ``callback(snapshot)`` whenever the totals change"""
+        self._listeners.append(callback)
+
+    def _changed(self):
+        self.version += 1
+        for callback in self._listeners:
+            try:
+                callback(self)
+            except Exception as e:
+                # Raised from inside gateway event handlers otherwise
+                logger.error(f"Status listener failed: {e}")
+
+    @property
+    def server_count(self):
+        return len(self._guilds)
+
+    @property
+    def user_count(self):
+        return self._member_total
+
+    def shard_guild_counts(self) -> Dict[int, int]:
+        return dict(Counter(self._guild_shards.values()))
+
+    def rebuild(self, guilds):
+        self._guilds = {}
+        self._guild_shards = {}
+        self._member_total = 0
+        for guild in guilds:
+            self._store(guild)
+        self._changed()
+
+    def set_guild(self, guild):
+        """Add or refresh one guild's entry and adjust the running total"""
+        self._store(guild)
+        self._changed()
+
+    def _store(self, guild):
+        count = guild.member_count or 0
+        previous = self._guilds.get(guild.id)
+        if previous is not None:
+            self._member_total -= previous['memberCount']
+        self._guilds[guild.id] = {"id": str(guild.id), "name": guild.name, "memberCount": count}
+        self._guild_shards[guild.id] = shard_of(guild)
+        self._member_total += count
+
+    def remove_guild(self, guild):
+        previous = self._guilds.pop(guild.id, None)
+        self._guild_shards.pop(guild.id, None)
+        if previous is not None:
+            self._member_total -= previous['memberCount']
+            self._changed()
+
+    def uptime_seconds(self) -> float:
+        start_time = getattr(self.bot, 'start_time', None)
+        return (datetime.utcnow() - start_time).total_seconds() if start_time else 0
+
+    def payload(self) -> dict:
+        if not self.bot.is_ready():
+            return {
+                "online": False,
+                "serverCount": 0,
+                "userCount": 0,
+                "uptime": "0h 0m",
+                "lastSeen": datetime.utcnow().isoformat()
+            }
+        status = {
+            "online": True,
+            "serverCount": self.server_count,
+            "userCount": self.user_count,
+            "uptime": format_uptime(self.uptime_seconds()),
+            "lastSeen": datetime.utcnow().isoformat()
+        }
+        if is_sharded(self.bot):
+            # Latencies are sampled whenever the body is re-serialized
+            status["shardCount"] = self.bot.shard_count
+            status["shards"] = shard_statuses(self.bot, self.shard_guild_counts())
+        if self.guild_limit != 0:
+            guilds = list(self._guilds.values())
+            status["guilds"] = guilds if self.guild_limit is None else guilds[:self.guild_limit]
+        return status
+
+    def render(self, media_type: str = codec.JSON) -> Tuple[bytes, str]:
+        """Return (body, etag), re-serializing only when something changed"""
+        key = (self.bot.is_ready(), self.version, int(self.uptime_seconds() // 60))
+        if key != self._cache_key:
+            self._bodies = {}
+            self._etag = f'"{self._boot}-{key[1]:x}-{key[2]:x}{"" if key[0] else "-off"}'
+            self._cache_key = key
+        body = self._bodies.get(media_type)
+        if body is None:
+            body = self._bodies[media_type] = codec.encode(self.payload(), media_type)[0]
+        # Each encoding gets its own ETag so caches don't mix them up
+        suffix = '-mp' if media_type == codec.MSGPACK else ''
+        return body, f'{self._etag}{suffix}"'
+
+    def response(self, request) -> web.Response:
+        """Serve the snapshot, honouring If-None-Match and Accept"""
+        media_type = codec.negotiate(request)
+        body, etag = self.render(media_type)
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept'}
+        if_none_match = request.headers.get('If-None-Match', '')
+        if if_none_match and (if_none_match.strip() == '*' or etag in if_none_match):
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type=media_type, headers=headers)
+
+    def attach(self, bot):
+        """Register the gateway listeners that keep the totals current"""
+
+        async def on_ready():
+            self.rebuild(bot.guilds)
+
+        async def on_guild_change(guild, *args):
+            # on_guild_update passes (before, after); the guild object is updated in place
+            self.set_guild(args[-1] if args else guild)
+
+        async def on_guild_remove(guild):
+            self.remove_guild(guild)
+
+        async def on_member_change(member):
+            self.set_guild(member.guild)
+
+        async def on_raw_member_remove(payload):
+            # The raw event fires even when the member wasn't cached
+            guild = bot.get_guild(payload.guild_id)
+            if guild is not None:
+                self.set_guild(guild)
+
+        async def on_connection_change():
+            # Online flag flips without any totals changing
+            self._changed()
+
+        bot.add_listener(on_ready, 'on_ready')
+        bot.add_listener(on_guild_change, 'on_guild_join')
+        bot.add_listener(on_guild_change, 'on_guild_update')
+        bot.add_listener(on_guild_remove, 'on_guild_remove')
+        bot.add_listener(on_member_change, 'on_member_join')
+        bot.add_listener(on_raw_member_remove, 'on_raw_member_remove')
+        bot.add_listener(on_connection_change, 'on_disconnect')
+        bot.add_listener(on_connection_change, 'on_resumed')
+
+        async def on_shard_change(shard_id):
+            self._changed()
+
+        for event in ('on_shard_connect', 'on_shard_ready', 'on_shard_disconnect', 'on_shard_resumed'):
+            bot.add_listener(on_shard_change, event)
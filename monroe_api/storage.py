@@ -0,0 +1,40 @@
+"""
+Shared plumbing for the API's local SQLite files.
+
+sqlite3 calls block, so stores run them in a worker thread
+(``asyncio.to_thread``) over one shared connection, serialised by a lock.
+Databases are opened in WAL mode so reads don't wait behind writes, and
+opened lazily so a store can be closed on shutdown and reused afterwards.
+"""
+
+import sqlite3
+import threading
+from typing import Optional
+
+
+class SqliteStore:
+    """A lazily opened, lock-guarded SQLite connection with a fixed schema"""
+
+    SCHEMA = ''
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """The connection; call with ``self._lock`` held"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            # WAL with NORMAL only risks the last commits on power loss, not corruption
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(self.SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,145 @@
+"""
+Server-Sent Events stream of status deltas and job progress.
+
+Dashboards subscribe once to ``GET /api/stream`` instead of polling
+``/api/status``. Each subscriber keeps only the latest pending event per key,
+so a slow client is sent the newest state rather than a backlog.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from aiohttp import web
+
+from . import codec
+
+logger = logging.getLogger(__name__)
+
+# Comment line sent on idle connections so proxies don't time them out
+DEFAULT_HEARTBEAT = 15.0
+# Uptime only changes by the minute, so that's how often we re-check it
+STATUS_TICK = 60.0
+
+
+class Subscriber:
+    """Pending events for one connected client, coalesced by key"""
+
+    def __init__(self):
+        self.pending: "OrderedDict[str, tuple]" = OrderedDict()
+        self.wakeup = asyncio.Event()
+
+    def offer(self, key: str, event: str, data, merge: bool = False):
+        if merge and key in self.pending:
+            # Fold successive deltas into the one still waiting to be sent
+            data = {**self.pending[key][1], **data}
+        self.pending[key] = (event, data)
+        self.pending.move_to_end(key)
+        self.wakeup.set()
+
+    def drain(self):
+        events = list(self.pending.values())
+        self.pending.clear()
+        self.wakeup.clear()
+        return events
+
+
+class EventHub:
+    """Fans published events out to every open SSE connection"""
+
+    def __init__(self, heartbeat: float = DEFAULT_HEARTBEAT):
+        self.heartbeat = heartbeat
+        self.subscribers = set()
+
+    def publish(self, event: str, data, key: Optional[str] = None, merge: bool = False):
+        for subscriber in self.subscribers:
+            subscriber.offer(key or event, event, data, merge=merge)
+
+    async def stream(self, request, initial=()) -> web.StreamResponse:
+        """Serve one SSE connection until the client goes away"""
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        })
+        await response.prepare(request)
+
+        subscriber = Subscriber()
+        for event, data in initial:
+            subscriber.offer(event, event, data)
+        self.subscribers.add(subscriber)
+        logger.info(f"Stream client connected ({len(self.subscribers)} open)")
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.wakeup.wait(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    await response.write(b': ping\n\n')
+                    continue
+                chunks = [
+                    b'event: %s\ndata: %s\n\n' % (event.encode('utf-8'), codec.dumps(data))
+                    for event, data in subscriber.drain()
+                ]
+                await response.write(b''.join(chunks))
+        except ConnectionResetError:
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+            logger.info(f"Stream client disconnected ({len(self.subscribers)} open)")
+        return response
+
+
+class StatusFeed:
+    """Publishes status deltas and job progress from the bot to an EventHub"""
+
+    def __init__(self, hub: EventHub, snapshot, job_queue=None):
+        self.hub = hub
+        self.snapshot = snapshot
+        self._last = {}
+        self._ticker: Optional[asyncio.Task] = None
+        snapshot.add_listener(self.push_status)
+        if job_queue is not None:
+            job_queue.add_listener(self.push_job)
+
+    def current(self) -> dict:
+        status = self.snapshot.payload()
+        # lastSeen changes on every call; clients stamp it themselves
+        status.pop('lastSeen', None)
+        return status
+
+    def push_status(self, *args):
+        if not self.hub.subscribers:
+            # Nobody listening; skip building the payload on every member join
+            return
+        status = self.current()
+        delta = {key: value for key, value in status.items() if self._last.get(key) != value}
+        self._last = status
+        if delta:
+            self.hub.publish('status', delta, merge=True)
+
+    def push_job(self, job):
+        if self.hub.subscribers:
+            self.hub.publish('job', job.to_dict(), key=f'job:{job.id}')
+
+    def start(self):
+        if self._ticker is None:
+            self._ticker = asyncio.create_task(self._tick())
+
+    async def stop(self):
+        if self._ticker is not None:
+            self._ticker.cancel()
+            await asyncio.gather(self._ticker, return_exceptions=True)
+            self._ticker = None
+
+    async def _tick(self):
+        while True:
+            await asyncio.sleep(STATUS_TICK)
+            self.push_status()
+
+    async def handle_stream(self, request):
+        status = self.current()
+        if not self.hub.subscribers:
+            # Deltas weren't tracked while nobody was connected
+            self._last = status
+        return await self.hub.stream(request, initial=[('status', status)])
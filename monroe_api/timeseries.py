@@ -0,0 +1,233 @@
+"""
+Stats history for the dashboard charts.
+
+``/api/status`` is a snapshot; a trend used to mean the Node side storing
+every poll. ``StatsHistory`` keeps the history on the bot instead. Member
+joins and leaves and guild messages are counted in memory as they happen,
+latency is sampled every few seconds, and once a minute the totals are
+written to a local SQLite file together with the member and guild counts.
+
+Each minute is folded into its hour and day buckets in the same
+transaction, so the rollups are always current and a chart never
+aggregates raw rows. Each resolution keeps its own retention window:
+
+* ``minute``: 2 days
+* ``hour``: 90 days
+* ``day``: 3 years
+
+``GET /api/stats/history?range=...`` picks the finest resolution that keeps
+a chart to a few hundred points and reads those buckets straight off the
+primary key.
+"""
+
+import asyncio
+import logging
+import math
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from .storage import SqliteStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATS_PATH = 'stats-history.db'
+# How often latency is sampled; counts are flushed once a minute
+SAMPLE_INTERVAL = 15
+
+MINUTE, HOUR, DAY = 60, 3600, 86400
+RESOLUTIONS = {'minute': MINUTE, 'hour': HOUR, 'day': DAY}
+RETENTION = {MINUTE: 2 * DAY, HOUR: 90 * DAY, DAY: 3 * 365 * DAY}
+# range name -> (span in seconds, resolution)
+RANGES: Dict[str, Tuple[int, int]] = {
+    '1h': (HOUR, MINUTE),
+    '6h': (6 * HOUR, MINUTE),
+    '24h': (DAY, HOUR),
+    '7d': (7 * DAY, HOUR),
+    '30d': (30 * DAY, HOUR),
+    '90d': (90 * DAY, DAY),
+    '1y': (365 * DAY, DAY),
+}
+DEFAULT_RANGE = '24h'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats_buckets (
+    resolution INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    members INTEGER,
+    guilds INTEGER,
+    joins INTEGER NOT NULL DEFAULT 0,
+    leaves INTEGER NOT NULL DEFAULT 0,
+    messages INTEGER NOT NULL DEFAULT 0,
+    latency_sum REAL NOT NULL DEFAULT 0,
+    latency_samples INTEGER NOT NULL DEFAULT 0,
+    latency_max REAL,
+    PRIMARY KEY (resolution, start)
+) WITHOUT ROWID;
+"""
+
+# Counts add up; member/guild counts are the latest known value (NULL, written
+# before the bot is ready, keeps the old one); latency keeps a sum and sample
+# count so the average stays exact across rollups
+_UPSERT = """
+INSERT INTO stats_buckets (resolution, start, members, guilds, joins, leaves, messages,
+                           latency_sum, latency_samples, latency_max)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (resolution, start) DO UPDATE SET
+    members = coalesce(excluded.members, members),
+    guilds = coalesce(excluded.guilds, guilds),
+    joins = joins + excluded.joins,
+    leaves = leaves + excluded.leaves,
+    messages = messages + excluded.messages,
+    latency_sum = latency_sum + excluded.latency_sum,
+    latency_samples = latency_samples + excluded.latency_samples,
+    latency_max = max(coalesce(latency_max, excluded.latency_max), coalesce(excluded.latency_max, latency_max))
+"""
+
+
+@dataclass
+class Bucket:
+    start: int
+    members: Optional[int] = None
+    guilds: Optional[int] = None
+    joins: int = 0
+    leaves: int = 0
+    messages: int = 0
+    latency_sum: float = 0.0
+    latency_samples: int = 0
+    latency_max: Optional[float] = None
+
+    def sample_latency(self, latency: float):
+        self.latency_sum += latency
+        self.latency_samples += 1
+        self.latency_max = latency if self.latency_max is None else max(self.latency_max, latency)
+
+    def to_dict(self):
+        average = self.latency_sum / self.latency_samples if self.latency_samples else None
+        return {
+            'time': datetime.fromtimestamp(self.start, timezone.utc).isoformat(),
+            'members': self.members,
+            'guilds': self.guilds,
+            'joins': self.joins,
+            'leaves': self.leaves,
+            'messages': self.messages,
+            'latency_ms': round(average * 1000) if average is not None else None,
+            'latency_max_ms': round(self.latency_max * 1000) if self.latency_max is not None else None,
+        }
+
+
+class StatsHistory(SqliteStore):
+    """Samples bot activity and stores it as minute/hour/day buckets"""
+
+    SCHEMA = _SCHEMA
+
+    def __init__(self, bot, snapshot, path: str = DEFAULT_STATS_PATH):
+        super().__init__(path)
+        self.bot = bot
+        # StatusSnapshot keeps running member/guild totals
+        self.snapshot = snapshot
+        self._current = Bucket(self._minute(time.time()))
+        self._ticker: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _minute(now: float) -> int:
+        return int(now) // MINUTE * MINUTE
+
+    # -- sampling ------------------------------------------------------------
+
+    def sample(self, now: Optional[float] = None) -> Optional[Bucket]:
+        """Sample latency; returns the previous minute's bucket once a minute has passed"""
+        now = time.time() if now is None else now
+        finished = None
+        minute = self._minute(now)
+        if minute != self._current.start:
+            finished = self._close()
+            self._current = Bucket(minute)
+        latency = self.bot.latency
+        if latency is not None and math.isfinite(latency):
+            self._current.sample_latency(latency)
+        return finished
+
+    def _close(self) -> Bucket:
+        bucket = self._current
+        # Before ready the snapshot is empty; zeros would chart as a drop on every restart
+        if self.bot.is_ready() and self.snapshot.version:
+            bucket.members = self.snapshot.user_count
+            bucket.guilds = self.snapshot.server_count
+        return bucket
+
+    def write(self, bucket: Bucket):
+        """Add a finished minute to its minute, hour and day buckets and apply retention"""
+        rows = [(resolution, bucket.start // resolution * resolution, bucket.members, bucket.guilds,
+                 bucket.joins, bucket.leaves, bucket.messages, bucket.latency_sum, bucket.latency_samples,
+                 bucket.latency_max)
+                for resolution in RESOLUTIONS.values()]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute('BEGIN')
+                connection.executemany(_UPSERT, rows)
+                for resolution, keep in RETENTION.items():
+                    connection.execute('DELETE FROM stats_buckets WHERE resolution = ? AND start < ?',
+                                       (resolution, bucket.start - keep))
+
+    async def _flush(self, bucket: Bucket):
+        try:
+            await asyncio.to_thread(self.write, bucket)
+        except sqlite3.Error as e:
+            logger.error(f"Could not write stats for {bucket.start}: {e}")
+
+    def start(self):
+        if self._ticker is None:
+            self._ticker = asyncio.create_task(self._tick())
+
+    async def _tick(self):
+        while True:
+            await asyncio.sleep(SAMPLE_INTERVAL)
+            finished = self.sample()
+            if finished is not None:
+                await self._flush(finished)
+
+    async def stop(self):
+        """Stop sampling and write the partial current minute"""
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+        await self._flush(self._close())
+        self._current = Bucket(self._minute(time.time()))
+
+    # -- reading -------------------------------------------------------------
+
+    def history(self, range_name: str = DEFAULT_RANGE, now: Optional[float] = None) -> Tuple[int, List[Bucket]]:
+        """Buckets covering a named range, oldest first; returns (resolution, buckets)"""
+        span, resolution = RANGES[range_name]
+        now = time.time() if now is None else now
+        since = int(now) - span
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT start, members, guilds, joins, leaves, messages, latency_sum, latency_samples, latency_max '
+                'FROM stats_buckets WHERE resolution = ? AND start >= ? ORDER BY start',
+                (resolution, since // resolution * resolution)).fetchall()
+        return resolution, [Bucket(*row) for row in rows]
+
+    async def query(self, range_name: str = DEFAULT_RANGE) -> Tuple[int, List[Bucket]]:
+        return await asyncio.to_thread(self.history, range_name)
+
+    def attach(self, bot):
+        """Count member joins/leaves and guild messages into the current minute"""
+
+        async def on_member_join(member):
+            self._current.joins += 1
+
+        async def on_raw_member_remove(payload):
+            self._current.leaves += 1
+
+        async def on_message(message):
+            if message.guild is not None:
+                self._current.messages += 1
+
+        bot.add_listener(on_member_join, 'on_member_join')
+        bot.add_listener(on_raw_member_remove, 'on_raw_member_remove')
+        bot.add_listener(on_message, 'on_message')
@@ -0,0 +1,54 @@
+"""
+A size-bounded LRU whose entries also expire.
+
+Used where the API caches answers from somewhere slow or rate limited. It
+stores ``None`` like any other value, so a "not found" can be cached too,
+usually with a shorter TTL than a hit.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+# Returned by ``get`` for a missing or expired key (``None`` is a valid value)
+MISSING = object()
+
+
+class TTLCache:
+    """LRU of at most ``max_size`` entries, each valid for its own TTL"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
@@ -1,4 +1,4 @@
-import type { Express } from "express";
+import type { Express, Request } from "express";
 import { createServer, type Server } from "http";
 import { storage } from "./storage";
 import { 
@@ -6,6 +6,7 @@ import {
   createUserSchema, 
   broadcastSchema, 
   moderationSchema,
+  bulkModerationSchema,
   qotdSchema,
   announcementSchema,
   type User 
@@ -43,6 +44,17 @@ const activityLog: Array<{
   }
 ];
 
+// Last bot status body and its ETag, so polls can be answered with a 304 by the bot
+let cachedBotStatus: { etag: string; body: any } | null = null;
+
+// Passes the browser's Idempotency-Key on to the bot, so a retried send or
+// moderation action is answered from the first attempt instead of repeated.
+// The forms set one per submission (see useIdempotencyKey)
+function idempotencyHeaders(req: Request): Record<string, string> {
+  const key = req.get('Idempotency-Key');
+  return key ? { 'Idempotency-Key': key } : {};
+}
+
 function addActivity(type: 'success' | 'warning' | 'error' | 'info', message: string, user?: string) {
   activityLog.unshift({
     id: Date.now().toString(),
@@ -231,12 +243,19 @@ export async function registerRoutes(app: Express): Promise<Server> {
       const apiSecret = process.env.API_SECRET || process.env.BOT_API_SECRET || "default-secret";
       const botApiUrl = process.env.BOT_API_URL || "https://monroe-bot.onrender.com";
 
-      const response = await fetch(`${botApiUrl}/api/status`, {
-        headers: {
-          'Authorization': `Bearer ${apiSecret}`,
-          'Content-Type': 'application/json',
-        },
-      });
+      const headers: Record<string, string> = {
+        'Authorization': `Bearer ${apiSecret}`,
+        'Content-Type': 'application/json',
+      };
+      if (cachedBotStatus) {
+        headers['If-None-Match'] = cachedBotStatus.etag;
+      }
+
+      const response = await fetch(`${botApiUrl}/api/status`, { headers });
+
+      if (response.status === 304 && cachedBotStatus) {
+        return res.json(cachedBotStatus.body);
+      }
 
       if (!response.ok) {
         // Try fallback to health endpoint
@@ -259,6 +278,8 @@ export async function registerRoutes(app: Express): Promise<Server> {
       }
 
       const botStatus = await response.json();
+      const etag = response.headers.get('etag');
+      cachedBotStatus = etag ? { etag, body: botStatus } : null;
       addActivity('success', `Bot status updated - ${botStatus.online ? 'Online' : 'Offline'}`, req.session.user?.username);
       res.json(botStatus);
     } catch (error) {
@@ -276,6 +297,50 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
+  // Live bot status stream (Server-Sent Events) relayed from the bot API
+  app.get("/api/bot/stream", requireAuth, async (req, res) => {
+    const apiSecret = process.env.API_SECRET || process.env.BOT_API_SECRET || "default-secret";
+    const botApiUrl = process.env.BOT_API_URL || "https://monroe-bot.onrender.com";
+    const controller = new AbortController();
+    req.on('close', () => controller.abort());
+
+    try {
+      const response = await fetch(`${botApiUrl}/api/stream`, {
+        headers: {
+          'Authorization': `Bearer ${apiSecret}`,
+          'Accept': 'text/event-stream',
+        },
+        signal: controller.signal,
+      });
+
+      if (!response.ok || !response.body) {
+        throw new Error(`Bot API responded with status ${response.status}`);
+      }
+
+      res.writeHead(200, {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'Connection': 'keep-alive',
+        'X-Accel-Buffering': 'no',
+      });
+
+      for await (const chunk of response.body as unknown as AsyncIterable<Uint8Array>) {
+        res.write(chunk);
+      }
+      res.end();
+    } catch (error) {
+      if (controller.signal.aborted) {
+        return;
+      }
+      console.error("Bot stream error:", error instanceof Error ? error.message : String(error));
+      if (!res.headersSent) {
+        res.status(502).json({ message: "Bot status stream unavailable" });
+      } else {
+        res.end();
+      }
+    }
+  });
+
   // Bot commands and management routes
   app.get("/api/bot/commands", requireAuth, async (req, res) => {
     try {
@@ -313,6 +378,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         headers: {
           'Authorization': `Bearer ${apiSecret}`,
           'Content-Type': 'application/json',
+          ...idempotencyHeaders(req),
         },
         body: JSON.stringify({
           message: message,
@@ -365,6 +431,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         headers: {
           'Authorization': `Bearer ${apiSecret}`,
           'Content-Type': 'application/json',
+          ...idempotencyHeaders(req),
         },
         body: JSON.stringify({
           ...moderationData,
@@ -401,6 +468,54 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
+  // Bulk moderation route
+  app.post("/api/bot/moderation/bulk", requireAuth, requireAdmin, async (req, res) => {
+    try {
+      const bulkData = bulkModerationSchema.parse(req.body);
+      const apiSecret = process.env.API_SECRET || process.env.BOT_API_SECRET || "default-secret";
+      const botApiUrl = process.env.BOT_API_URL || "https://monroe-bot.onrender.com";
+
+      console.log(`Sending bulk ${bulkData.action} for ${bulkData.user_ids.length} users to bot`);
+
+      const response = await fetch(`${botApiUrl}/api/moderation/bulk`, {
+        method: 'POST',
+        headers: {
+          'Authorization': `Bearer ${apiSecret}`,
+          'Content-Type': 'application/json',
+          ...idempotencyHeaders(req),
+        },
+        body: JSON.stringify({
+          ...bulkData,
+          dashboard_user: req.session.user?.username || 'Dashboard Admin'
+        }),
+      });
+
+      if (!response.ok) {
+        throw new Error(`Bot API responded with status ${response.status}`);
+      }
+
+      const result = await response.json();
+      addActivity('success', `Bulk ${bulkData.action}: ${result.succeeded}/${result.requested} users`, req.session.user?.username);
+
+      res.json({
+        success: true,
+        message: `${bulkData.action} applied to ${result.succeeded} of ${result.requested} users`,
+        data: {
+          action: bulkData.action,
+          executed_by: req.session.user?.username || 'Dashboard Admin',
+          timestamp: new Date().toISOString(),
+          bot_response: result
+        }
+      });
+    } catch (error) {
+      if (error instanceof ZodError) {
+        return res.status(400).json({ message: "Invalid input", errors: error.errors });
+      }
+      console.error("Bulk moderation error:", error);
+      res.status(500).json({ message: "Failed to execute bulk moderation: " + (error instanceof Error ? error.message : String(error)) });
+    }
+  });
+
   // QOTD route
   app.post("/api/bot/qotd", requireAuth, requireAdmin, async (req, res) => {
     try {
@@ -415,6 +530,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         headers: {
           'Authorization': `Bearer ${apiSecret}`,
           'Content-Type': 'application/json',
+          ...idempotencyHeaders(req),
         },
         body: JSON.stringify({
           question: qotdData.question,
@@ -464,6 +580,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         headers: {
           'Authorization': `Bearer ${apiSecret}`,
           'Content-Type': 'application/json',
+          ...idempotencyHeaders(req),
         },
         body: JSON.stringify({
           title: announcementData.title,
@@ -501,6 +618,35 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
+  // Job progress route for queued broadcasts, QOTDs and announcements
+  app.get("/api/bot/jobs/:id", requireAuth, async (req, res) => {
+    try {
+      const { id } = req.params;
+      const apiSecret = process.env.API_SECRET || process.env.BOT_API_SECRET || "default-secret";
+      const botApiUrl = process.env.BOT_API_URL || "https://monroe-bot.onrender.com";
+
+      const response = await fetch(`${botApiUrl}/api/jobs/${encodeURIComponent(id)}`, {
+        headers: {
+          'Authorization': `Bearer ${apiSecret}`,
+          'Content-Type': 'application/json',
+        },
+      });
+
+      if (response.status === 404) {
+        return res.status(404).json({ message: "Job not found" });
+      }
+      if (!response.ok) {
+        throw new Error(`Bot API responded with status ${response.status}`);
+      }
+
+      const job = await response.json();
+      res.json(job);
+    } catch (error) {
+      console.error("Job status error:", error);
+      res.status(502).json({ message: "Failed to fetch job status: " + (error instanceof Error ? error.message : String(error)) });
+    }
+  });
+
   // Application stats route
   app.get("/api/bot/applications", requireAuth, requireAdmin, async (req, res) => {
     try {
@@ -40,6 +40,14 @@ export const moderationSchema = z.object({
   delete_days: z.number().min(0).max(7).optional(),
 });
 
+export const bulkModerationSchema = z.object({
+  action: z.enum(["warn", "kick", "ban"]),
+  user_ids: z.array(z.string()).min(1, "At least one user is required").max(1000),
+  reason: z.string().min(1, "Reason is required"),
+  guild_id: z.string().optional(),
+  delete_days: z.number().min(0).max(7).optional(),
+});
+
 export const qotdSchema = z.object({
   question: z.string().min(1, "Question is required"),
   channel_id: z.string().optional(),
@@ -57,6 +65,7 @@ export type LoginRequest = z.infer<typeof loginSchema>;
 export type CreateUserRequest = z.infer<typeof createUserSchema>;
 export type BroadcastRequest = z.infer<typeof broadcastSchema>;
 export type ModerationRequest = z.infer<typeof moderationSchema>;
+export type BulkModerationRequest = z.infer<typeof bulkModerationSchema>;
 export type QOTDRequest = z.infer<typeof qotdSchema>;
 export type AnnouncementRequest = z.infer<typeof announcementSchema>;
 
@@ -0,0 +1,50 @@
+import os
+import sys
+from contextlib import asynccontextmanager
+
+import pytest
+
+# The bot imports monroe_api from the repository root; do the same here
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestClient, TestServer  # noqa: E402
+
+from benchmarks.fake_discord import FakeDiscordConfig, build_bot  # noqa: E402
+from monroe_api import ApiSettings, MonroeApi  # noqa: E402
+
+SECRET = 'test-secret'
+AUTH = {'Authorization': f'Bearer {SECRET}'}
+
+
+@pytest.fixture
+def make_api(tmp_path):
+    """Build a ``MonroeApi`` on a fake bot, with every file it writes under ``tmp_path``"""
+
+    def make(guilds=2, members_per_guild=3, **settings):
+        bot = build_bot(guilds, members_per_guild=members_per_guild,
+                        config=FakeDiscordConfig(latency=0, jitter=0))
+        values = {
+            'secret': SECRET,
+            'moderation_audit_path': str(tmp_path / 'audit.db'),
+            'stats_history_path': str(tmp_path / 'stats.db'),
+            'schedules_path': str(tmp_path / 'schedules.db'),
+            'config_path': str(tmp_path / 'config.json'),
+            **settings,
+        }
+        return bot, MonroeApi(bot, ApiSettings(**values))
+
+    return make
+
+
+@asynccontextmanager
+async def serve(api):
+    """A test client for the API mounted at /api, as the entrypoints do"""
+    root = web.Application()
+    root.add_subapp('/api', api.create_app())
+    client = TestClient(TestServer(root))
+    await client.start_server()
+    try:
+        yield client
+    finally:
+        await client.close()
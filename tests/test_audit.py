@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from conftest import AUTH, serve
+from monroe_api.audit import MAX_PAGE_SIZE, AuditEntry, AuditStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AuditStore(str(tmp_path / 'audit.db'))
+    # ids 1..10; even ids are bans in guild 1 by alice, odd ids kicks in guild 2 by bob
+    store.write([AuditEntry('ban' if i % 2 == 0 else 'kick', user_id=100 + i, guild_id=1 if i % 2 == 0 else 2,
+                            moderator='alice' if i % 2 == 0 else 'bob', created_at=1000.0 + i)
+                 for i in range(1, 11)])
+    return store
+
+
+def pages(store, **filters):
+    """Follow next_cursor to the end; returns the ids on each page"""
+    result, cursor = [], None
+    while True:
+        entries, cursor = store.history(cursor=cursor, **filters)
+        result.append([entry.id for entry in entries])
+        if cursor is None:
+            return result
+
+
+def test_pages_are_newest_first_and_disjoint(store):
+    assert pages(store, limit=4) == [[10, 9, 8, 7], [6, 5, 4, 3], [2, 1]]
+
+
+def test_last_page_has_no_cursor(store):
+    entries, cursor = store.history(limit=10)
+    assert len(entries) == 10
+    assert cursor is None
+    entries, cursor = store.history(limit=5)
+    assert cursor == 6
+    entries, cursor = store.history(cursor=cursor, limit=5)
+    assert [entry.id for entry in entries] == [5, 4, 3, 2, 1]
+    assert cursor is None
+    assert store.history(cursor=1) == ([], None)
+
+
+def test_filters_combine_with_cursor(store):
+    assert pages(store, guild_id=1, limit=2) == [[10, 8], [6, 4], [2]]
+    assert pages(store, moderator='bob', action='kick', limit=3) == [[9, 7, 5], [3, 1]]
+    assert pages(store, user_id=104, limit=1) == [[4]]
+    # since/until bound created_at; the cursor still pages by id inside the window
+    assert pages(store, since=1003.0, until=1009.0, limit=2) == [[8, 7], [6, 5], [4, 3]]
+    entries, cursor = store.history(guild_id=2, cursor=8, limit=2)
+    assert [entry.id for entry in entries] == [7, 5]
+    assert cursor == 5
+
+
+def test_new_actions_do_not_shift_later_pages(store):
+    first, cursor = store.history(limit=4)
+    store.write([AuditEntry('warn', user_id=999)])
+    second, _ = store.history(cursor=cursor, limit=4)
+    assert [entry.id for entry in second] == [6, 5, 4, 3]
+
+
+def test_limit_is_clamped(store):
+    assert len(store.history(limit=0)[0]) == 1
+    store.write([AuditEntry('warn', user_id=i) for i in range(MAX_PAGE_SIZE)])
+    entries, cursor = store.history(limit=MAX_PAGE_SIZE + 50)
+    assert len(entries) == MAX_PAGE_SIZE
+    assert cursor is not None
+
+
+def test_history_endpoint_pages_with_string_cursor(make_api):
+    _, api = make_api()
+    api.audit_store.write([AuditEntry('ban', user_id=10 ** 18 + i, guild_id=1, created_at=1000.0 + i)
+                           for i in range(3)])
+
+    async def scenario():
+        async with serve(api) as client:
+            first = await (await client.get('/api/moderation/history?limit=2', headers=AUTH)).json()
+            second = await (await client.get(
+                f"/api/moderation/history?limit=2&cursor={first['next_cursor']}", headers=AUTH)).json()
+            return first, second
+
+    first, second = asyncio.run(scenario())
+    assert [entry['id'] for entry in first['entries']] == ['3', '2']
+    assert first['next_cursor'] == '2'
+    assert [entry['id'] for entry in second['entries']] == ['1']
+    assert second['entries'][0]['user_id'] == str(10 ** 18)
+    assert second['next_cursor'] is None
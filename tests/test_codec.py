@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from conftest import AUTH, serve
+from monroe_api import codec
+
+msgpack = pytest.importorskip('msgpack')
+
+
+class FakeRequest:
+    def __init__(self, accept=''):
+        self.headers = {'Accept': accept} if accept else {}
+
+
+def test_json_round_trip():
+    body, media_type = codec.encode({'name': 'Monroe 🏖️', 'count': 2})
+    assert media_type == codec.JSON
+    assert codec.decode(body, codec.JSON) == {'name': 'Monroe 🏖️', 'count': 2}
+    assert codec.decode(body, None) == {'name': 'Monroe 🏖️', 'count': 2}
+    with pytest.raises(codec.DecodeError, match='Invalid JSON body'):
+        codec.decode(b'{"name":', codec.JSON)
+    with pytest.raises(codec.DecodeError, match='Invalid JSON body'):
+        codec.decode(b'\xff\xfe', codec.JSON)
+
+
+def test_negotiation_follows_accept():
+    assert codec.negotiate(FakeRequest()) == codec.JSON
+    assert codec.negotiate(FakeRequest('application/json')) == codec.JSON
+    assert codec.negotiate(FakeRequest('application/msgpack')) == codec.MSGPACK
+    assert codec.negotiate(FakeRequest('application/x-msgpack, application/json;q=0.5')) == codec.MSGPACK
+
+
+def test_msgpack_round_trip():
+    body, media_type = codec.encode({'ids': [1, 2]}, codec.MSGPACK)
+    assert media_type == codec.MSGPACK
+    assert msgpack.unpackb(body) == {'ids': [1, 2]}
+    assert codec.decode(body, 'application/x-msgpack') == {'ids': [1, 2]}
+    with pytest.raises(codec.DecodeError, match='Invalid msgpack body'):
+        codec.decode(b'\xc1', codec.MSGPACK)
+
+
+def test_without_msgpack_everything_is_json(monkeypatch):
+    monkeypatch.setattr(codec, 'msgpack', None)
+    assert not codec.msgpack_available()
+    assert codec.negotiate(FakeRequest('application/msgpack')) == codec.JSON
+    assert codec.encode({'a': 1}, codec.MSGPACK) == (codec.dumps({'a': 1}), codec.JSON)
+    with pytest.raises(codec.DecodeError, match='not supported'):
+        codec.decode(msgpack.packb({'a': 1}), codec.MSGPACK)
+
+
+def test_msgpack_over_http(make_api, monkeypatch):
+    _, api = make_api()
+    headers = {**AUTH, 'Content-Type': codec.MSGPACK, 'Accept': codec.MSGPACK}
+    body = msgpack.packb({'message': 7})
+
+    async def scenario():
+        async with serve(api) as client:
+            response = await client.post('/api/broadcast', data=body, headers=headers)
+            first = response.status, response.content_type, await response.read()
+            monkeypatch.setattr(codec, 'msgpack', None)
+            response = await client.post('/api/broadcast', data=body, headers=headers)
+            return first, (response.status, response.content_type, await response.json())
+
+    with_msgpack, without = asyncio.run(scenario())
+    assert with_msgpack[:2] == (400, codec.MSGPACK)
+    assert msgpack.unpackb(with_msgpack[2]) == {'error': 'Invalid input', 'errors': [
+        {'path': ['message'], 'message': 'Expected string'}]}
+    assert without == (400, codec.JSON, {'error': 'msgpack bodies are not supported by this server'})
@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import pytest
+
+from monroe_api.config import LiveConfig
+
+DEFAULTS = {
+    'qotd_channels': ['qotd'],
+    'qotd_channel_ids': [],
+    'mention_everyone': ['announcement'],
+}
+
+
+def test_defaults_without_a_file(tmp_path):
+    config = LiveConfig(DEFAULTS, str(tmp_path / 'config.json'))
+    assert config.values == DEFAULTS
+    assert config.version == 0
+    assert config.to_dict()['overridden'] == []
+
+
+def test_update_round_trip(tmp_path):
+    path = tmp_path / 'config.json'
+    config = LiveConfig(DEFAULTS, str(path))
+    seen = []
+    config.add_listener(seen.append)
+    etag = config.etag
+    asyncio.run(config.update({'qotd_channel_ids': ['123'], 'unknown': 1}, updated_by='admin'))
+
+    assert config.values['qotd_channel_ids'] == ['123']
+    assert 'unknown' not in config.values
+    assert config.version == 1
+    assert config.etag != etag
+    assert seen == [config.values]
+    saved = json.loads(path.read_text())
+    assert saved['overrides'] == {'qotd_channel_ids': ['123']}
+    assert saved['updated_by'] == 'admin'
+
+    reloaded = LiveConfig(DEFAULTS, str(path))
+    assert reloaded.values == config.values
+    assert reloaded.version == 1
+    assert reloaded.etag == config.etag
+
+
+def test_new_code_default_applies_to_keys_not_overridden(tmp_path):
+    path = tmp_path / 'config.json'
+    config = LiveConfig(DEFAULTS, str(path))
+    asyncio.run(config.update({'qotd_channel_ids': ['123']}))
+
+    defaults = {**DEFAULTS, 'qotd_channels': ['question-of-the-day']}
+    reloaded = LiveConfig(defaults, str(path))
+    assert reloaded.values['qotd_channels'] == ['question-of-the-day']
+    assert reloaded.values['qotd_channel_ids'] == ['123']
+
+
+def test_setting_a_key_back_to_its_default_drops_the_override(tmp_path):
+    path = tmp_path / 'config.json'
+    config = LiveConfig(DEFAULTS, str(path))
+    asyncio.run(config.update({'qotd_channels': ['other']}))
+    assert config.to_dict()['overridden'] == ['qotd_channels']
+    asyncio.run(config.update({'qotd_channels': ['qotd']}))
+    assert config.overrides == {}
+    assert json.loads(path.read_text())['overrides'] == {}
+
+
+def test_legacy_file_with_every_value(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({'version': 4, 'values': {**DEFAULTS, 'mention_everyone': []}}))
+    config = LiveConfig(DEFAULTS, str(path))
+    assert config.version == 4
+    assert config.overrides == {'mention_everyone': []}
+    assert config.values['mention_everyone'] == []
+
+
+def test_unreadable_file_keeps_defaults(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text('{not json')
+    config = LiveConfig(DEFAULTS, str(path))
+    assert config.values == DEFAULTS
+    assert config.version == 0
+
+
+def test_failed_save_leaves_config_unchanged(tmp_path):
+    config = LiveConfig(DEFAULTS, str(tmp_path / 'missing' / 'config.json'))
+    with pytest.raises(OSError):
+        asyncio.run(config.update({'qotd_channels': ['other']}))
+    assert config.values == DEFAULTS
+    assert config.version == 0
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from monroe_api.delivery import DeliverySummary, DeliveryTarget, deliver, fan_out
+
+
+def target(channel_id, guild='Monroe'):
+    return DeliveryTarget(SimpleNamespace(name=guild), SimpleNamespace(id=channel_id, name=f'channel-{channel_id}'))
+
+
+class Recorder:
+    """A send that takes ``delay`` seconds and records concurrency per channel"""
+
+    def __init__(self, delay=0.01, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.active = 0
+        self.peak = 0
+        self.active_by_bucket = {}
+        self.overlapped = False
+        self.order = []
+        self.started = {}
+
+    async def __call__(self, target):
+        bucket = target.bucket
+        self.started.setdefault(bucket, []).append(time.monotonic())
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.active_by_bucket[bucket] = self.active_by_bucket.get(bucket, 0) + 1
+        if self.active_by_bucket[bucket] > 1:
+            self.overlapped = True
+        try:
+            await asyncio.sleep(self.delay)
+            self.order.append(target)
+            if bucket in self.failing:
+                raise RuntimeError(f'Missing Access in {bucket}')
+            return f'message-{bucket}'
+        finally:
+            self.active -= 1
+            self.active_by_bucket[bucket] -= 1
+
+
+async def collect(targets, send, **kwargs):
+    return [result async for result in fan_out(targets, send, **kwargs)]
+
+
+def test_every_target_gets_a_result():
+    send = Recorder(failing={2})
+    results = asyncio.run(collect([target(1), target(2), target(3)], send))
+    assert len(results) == 3
+    by_channel = {result.target.channel.id: result for result in results}
+    assert by_channel[1].ok and by_channel[1].message == 'message-1'
+    assert not by_channel[2].ok
+    assert str(by_channel[2].error) == 'Missing Access in 2'
+    assert all(result.elapsed > 0 for result in results)
+
+
+def test_no_targets():
+    assert asyncio.run(collect([], Recorder())) == []
+
+
+def test_distinct_buckets_run_concurrently():
+    send = Recorder(delay=0.05)
+    started = time.monotonic()
+    asyncio.run(collect([target(i) for i in range(10)], send))
+    assert send.peak == 10
+    assert time.monotonic() - started < 0.4
+
+
+def test_same_bucket_is_sent_in_order():
+    send = Recorder()
+    targets = [target(7, guild=f'guild-{i}') for i in range(4)] + [target(8)]
+    asyncio.run(collect(targets, send))
+    assert not send.overlapped
+    assert [t.guild.name for t in send.order if t.bucket == 7] == ['guild-0', 'guild-1', 'guild-2', 'guild-3']
+
+
+def test_max_in_flight_is_respected():
+    send = Recorder()
+    results = asyncio.run(collect([target(i) for i in range(20)], send, max_in_flight=3))
+    assert len(results) == 20
+    assert send.peak == 3
+
+
+def test_spread_staggers_start_times():
+    send = Recorder(delay=0)
+
+    async def scenario():
+        started = time.monotonic()
+        await collect([target(i) for i in range(4)], send, spread=0.2)
+        return started
+
+    started = asyncio.run(scenario())
+    offsets = sorted(times[0] - started for times in send.started.values())
+    # Target i of 4 starts no earlier than i * 0.05s
+    for index, offset in enumerate(offsets):
+        assert offset >= index * 0.05 - 0.005
+    assert offsets[-1] < 0.3
+
+
+def test_closing_early_cancels_pending_sends():
+    cancelled = []
+
+    async def send(target):
+        if target.bucket == 2:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(target)
+                raise
+
+    async def scenario():
+        generator = fan_out([target(1), target(2)], send)
+        first = await generator.__anext__()
+        await generator.aclose()
+        return first
+
+    first = asyncio.run(scenario())
+    assert first.ok and first.target.bucket == 1
+    assert [t.bucket for t in cancelled] == [2]
+
+
+def test_deliver_aggregates_results(caplog):
+    send = Recorder(failing={2, 4})
+    with caplog.at_level('INFO', logger='monroe_api.delivery'):
+        summary = asyncio.run(deliver([target(i) for i in range(5)], send, label='QOTD'))
+    assert isinstance(summary, DeliverySummary)
+    assert (summary.sent, summary.failed) == (3, 2)
+    assert len(summary.results) == 5
+    assert sum('QOTD sent to Monroe' in record.message for record in caplog.records) == 3
+    assert sum('Failed to send qotd to Monroe' in record.message for record in caplog.records) == 2
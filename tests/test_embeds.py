@@ -0,0 +1,52 @@
+import pytest
+
+from monroe_api import embeds
+from monroe_api.embeds import EmbedTemplate, FrozenEmbed
+
+
+def test_render_fills_placeholders():
+    embed = embeds.WARNING_NOTICE.render(guild='Monroe', reason='Spam', moderator='admin')
+    assert isinstance(embed, FrozenEmbed)
+    assert embed.description == 'You were warned in Monroe'
+    assert [field.value for field in embed.fields] == ['Spam', 'admin']
+    assert 'timestamp' in embed.to_dict()
+
+
+def test_missing_values_are_reported():
+    with pytest.raises(KeyError, match='moderator'):
+        embeds.WARNING_NOTICE.payload(guild='Monroe', reason='Spam')
+
+
+def test_to_dict_returns_the_rendered_payload():
+    embed = embeds.BROADCAST.render(message='Hello', author='admin')
+    assert embed.to_dict() is embed.to_dict()
+    assert embed.to_dict()['footer'] == {'text': 'Sent from Monroe Dashboard'}
+
+
+def test_editing_a_render_leaves_the_template_alone():
+    edited = embeds.MANAGEMENT.render().add_field(name='Extra', value='Field')
+    edited.to_dict()['footer']['text'] = 'Changed'
+    assert len(edited.to_dict()['fields']) == 5
+
+    fresh = embeds.MANAGEMENT.render()
+    assert len(fresh.fields) == 4
+    assert fresh.footer.text == 'Monroe Social Club - 1980s Beach Paradise 🌴'
+
+
+def test_editing_a_dynamic_render_leaves_the_template_alone():
+    values = {'mention': '<@1>', 'avatar_url': 'https://a/1.png', 'bot_avatar_url': 'https://a/bot.png'}
+    embeds.WELCOME.render(**values).to_dict()['fields'].clear()
+    assert len(embeds.WELCOME.render(**values).fields) == 6
+
+
+def test_setting_an_attribute_drops_the_cached_payload():
+    embed = embeds.ANNOUNCEMENT.render(title='News', content='Body', author='admin')
+    embed.set_footer(text='Other')
+    assert embed.to_dict()['footer'] == {'text': 'Other'}
+
+
+def test_static_template():
+    template = EmbedTemplate.build(title='Fixed', color=1, timestamp=False)
+    assert template.placeholders == frozenset()
+    assert template.payload() == {'title': 'Fixed', 'color': 1, 'type': 'rich'}
+    assert template.payload() is not template.payload()
@@ -0,0 +1,236 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import discord
+import pytest
+import yarl
+from discord.gateway import ReconnectWebSocket
+
+from monroe_api import gateway
+from monroe_api.gateway import GatewaySession, ResumableBot, SessionStore
+
+BOT_ID = 1
+GUILD_ID = 100
+USER = {'id': str(BOT_ID), 'username': 'monroe', 'discriminator': '0', 'avatar': None, 'global_name': None}
+
+
+class FakeWebSocket:
+    """Stands in for ``DiscordWebSocket``; ``script`` runs one step per poll"""
+
+    def __init__(self, bot, params, script):
+        self.bot = bot
+        self.params = params
+        self.session_id = params.get('session') or 'new-session'
+        self.sequence = params.get('sequence') or 0
+        self.gateway = params.get('gateway') or yarl.URL('wss://gateway.discord.gg')
+        self.open = True
+        self.close_code = None
+        self._script = list(script)
+        self._closed = asyncio.Event()
+
+    async def poll_event(self):
+        if self._script:
+            step = self._script.pop(0)
+            self.sequence += 1
+            step(self)
+            return
+        await self._closed.wait()
+        raise discord.ConnectionClosed(SimpleNamespace(close_code=self.close_code), shard_id=None,
+                                       code=self.close_code)
+
+    async def close(self, code=4000):
+        self.open = False
+        self.close_code = code
+        self._closed.set()
+
+
+def resumed(ws):
+    ws.bot.dispatch('resumed')
+
+
+def ready(ws):
+    # What READY ends with once discord.py has parsed it
+    ws.bot._connection.call_handlers('ready')
+
+
+def invalid_session(ws):
+    raise ReconnectWebSocket(None, resume=False)
+
+
+class FakeGateway:
+    """Records every connection and hands out scripted fake sockets"""
+
+    def __init__(self, *scripts):
+        self.scripts = list(scripts)
+        self.connections = []
+
+    async def from_client(self, client, **params):
+        ws = FakeWebSocket(client, params, self.scripts.pop(0) if self.scripts else [])
+        self.connections.append(ws)
+        return ws
+
+
+class FakeHttp:
+    def __init__(self, guilds=(GUILD_ID,)):
+        self.guilds = set(guilds)
+        self.loaded = []
+
+    async def get_guild(self, guild_id, with_counts=True):
+        if guild_id not in self.guilds:
+            raise discord.NotFound(SimpleNamespace(status=404, reason='Not Found'), 'Unknown Guild')
+        self.loaded.append(guild_id)
+        return {'id': str(guild_id), 'name': 'Monroe', 'roles': [], 'emojis': [], 'stickers': [],
+                'features': [], 'approximate_member_count': 42}
+
+    async def get_all_guild_channels(self, guild_id):
+        return [{'id': '200', 'type': 0, 'name': 'general', 'position': 0, 'permission_overwrites': [],
+                 'flags': 0, 'guild_id': str(guild_id)}]
+
+    async def get_member(self, guild_id, user_id):
+        return {'user': USER, 'roles': [], 'joined_at': '2024-01-01T00:00:00+00:00', 'deaf': False, 'mute': False,
+                'flags': 0}
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_gateway(monkeypatch):
+    def install(*scripts):
+        fake = FakeGateway(*scripts)
+        monkeypatch.setattr(gateway.DiscordWebSocket, 'from_client', fake.from_client)
+        return fake
+
+    return install
+
+
+def make_bot(tmp_path, **kwargs):
+    bot = ResumableBot(command_prefix='!', intents=discord.Intents(guilds=True),
+                       session_store=SessionStore(str(tmp_path / 'session.json')), **kwargs)
+    bot.http = FakeHttp()
+    bot._connection.user = discord.ClientUser(state=bot._connection, data=USER)
+    return bot
+
+
+def save_session(tmp_path, **changes):
+    values = {'session_id': 'old-session', 'sequence': 41, 'resume_url': 'wss://resume.discord.gg',
+              'user_id': BOT_ID, 'guild_ids': [GUILD_ID], **changes}
+    SessionStore(str(tmp_path / 'session.json')).save(GatewaySession(**values))
+
+
+async def run_until_ready(bot):
+    """Connect, wait for on_ready, then close the way SIGTERM would"""
+    await bot._async_setup_hook()
+    ready_events = []
+
+    async def on_ready():
+        ready_events.append(True)
+
+    bot.add_listener(on_ready, 'on_ready')
+    connecting = asyncio.create_task(bot.connect())
+    waiting = asyncio.create_task(bot.wait_until_ready())
+    await asyncio.wait({connecting, waiting}, timeout=5, return_when=asyncio.FIRST_COMPLETED)
+    if connecting.done():
+        # Failed before ready; surface why
+        waiting.cancel()
+        connecting.result()
+    assert bot.is_ready()
+    await asyncio.sleep(0)
+    await bot.close()
+    await asyncio.wait_for(connecting, timeout=5)
+    return ready_events
+
+
+def test_session_store_is_read_once(tmp_path):
+    save_session(tmp_path)
+    store = SessionStore(str(tmp_path / 'session.json'))
+    assert store.take().session_id == 'old-session'
+    assert store.take() is None
+
+
+def test_saved_session_is_resumed(tmp_path, fake_gateway):
+    fake = fake_gateway([resumed])
+    save_session(tmp_path)
+    bot = make_bot(tmp_path)
+
+    ready_events = asyncio.run(run_until_ready(bot))
+
+    first = fake.connections[0]
+    assert first.params['resume'] is True
+    assert (first.params['session'], first.params['sequence']) == ('old-session', 41)
+    assert str(first.params['gateway']) == 'wss://resume.discord.gg'
+    assert len(fake.connections) == 1
+    # The guild came over REST, since no READY was sent
+    assert bot.http.loaded == [GUILD_ID]
+    guild = bot.get_guild(GUILD_ID)
+    assert guild.member_count == 42
+    assert [channel.name for channel in guild.text_channels] == ['general']
+    assert ready_events == [True]
+    assert bot.gateway_startup['path'] == 'resume'
+    assert bot.gateway_startup['guilds'] == 1
+
+    # Closing saved the session again and kept it alive on Discord's side
+    assert first.close_code == 4000
+    saved = SessionStore(str(tmp_path / 'session.json')).take()
+    assert (saved.session_id, saved.sequence, saved.guild_ids) == ('old-session', 42, [GUILD_ID])
+
+
+def test_no_session_identifies(tmp_path, fake_gateway):
+    fake = fake_gateway([ready])
+    bot = make_bot(tmp_path)
+
+    asyncio.run(run_until_ready(bot))
+
+    assert fake.connections[0].params.get('resume', False) is False
+    assert fake.connections[0].params['initial'] is True
+    assert bot.gateway_startup['path'] == 'identify'
+    assert bot.gateway_startup['reason'] == 'no saved session'
+    assert bot.http.loaded == []
+
+
+@pytest.mark.parametrize('changes, reason', [
+    ({'saved_at': time.time() - 3600}, 'saved session expired'),
+    ({'user_id': 2}, 'saved session belongs to another bot user'),
+    ({'guild_ids': list(range(5))}, '5 guilds is too many to load over REST'),
+])
+def test_unusable_session_identifies(tmp_path, fake_gateway, changes, reason):
+    fake_gateway([ready])
+    save_session(tmp_path, **changes)
+    bot = make_bot(tmp_path, max_resume_guilds=3)
+
+    asyncio.run(run_until_ready(bot))
+
+    assert bot.gateway_startup['path'] == 'identify'
+    assert bot.gateway_startup['reason'].startswith(reason)
+
+
+def test_rejected_resume_falls_back_to_identify(tmp_path, fake_gateway):
+    fake = fake_gateway([invalid_session], [ready])
+    save_session(tmp_path)
+    bot = make_bot(tmp_path)
+
+    asyncio.run(run_until_ready(bot))
+
+    assert [ws.params.get('resume', False) for ws in fake.connections] == [True, False]
+    assert bot.gateway_startup['path'] == 'identify'
+    assert bot.gateway_startup['reason'] == 'resume failed: session invalidated'
+
+
+def test_missing_internals_always_identify(tmp_path, fake_gateway, monkeypatch):
+    monkeypatch.setattr(gateway, 'MISSING_INTERNALS', ['ConnectionState._add_guild_from_data'])
+    fake = fake_gateway([ready])
+    save_session(tmp_path)
+    bot = make_bot(tmp_path)
+
+    asyncio.run(run_until_ready(bot))
+
+    assert fake.connections[0].params.get('resume', False) is False
+    assert 'cannot resume' in bot.gateway_startup['reason']
+    # Nothing saved either: a 4000 close would leave a session nobody resumes
+    assert fake.connections[0].close_code == 1000
+    assert not (tmp_path / 'session.json').exists()
+
+
+def test_installed_discord_py_has_the_internals():
+    assert gateway.MISSING_INTERNALS == []
@@ -0,0 +1,148 @@
+import asyncio
+import json
+
+from aiohttp import web
+
+from monroe_api.idempotency import HEADER, REPLAYED_HEADER, IdempotencyStore
+
+
+class FakeRequest:
+    def __init__(self, body=b'{}', key='key-1', path='/api/broadcast'):
+        self.method = 'POST'
+        self.path = path
+        self.content_type = 'application/json'
+        self.headers = {HEADER: key}
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+
+class CountingHandler:
+    def __init__(self, status=202, delay=0.0):
+        self.calls = 0
+        self.status = status
+        self.delay = delay
+
+    async def __call__(self, request):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return web.json_response({'job_id': f'job-{self.calls}'}, status=self.status)
+
+
+def body_of(response):
+    return json.loads(response.body)
+
+
+def test_repeat_is_replayed():
+    store = IdempotencyStore()
+    handler = CountingHandler()
+
+    async def scenario():
+        first = await store.run(FakeRequest(), handler)
+        second = await store.run(FakeRequest(), handler)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert handler.calls == 1
+    assert REPLAYED_HEADER not in first.headers
+    assert second.headers[REPLAYED_HEADER] == 'true'
+    assert second.status == 202
+    assert body_of(second) == body_of(first) == {'job_id': 'job-1'}
+    assert (store.executed, store.replayed) == (1, 1)
+
+
+def test_concurrent_repeats_share_one_run():
+    store = IdempotencyStore()
+    handler = CountingHandler(delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(*(store.run(FakeRequest(), handler) for _ in range(3)))
+
+    responses = asyncio.run(scenario())
+    assert handler.calls == 1
+    assert store.coalesced == 2
+    assert {body_of(response)['job_id'] for response in responses} == {'job-1'}
+    assert store._inflight == {}
+
+
+def test_same_key_with_another_body_is_rejected():
+    store = IdempotencyStore()
+    handler = CountingHandler()
+
+    async def scenario():
+        await store.run(FakeRequest(b'{"message": "a"}'), handler)
+        return await store.run(FakeRequest(b'{"message": "b"}'), handler)
+
+    response = asyncio.run(scenario())
+    assert response.status == 422
+    assert handler.calls == 1
+
+
+def test_mismatch_while_first_is_running():
+    store = IdempotencyStore()
+    handler = CountingHandler(delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(store.run(FakeRequest(b'{"message": "a"}'), handler),
+                                    store.run(FakeRequest(b'{"message": "b"}'), handler))
+
+    first, second = asyncio.run(scenario())
+    assert first.status == 202
+    assert second.status == 422
+    assert handler.calls == 1
+
+
+def test_keys_are_scoped_to_the_path():
+    store = IdempotencyStore()
+    handler = CountingHandler()
+
+    async def scenario():
+        await store.run(FakeRequest(path='/api/broadcast'), handler)
+        await store.run(FakeRequest(path='/api/announcement'), handler)
+
+    asyncio.run(scenario())
+    assert handler.calls == 2
+
+
+def test_server_errors_are_not_stored():
+    store = IdempotencyStore()
+    handler = CountingHandler(status=503)
+
+    async def scenario():
+        await store.run(FakeRequest(), handler)
+        return await store.run(FakeRequest(), handler)
+
+    response = asyncio.run(scenario())
+    assert handler.calls == 2
+    assert REPLAYED_HEADER not in response.headers
+
+
+def test_handler_error_can_be_retried():
+    store = IdempotencyStore()
+    calls = []
+
+    async def flaky(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise RuntimeError('boom')
+        return web.json_response({'ok': True})
+
+    async def scenario():
+        try:
+            await store.run(FakeRequest(), flaky)
+        except RuntimeError:
+            pass
+        return await store.run(FakeRequest(), flaky)
+
+    response = asyncio.run(scenario())
+    assert response.status == 200
+    assert len(calls) == 2
+
+
+def test_invalid_key():
+    store = IdempotencyStore()
+    handler = CountingHandler()
+    response = asyncio.run(store.run(FakeRequest(key='x' * 300), handler))
+    assert response.status == 400
+    assert handler.calls == 0
@@ -0,0 +1,82 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from monroe_api.delivery import DeliveryTarget
+from monroe_api.jobs import CANCELLED, JobQueue, QueueFull
+
+
+def targets(count):
+    return [DeliveryTarget(SimpleNamespace(name=f'guild-{i}'), SimpleNamespace(id=i)) for i in range(count)]
+
+
+async def ok(target):
+    return None
+
+
+async def fails_odd(target):
+    if target.channel.id % 2:
+        raise RuntimeError('Missing Access')
+
+
+async def wait_for(job):
+    while not job.done:
+        await asyncio.sleep(0.001)
+
+
+def test_job_counts_sends_and_failures():
+    queue = JobQueue(workers=1)
+
+    async def scenario():
+        queue.start()
+        job = queue.submit('broadcast', targets(4), fails_odd, skipped=1)
+        await wait_for(job)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == 'completed'
+    assert (job.total, job.sent, job.failed, job.pending) == (5, 2, 3, 0)
+
+
+def test_full_queue_is_refused():
+    queue = JobQueue(maxsize=1)
+    queue.submit('broadcast', targets(1), ok)
+    with pytest.raises(QueueFull):
+        queue.submit('broadcast', targets(1), ok)
+
+
+def test_stop_cancels_running_and_queued_jobs():
+    queue = JobQueue(workers=1)
+
+    async def slow(target):
+        await asyncio.sleep(10)
+
+    async def scenario():
+        queue.start()
+        running = queue.submit('broadcast', targets(1), slow)
+        waiting = queue.submit('broadcast', targets(1), slow)
+        while running.status != 'running':
+            await asyncio.sleep(0.001)
+        await queue.stop()
+        return running, waiting
+
+    running, waiting = asyncio.run(scenario())
+    assert running.status == waiting.status == 'cancelled'
+    assert running.done and waiting.done
+    assert waiting.error == CANCELLED
+    assert queue.depth == 0
+
+
+def test_history_evicts_oldest_finished_jobs_only():
+    queue = JobQueue(history=3)
+    unfinished = queue.submit('broadcast', targets(1), ok)
+    finished = []
+    for _ in range(3):
+        job = queue.submit('broadcast', targets(1), ok)
+        job.status = 'completed'
+        finished.append(job)
+    # The queued job stays; the oldest finished one makes room
+    assert list(queue.jobs) == [unfinished.id, finished[1].id, finished[2].id]
+    assert queue.get(finished[0].id) is None
@@ -0,0 +1,62 @@
+import pytest
+
+from monroe_api.membercache import CompactMemberStore, member_cache_options
+
+
+def test_load_sorts_and_deduplicates():
+    store = CompactMemberStore()
+    store.load(1, [30, 10, 20, 10])
+    assert list(store._members[1]) == [10, 20, 30]
+    assert len(store) == 3
+    assert store.nbytes == 24
+    assert store.is_complete(1)
+
+
+def test_add_and_discard_keep_order():
+    store = CompactMemberStore()
+    store.add(1, 20)
+    store.add(1, 10)
+    store.add(1, 30)
+    store.add(1, 20)
+    assert list(store._members[1]) == [10, 20, 30]
+    store.discard(1, 20)
+    store.discard(1, 99)
+    store.discard(2, 10)
+    assert list(store._members[1]) == [10, 30]
+    # Only load() marks a guild's list as complete
+    assert not store.is_complete(1)
+
+
+def test_contains_and_guild_lookup():
+    store = CompactMemberStore()
+    store.load(1, [10, 20])
+    store.load(2, [20, 30])
+    assert store.contains(1, 10)
+    assert not store.contains(1, 30)
+    assert not store.contains(3, 10)
+    assert store.guild_ids_for(20) == [1, 2]
+    assert store.guild_ids_for(40) == []
+
+
+def test_large_ids_fit():
+    store = CompactMemberStore()
+    snowflake = 1234567890123456789
+    store.add(1, snowflake)
+    assert store.contains(1, snowflake)
+
+
+def test_forget():
+    store = CompactMemberStore()
+    store.load(1, [10])
+    store.forget(1)
+    store.forget(2)
+    assert not store.contains(1, 10)
+    assert not store.is_complete(1)
+    assert len(store) == 0
+
+
+def test_member_cache_options():
+    assert member_cache_options('full') == {}
+    assert member_cache_options('compact')['chunk_guilds_at_startup'] is False
+    with pytest.raises(ValueError):
+        member_cache_options('tiny')
@@ -0,0 +1,172 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from monroe_api.moderation import BULK_BAN_CHUNK, BulkOutcome, bulk_moderate, parse_user_ids
+
+
+def http_error(cls, status, message='Error'):
+    return cls(SimpleNamespace(status=status, reason=message), message)
+
+
+class StubGuild:
+    """Records bulk and single bans; ``bulk_error`` is raised by every bulk_ban call"""
+
+    def __init__(self, bulk_error=None, rejected=(), missing=(), has_bulk_ban=True):
+        self.id = 1
+        self.name = 'Monroe'
+        self.bulk_error = bulk_error
+        # Ids the bulk route reports as failed, and ids single bans/kicks can't find
+        self.rejected = set(rejected)
+        self.missing = set(missing)
+        self.bulk_calls = []
+        self.single_bans = []
+        self.kicks = []
+        self.members = {}
+        if has_bulk_ban:
+            self.bulk_ban = self._bulk_ban
+
+    async def _bulk_ban(self, users, reason=None, delete_message_seconds=0):
+        self.bulk_calls.append(([user.id for user in users], reason, delete_message_seconds))
+        if self.bulk_error is not None:
+            raise self.bulk_error
+        return SimpleNamespace(banned=[user for user in users if user.id not in self.rejected],
+                               failed=[user for user in users if user.id in self.rejected])
+
+    async def ban(self, user, reason=None, delete_message_seconds=0):
+        if user.id in self.missing:
+            raise http_error(discord.NotFound, 404, 'Unknown User')
+        self.single_bans.append(user.id)
+
+    async def kick(self, user, reason=None):
+        if user.id in self.missing:
+            raise http_error(discord.NotFound, 404, 'Unknown Member')
+        self.kicks.append(user.id)
+
+    def get_member(self, user_id):
+        return self.members.get(user_id)
+
+
+class StubMember:
+    def __init__(self, user_id, dm_error=None):
+        self.id = user_id
+        self.display_name = f'user{user_id}'
+        self.dm_error = dm_error
+        self.dms = []
+
+    async def send(self, embed=None):
+        if self.dm_error is not None:
+            raise self.dm_error
+        self.dms.append(embed)
+
+
+def moderate(guild, action, user_ids, **kwargs):
+    return asyncio.run(bulk_moderate(guild, action, user_ids, 'Raid', **kwargs))
+
+
+def as_tuples(outcomes):
+    return [(outcome.user_id, outcome.success, outcome.message) for outcome in outcomes]
+
+
+def test_parse_user_ids():
+    assert parse_user_ids('1, 2 3,,1') == ['1', '2', '3']
+    assert parse_user_ids([1, '2', ' 2 ', '']) == ['1', '2']
+    assert parse_user_ids(None) == []
+
+
+def test_bans_are_chunked():
+    guild = StubGuild(rejected={5})
+    user_ids = [str(user_id) for user_id in range(1, BULK_BAN_CHUNK * 2 + 2)]
+    outcomes = moderate(guild, 'ban', user_ids, delete_days=2)
+
+    assert [len(call[0]) for call in guild.bulk_calls] == [BULK_BAN_CHUNK, BULK_BAN_CHUNK, 1]
+    assert all(call[1:] == ('Raid', 2 * 86400) for call in guild.bulk_calls)
+    assert [outcome.user_id for outcome in outcomes] == user_ids
+    assert outcomes[4] == BulkOutcome('5', False, 'Ban failed')
+    assert sum(outcome.success for outcome in outcomes) == len(user_ids) - 1
+    assert guild.single_bans == []
+
+
+@pytest.mark.parametrize('error', [
+    http_error(discord.NotFound, 404),
+    http_error(discord.HTTPException, 405, 'Method Not Allowed'),
+])
+def test_unavailable_bulk_route_falls_back_to_single_bans(error):
+    guild = StubGuild(bulk_error=error, missing={3})
+    outcomes = moderate(guild, 'ban', ['1', '2', '3'])
+    assert sorted(guild.single_bans) == [1, 2]
+    assert as_tuples(outcomes) == [('1', True, 'Banned'), ('2', True, 'Banned'), ('3', False, 'User not found')]
+
+
+def test_discord_py_without_bulk_ban_falls_back():
+    guild = StubGuild(has_bulk_ban=False)
+    outcomes = moderate(guild, 'ban', ['1', '2'])
+    assert guild.bulk_calls == []
+    assert sorted(guild.single_bans) == [1, 2]
+    assert all(outcome.success for outcome in outcomes)
+
+
+def test_forbidden_bulk_ban_is_not_retried_one_by_one():
+    guild = StubGuild(bulk_error=http_error(discord.Forbidden, 403, 'Missing Permissions'))
+    outcomes = moderate(guild, 'ban', ['1', '2'])
+    assert len(guild.bulk_calls) == 1
+    assert guild.single_bans == []
+    assert as_tuples(outcomes) == [('1', False, 'Insufficient permissions'), ('2', False, 'Insufficient permissions')]
+
+
+def test_other_bulk_errors_fail_the_chunk():
+    guild = StubGuild(bulk_error=http_error(discord.HTTPException, 500, 'Internal Server Error'))
+    outcomes = moderate(guild, 'ban', ['1'])
+    assert guild.single_bans == []
+    assert outcomes[0].success is False
+    assert 'Internal Server Error' in outcomes[0].message
+
+
+def test_outcomes_merge_invalid_ids_and_unreported_users():
+    guild = StubGuild()
+
+    async def partial(users, reason=None, delete_message_seconds=0):
+        # Discord only mentions some of the users
+        return SimpleNamespace(banned=users[:1], failed=[])
+
+    guild.bulk_ban = partial
+    outcomes = moderate(guild, 'ban', ['abc', '1', '2'])
+    assert as_tuples(outcomes) == [('abc', False, 'Invalid user id'), ('1', True, 'Banned'),
+                                   ('2', False, 'No result')]
+
+
+def test_kicks():
+    guild = StubGuild(missing={2})
+    outcomes = moderate(guild, 'kick', ['1', '2'])
+    assert guild.kicks == [1]
+    assert as_tuples(outcomes) == [('1', True, 'Kicked'), ('2', False, 'User not found in guild')]
+
+
+def test_warnings():
+    guild = StubGuild()
+    guild.members = {1: StubMember(1), 2: StubMember(2, dm_error=http_error(discord.Forbidden, 403))}
+    embed = discord.Embed(title='Warning')
+    outcomes = moderate(guild, 'warn', ['1', '2', '3'], warn_embed=embed)
+    assert guild.members[1].dms == [embed]
+    assert as_tuples(outcomes) == [
+        ('1', True, 'Warning sent to user1'),
+        ('2', True, 'Warning issued to user2 (DM failed)'),
+        ('3', False, 'User not found in guild'),
+    ]
+
+
+def test_warning_lookup_failure_is_reported():
+    class BrokenLocator:
+        async def get_member(self, guild, user_id):
+            raise http_error(discord.HTTPException, 503, 'Service Unavailable')
+
+    outcomes = moderate(StubGuild(), 'warn', ['1'], member_locator=BrokenLocator())
+    assert outcomes[0].success is False
+    assert outcomes[0].message.startswith('Member lookup failed')
+
+
+def test_unknown_action():
+    with pytest.raises(ValueError):
+        moderate(StubGuild(), 'mute', ['1'])
@@ -0,0 +1,179 @@
+import asyncio
+import time
+
+import discord
+import pytest
+
+from monroe_api.ratelimit import BROADCAST, MODERATION, RateLimitScheduler, retry_info, throttle_observer
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.reason = 'Too Many Requests'
+        self.headers = headers or {}
+
+
+def too_many_requests(retry_after, is_global=False):
+    headers = {'Retry-After': str(retry_after), 'X-RateLimit-Global': 'true' if is_global else 'false'}
+    return discord.HTTPException(FakeResponse(429, headers), 'You are being rate limited.')
+
+
+class Flaky:
+    """A call that is rate limited ``failures`` times before it succeeds"""
+
+    def __init__(self, failures=1, error=None):
+        self.failures = failures
+        self.error = error or (lambda: discord.RateLimited(0.05))
+        self.calls = []
+
+    async def __call__(self):
+        self.calls.append(time.monotonic())
+        if len(self.calls) <= self.failures:
+            raise self.error()
+        return 'ok'
+
+
+def test_retry_info():
+    assert retry_info(discord.RateLimited(2.5)) == (2.5, False)
+    assert retry_info(too_many_requests(1.5, is_global=True)) == (1.5, True)
+    assert retry_info(discord.HTTPException(FakeResponse(500), 'oops')) is None
+    assert retry_info(ValueError()) is None
+
+
+def test_rate_limited_call_waits_for_the_bucket_and_retries():
+    scheduler = RateLimitScheduler(global_rate=None)
+    call = Flaky()
+
+    async def scenario():
+        return await scheduler.run(call, 'POST /channels/{channel_id}/messages', 1)
+
+    assert asyncio.run(scenario()) == 'ok'
+    assert len(call.calls) == 2
+    assert call.calls[1] - call.calls[0] >= 0.04
+    stats = scheduler.stats[BROADCAST]
+    assert (stats.calls, stats.rate_limited) == (1, 1)
+    assert scheduler.in_flight == 0
+
+
+def test_cooldown_holds_other_calls_on_the_bucket():
+    scheduler = RateLimitScheduler(global_rate=None)
+    route = 'POST /channels/{channel_id}/messages'
+    started = {}
+
+    async def record(name):
+        started[name] = time.monotonic()
+
+    async def scenario():
+        first = asyncio.create_task(scheduler.run(Flaky(error=lambda: discord.RateLimited(0.1)), route, 1))
+        await asyncio.sleep(0.01)
+        limited_at = time.monotonic()
+        await asyncio.gather(scheduler.run(lambda: record('same'), route, 1),
+                             scheduler.run(lambda: record('other'), route, 2))
+        await first
+        return limited_at
+
+    limited_at = asyncio.run(scenario())
+    assert started['same'] - limited_at >= 0.08
+    assert started['other'] - limited_at < 0.05
+
+
+def test_global_limit_pauses_every_bucket():
+    scheduler = RateLimitScheduler(global_rate=None)
+    call = Flaky(error=lambda: too_many_requests(0.05, is_global=True))
+
+    async def scenario():
+        await scheduler.run(call, 'GET /guilds/{guild_id}', 1)
+        assert scheduler._global_until > 0
+
+    asyncio.run(scenario())
+    assert scheduler.global_blocks == 1
+    assert call.calls[1] - call.calls[0] >= 0.04
+
+
+def test_gives_up_after_max_retries():
+    scheduler = RateLimitScheduler(global_rate=None, max_retries=2)
+    call = Flaky(failures=10, error=lambda: discord.RateLimited(0.01))
+
+    with pytest.raises(discord.RateLimited):
+        asyncio.run(scheduler.run(call, 'PUT /guilds/{guild_id}/bans/{user_id}', 1, MODERATION))
+    assert len(call.calls) == 3
+    assert scheduler.stats[MODERATION].rate_limited == 3
+    assert scheduler.in_flight == 0
+
+
+def test_other_errors_are_not_retried():
+    scheduler = RateLimitScheduler(global_rate=None)
+    call = Flaky(error=lambda: discord.HTTPException(FakeResponse(403), 'Missing Permissions'))
+
+    with pytest.raises(discord.HTTPException):
+        asyncio.run(scheduler.run(call, 'GET /guilds/{guild_id}', 1))
+    assert len(call.calls) == 1
+
+
+def test_buckets_are_dropped_once_idle():
+    scheduler = RateLimitScheduler(global_rate=None)
+
+    async def scenario():
+        for guild_id in range(50):
+            await scheduler.run(Flaky(failures=0), 'GET /guilds/{guild_id}', guild_id)
+        await scheduler.run(Flaky(error=lambda: discord.RateLimited(0.01)), 'GET /guilds/{guild_id}', 'x')
+
+    asyncio.run(scenario())
+    assert scheduler._buckets == {}
+
+
+def test_cooling_bucket_is_kept_until_its_cooldown_passes():
+    scheduler = RateLimitScheduler(global_rate=None, max_retries=0)
+
+    async def scenario():
+        with pytest.raises(discord.RateLimited):
+            await scheduler.run(Flaky(error=lambda: discord.RateLimited(0.05)), 'GET /guilds/{guild_id}', 1)
+        assert list(scheduler._buckets) == [('GET /guilds/{guild_id}', 1)]
+        await asyncio.sleep(0.06)
+        # The next rate limit anywhere sweeps it
+        with pytest.raises(discord.RateLimited):
+            await scheduler.run(Flaky(error=lambda: discord.RateLimited(0.05)), 'GET /users/{user_id}', 2)
+        assert list(scheduler._buckets) == [('GET /users/{user_id}', 2)]
+
+    asyncio.run(scenario())
+
+
+def test_higher_priority_is_admitted_first():
+    scheduler = RateLimitScheduler(global_rate=None, max_concurrency=1)
+    order = []
+
+    async def call(name, delay=0.0):
+        await asyncio.sleep(delay)
+        order.append(name)
+
+    async def scenario():
+        busy = asyncio.create_task(scheduler.run(lambda: call('busy', 0.02), 'a'))
+        await asyncio.sleep(0)
+        broadcast = asyncio.create_task(scheduler.run(lambda: call('broadcast'), 'b', priority=BROADCAST))
+        await asyncio.sleep(0)
+        ban = asyncio.create_task(scheduler.run(lambda: call('ban'), 'c', priority=MODERATION))
+        await asyncio.gather(busy, broadcast, ban)
+
+    asyncio.run(scenario())
+    assert order == ['busy', 'ban', 'broadcast']
+
+
+def test_rate_limits_are_reported_to_the_observer():
+    scheduler = RateLimitScheduler(global_rate=None)
+
+    class Observer:
+        def __init__(self):
+            self.seen = []
+
+        def note_rate_limited(self, retry_after):
+            self.seen.append(retry_after)
+
+    observer = Observer()
+
+    async def scenario():
+        throttle_observer.set(observer)
+        await scheduler.run(Flaky(), 'GET /guilds/{guild_id}', 1)
+
+    asyncio.run(scenario())
+    assert observer.seen == [0.05]
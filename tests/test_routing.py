@@ -0,0 +1,164 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from benchmarks.fake_discord import FakeBot, FakeDiscordConfig, FakeRest
+from monroe_api.routing import DEFAULT_PREFERENCES, MOD_LOG, ChannelIndex
+
+ME = SimpleNamespace(id=1)
+
+
+class Channel:
+    def __init__(self, guild, channel_id, name, can_send=True):
+        self.guild = guild
+        self.id = channel_id
+        self.name = name
+        self.can_send = can_send
+
+    def permissions_for(self, member):
+        return discord.Permissions(send_messages=self.can_send)
+
+
+class Guild:
+    def __init__(self, guild_id, *channels, me=ME):
+        self.id = guild_id
+        self.name = f'guild-{guild_id}'
+        self.me = me
+        self.text_channels = []
+        for name in channels:
+            self.add(name)
+
+    def add(self, name, can_send=True):
+        channel = Channel(self, self.id * 100 + len(self.text_channels), name, can_send)
+        self.text_channels.append(channel)
+        return channel
+
+
+def names(index, guild):
+    return {purpose: channel.name for purpose, channel in index.refresh_guild(guild).items()}
+
+
+def test_default_preference_order():
+    guild = Guild(1, 'chat', 'general', 'news', 'announcements', 'question-of-the-day', 'qotd')
+    assert names(ChannelIndex(), guild) == {
+        'broadcast': 'general',
+        'qotd': 'qotd',
+        'announcement': 'announcements',
+    }
+
+
+def test_later_preferences_are_used_when_earlier_ones_are_missing():
+    guild = Guild(1, 'main', 'updates', 'daily-question')
+    assert names(ChannelIndex(), guild) == {
+        'broadcast': 'main',
+        'qotd': 'daily-question',
+        'announcement': 'updates',
+    }
+
+
+def test_unsendable_channels_are_skipped():
+    guild = Guild(1, 'lobby')
+    guild.add('general', can_send=False)
+    guild.add('chat')
+    assert names(ChannelIndex(), guild)['broadcast'] == 'chat'
+
+
+def test_fallback_to_first_sendable_channel():
+    guild = Guild(1)
+    guild.add('readonly', can_send=False)
+    guild.add('lobby')
+    guild.add('random')
+    index = ChannelIndex()
+    assert names(index, guild) == {purpose: 'lobby' for purpose in DEFAULT_PREFERENCES}
+    assert names(ChannelIndex(fallback=False), guild) == {}
+
+
+def test_custom_preferences():
+    index = ChannelIndex({'qotd': ['questions']}, fallback=False)
+    assert names(index, Guild(1, 'general', 'questions')) == {'qotd': 'questions'}
+
+
+def test_mod_log_ignores_permissions_and_never_falls_back():
+    guild = Guild(1, 'general')
+    assert MOD_LOG not in ChannelIndex().refresh_guild(guild)
+    guild.add('Mod-Logs', can_send=False)
+    assert ChannelIndex().refresh_guild(guild)[MOD_LOG].name == 'Mod-Logs'
+
+
+def test_without_our_member_nothing_is_sendable():
+    guild = Guild(1, 'general', me=None)
+    assert ChannelIndex().refresh_guild(guild) == {}
+
+
+def test_targets_counts_guilds_without_a_channel():
+    index = ChannelIndex(fallback=False)
+    guilds = [Guild(1, 'general'), Guild(2, 'lobby'), Guild(3, 'chat')]
+    targets, missing = index.targets(guilds, 'broadcast')
+    assert [(target.guild.id, target.channel.name) for target in targets] == [(1, 'general'), (3, 'chat')]
+    assert missing == 1
+    # Resolving indexed them on the way
+    assert len(index) == 3
+
+
+def test_rebuild_and_remove():
+    index = ChannelIndex()
+    guilds = [Guild(1, 'general'), Guild(2, 'general')]
+    index.rebuild(guilds)
+    assert len(index) == 2
+    index.remove_guild(guilds[0])
+    index.rebuild(guilds[1:])
+    assert len(index) == 1
+
+
+def test_channel_events_refresh_the_guild():
+    bot = FakeBot(FakeRest(FakeDiscordConfig()))
+    index = ChannelIndex()
+    index.attach(bot)
+    guild = Guild(1, 'lobby')
+    bot.guilds = [guild]
+
+    async def scenario():
+        await bot.dispatch('on_ready')
+        assert index.resolve(guild, 'broadcast').name == 'lobby'
+
+        general = guild.add('general')
+        await bot.dispatch('on_guild_channel_create', general)
+        assert index.resolve(guild, 'broadcast') is general
+
+        general.name = 'old-general'
+        await bot.dispatch('on_guild_channel_update', general, general)
+        assert index.resolve(guild, 'broadcast').name == 'lobby'
+
+        announcements = guild.add('announcements')
+        await bot.dispatch('on_guild_channel_create', announcements)
+        assert index.resolve(guild, 'announcement') is announcements
+        guild.text_channels.remove(announcements)
+        await bot.dispatch('on_guild_channel_delete', announcements)
+        assert index.resolve(guild, 'announcement').name == 'lobby'
+
+        await bot.dispatch('on_guild_remove', guild)
+        assert len(index) == 0
+
+    asyncio.run(scenario())
+
+
+def test_permission_changes_refresh_the_guild():
+    bot = FakeBot(FakeRest(FakeDiscordConfig()))
+    index = ChannelIndex()
+    index.attach(bot)
+    guild = Guild(1, 'general', 'chat')
+
+    async def scenario():
+        await bot.dispatch('on_guild_join', guild)
+        assert index.resolve(guild, 'broadcast').name == 'general'
+
+        guild.text_channels[0].can_send = False
+        await bot.dispatch('on_guild_role_update', SimpleNamespace(guild=guild), None)
+        assert index.resolve(guild, 'broadcast').name == 'chat'
+
+        guild.text_channels[0].can_send = True
+        await bot.dispatch('on_member_update', None, SimpleNamespace(id=bot.user.id, guild=guild))
+        assert index.resolve(guild, 'broadcast').name == 'general'
+
+    asyncio.run(scenario())
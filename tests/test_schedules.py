@@ -0,0 +1,179 @@
+import asyncio
+import time
+
+from monroe_api.schedules import PostScheduler, Schedule, ScheduleStore
+
+
+def make_schedule(next_run, every=None, **kwargs):
+    return Schedule(purpose='qotd', payload={'question': 'Favourite song?'}, next_run=next_run, every=every,
+                    **kwargs)
+
+
+def make_scheduler(tmp_path, fire=None):
+    async def queued(schedule):
+        return 'job-1'
+
+    return PostScheduler(ScheduleStore(str(tmp_path / 'schedules.db')), fire or queued)
+
+
+def test_advance_one_off_is_finished():
+    schedule = make_schedule(100.0)
+    assert schedule.advance(100.0) is False
+    assert schedule.next_run == 100.0
+
+
+def test_advance_repeating_moves_one_period():
+    schedule = make_schedule(100.0, every=60)
+    assert schedule.advance(100.0)
+    assert schedule.next_run == 160.0
+
+
+def test_advance_skips_missed_runs():
+    schedule = make_schedule(100.0, every=60)
+    assert schedule.advance(100.0 + 60 * 3 + 5)
+    assert schedule.next_run == 340.0
+
+
+def test_advance_before_due_still_moves_forward():
+    schedule = make_schedule(100.0, every=60)
+    assert schedule.advance(50.0)
+    assert schedule.next_run == 160.0
+
+
+def test_store_round_trip(tmp_path):
+    store = ScheduleStore(str(tmp_path / 'schedules.db'))
+    schedule = make_schedule(100.0, every=3600, channel_id=42, created_by='admin')
+    store.save(schedule)
+    assert schedule.id is not None
+    schedule.last_job_id = 'job-1'
+    store.save(schedule)
+    loaded, = store.load()
+    assert loaded == schedule
+    store.delete(schedule.id)
+    assert store.load() == []
+    store.close()
+
+
+def test_pop_due_returns_earliest_due(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+
+    async def scenario():
+        late = await scheduler.add(make_schedule(200.0))
+        early = await scheduler.add(make_schedule(100.0))
+        assert scheduler._pop_due(50.0) is None
+        assert scheduler._pop_due(150.0) is early
+        assert scheduler._pop_due(150.0) is None
+        assert scheduler._pop_due(250.0) is late
+        assert scheduler._pop_due(250.0) is None
+
+    asyncio.run(scenario())
+    scheduler.store.close()
+
+
+def test_pop_due_drops_stale_entries(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+
+    async def scenario():
+        removed = await scheduler.add(make_schedule(100.0))
+        moved = await scheduler.add(make_schedule(110.0))
+        await scheduler.remove(removed.id)
+        # Rescheduled: the old heap entry no longer matches next_run
+        moved.next_run = 300.0
+        scheduler._push(moved)
+        assert scheduler._pop_due(200.0) is None
+        assert scheduler._heap == [(300.0, moved.id)]
+        assert scheduler._pop_due(300.0) is moved
+
+    asyncio.run(scenario())
+    scheduler.store.close()
+
+
+def test_fire_reschedules_repeating(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+
+    async def scenario():
+        schedule = await scheduler.add(make_schedule(100.0, every=60))
+        assert scheduler._pop_due(100.0) is schedule
+        await scheduler._fire(schedule)
+        assert schedule.last_job_id == 'job-1'
+        assert schedule.last_error is None
+        assert schedule.next_run > 100.0
+        assert scheduler._heap == [(schedule.next_run, schedule.id)]
+        saved, = scheduler.store.load()
+        assert saved.next_run == schedule.next_run
+
+    asyncio.run(scenario())
+    scheduler.store.close()
+
+
+def test_fire_removes_one_off(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+
+    async def scenario():
+        schedule = await scheduler.add(make_schedule(100.0))
+        scheduler._pop_due(100.0)
+        await scheduler._fire(schedule)
+        assert scheduler.schedules == {}
+        assert scheduler.store.load() == []
+
+    asyncio.run(scenario())
+    scheduler.store.close()
+
+
+def test_failed_run_keeps_repeating_schedule(tmp_path):
+    async def broken(schedule):
+        raise RuntimeError('No channel to post in')
+
+    scheduler = make_scheduler(tmp_path, broken)
+
+    async def scenario():
+        schedule = await scheduler.add(make_schedule(100.0, every=60))
+        scheduler._pop_due(100.0)
+        await scheduler._fire(schedule)
+        assert schedule.last_error == 'No channel to post in'
+        assert schedule.last_job_id is None
+        assert schedule.id in scheduler.schedules
+        assert scheduler._heap == [(schedule.next_run, schedule.id)]
+
+    asyncio.run(scenario())
+    scheduler.store.close()
+
+
+def test_run_that_queued_nothing_is_reported(tmp_path):
+    async def nothing(schedule):
+        return None
+
+    scheduler = make_scheduler(tmp_path, nothing)
+
+    async def scenario():
+        schedule = await scheduler.add(make_schedule(100.0, every=60))
+        scheduler._pop_due(100.0)
+        await scheduler._fire(schedule)
+        assert schedule.last_error == 'Nothing was queued'
+
+    asyncio.run(scenario())
+    scheduler.store.close()
+
+
+def test_start_skips_runs_missed_while_down(tmp_path):
+    store = ScheduleStore(str(tmp_path / 'schedules.db'))
+    now = time.time()
+    repeating = make_schedule(now - 3 * 86400, every=86400)
+    one_off = make_schedule(now - 86400)
+    recent = make_schedule(now - 60)
+    for schedule in (repeating, one_off, recent):
+        store.save(schedule)
+    scheduler = make_scheduler(tmp_path)
+    scheduler.store = store
+
+    async def scenario():
+        await scheduler.start()
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert set(scheduler.schedules) == {repeating.id, recent.id}
+    assert scheduler.schedules[repeating.id].next_run > now
+    # Within the grace period: still fired on start
+    assert scheduler.schedules[recent.id].next_run == recent.next_run
+    assert {schedule.id for schedule in store.load()} == {repeating.id, recent.id}
+    store.close()
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from conftest import AUTH, serve
+from monroe_api.schemas import (MAX_DESCRIPTION, BroadcastRequest, ConfigUpdate, HistoryQuery, ModerationRequest,
+                                ValidationError)
+
+
+def issues(schema, data):
+    with pytest.raises(ValidationError) as e:
+        schema.parse(data)
+    return e.value.errors
+
+
+def test_valid_body_is_normalised():
+    request = ModerationRequest.parse({'action': 'BAN', 'user_id': 123, 'reason': '  spam  '})
+    assert request.action == 'ban'
+    assert request.user_id == '123'
+    assert request.reason == 'spam'
+    assert request.delete_days == 0
+    assert request.dashboard_user == 'Dashboard Admin'
+
+
+def test_wrong_types_are_rejected():
+    assert issues(BroadcastRequest, {'message': 42}) == [{'path': ['message'], 'message': 'Expected string'}]
+    assert issues(ModerationRequest, {'action': 'ban', 'user_id': 'abc', 'reason': 'x', 'delete_days': True}) == [
+        {'path': ['user_id'], 'message': 'Invalid Discord id'},
+        {'path': ['delete_days'], 'message': 'Expected integer'},
+    ]
+    assert issues(ConfigUpdate, {'qotd_channels': 'general'}) == [
+        {'path': ['qotd_channels'], 'message': 'Expected array'}]
+    assert issues(ConfigUpdate, {'qotd_channel_ids': ['1', 'x']}) == [
+        {'path': ['qotd_channel_ids', 1], 'message': 'Invalid Discord id'}]
+    assert issues(BroadcastRequest, ['message']) == [{'path': [], 'message': 'Expected object'}]
+
+
+def test_out_of_range_values_are_rejected():
+    assert issues(BroadcastRequest, {'message': 'x' * (MAX_DESCRIPTION + 1)}) == [
+        {'path': ['message'], 'message': f'String must contain at most {MAX_DESCRIPTION} character(s)'}]
+    assert issues(BroadcastRequest, {'message': '   '}) == [{'path': ['message'], 'message': 'Message is required'}]
+    assert issues(ModerationRequest, {'action': 'ban', 'user_id': '1', 'reason': 'x', 'delete_days': 8}) == [
+        {'path': ['delete_days'], 'message': 'Number must be less than or equal to 7'}]
+    assert issues(ModerationRequest, {'action': 'nuke', 'user_id': '1', 'reason': 'x'}) == [
+        {'path': ['action'], 'message': "Invalid enum value. Expected 'warn' | 'kick' | 'ban'"}]
+    assert issues(HistoryQuery, {'limit': '0'}) == [
+        {'path': ['limit'], 'message': 'Number must be greater than or equal to 1'}]
+
+
+def test_missing_fields_are_reported_together():
+    assert issues(ModerationRequest, {}) == [
+        {'path': ['action'], 'message': 'Required'},
+        {'path': ['user_id'], 'message': 'Required'},
+        {'path': ['reason'], 'message': 'Required'},
+    ]
+
+
+def test_unknown_fields_are_dropped():
+    request = BroadcastRequest.parse({'message': 'hi', 'everyone': True, 'channel_id': '5'})
+    assert request == BroadcastRequest(message='hi', channel_id='5')
+    assert issues(BroadcastRequest, {'everyone': True}) == [{'path': ['message'], 'message': 'Required'}]
+
+
+def test_error_shape_returned_to_client(make_api):
+    bot, api = make_api()
+
+    async def scenario():
+        async with serve(api) as client:
+            invalid = await client.post('/api/broadcast', json={'message': 7, 'channel_id': 'abc'}, headers=AUTH)
+            malformed = await client.post('/api/broadcast', data=b'{"message":',
+                                          headers={**AUTH, 'Content-Type': 'application/json'})
+            return (invalid.status, await invalid.json()), (malformed.status, await malformed.json())
+
+    invalid, malformed = asyncio.run(scenario())
+    assert invalid == (400, {'error': 'Invalid input', 'errors': [
+        {'path': ['message'], 'message': 'Expected string'},
+        {'path': ['channel_id'], 'message': 'Invalid Discord id'},
+    ]})
+    assert malformed == (400, {'error': 'Invalid JSON body'})
+    assert bot.rest.stats.calls == 0
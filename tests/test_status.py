@@ -0,0 +1,101 @@
+import asyncio
+
+from benchmarks.fake_discord import FakeMember
+from conftest import AUTH, serve
+from monroe_api import codec
+from monroe_api.status import StatusSnapshot, format_uptime
+
+
+def test_format_uptime():
+    assert format_uptime(3 * 3600 + 25 * 60 + 59) == '3h 25m'
+
+
+def test_totals_follow_guild_changes(make_api):
+    bot, _ = make_api(guilds=3, members_per_guild=4)
+    snapshot = StatusSnapshot(bot)
+    snapshot.rebuild(bot.guilds)
+    assert (snapshot.server_count, snapshot.user_count) == (3, 12)
+
+    guild = bot.guilds[0]
+    guild._members[1] = FakeMember(bot.rest, guild, 1, 'new')
+    snapshot.set_guild(guild)
+    assert snapshot.user_count == 13
+    snapshot.remove_guild(guild)
+    snapshot.remove_guild(guild)
+    assert (snapshot.server_count, snapshot.user_count) == (2, 8)
+
+
+def test_failing_listener_does_not_break_updates(make_api, caplog):
+    bot, _ = make_api()
+    snapshot = StatusSnapshot(bot)
+    seen = []
+
+    def broken(changed):
+        raise RuntimeError('feed gone')
+
+    snapshot.add_listener(broken)
+    snapshot.add_listener(seen.append)
+    snapshot.rebuild(bot.guilds)
+    assert seen == [snapshot]
+    assert snapshot.version == 1
+    assert 'Status listener failed: feed gone' in caplog.text
+
+
+def test_unchanged_status_is_a_304(make_api):
+    bot, api = make_api()
+
+    async def scenario():
+        await bot.connect()
+        async with serve(api) as client:
+            first = await client.get('/api/status', headers=AUTH)
+            body = await first.json()
+            etag = first.headers['ETag']
+            again = await client.get('/api/status', headers={**AUTH, 'If-None-Match': etag})
+            other = await client.get('/api/status', headers={**AUTH, 'If-None-Match': '"stale"'})
+            return body, etag, again, other
+
+    body, etag, again, other = asyncio.run(scenario())
+    assert body['online'] is True
+    assert body['serverCount'] == 2
+    assert again.status == 304
+    assert again.headers['ETag'] == etag
+    assert other.status == 200
+
+
+def test_etag_changes_with_guild_and_member_counts(make_api):
+    bot, api = make_api()
+
+    async def etag(client):
+        response = await client.get('/api/status', headers=AUTH)
+        return response.headers['ETag'], await response.json()
+
+    async def scenario():
+        await bot.connect()
+        async with serve(api) as client:
+            start, _ = await etag(client)
+
+            guild = bot.guilds[0]
+            member = FakeMember(bot.rest, guild, 1, 'new')
+            guild._members[member.id] = member
+            await bot.dispatch('on_member_join', member)
+            joined, joined_body = await etag(client)
+
+            await bot.dispatch('on_guild_remove', bot.guilds[1])
+            removed, removed_body = await etag(client)
+
+            stale = await client.get('/api/status', headers={**AUTH, 'If-None-Match': start})
+            return [start, joined, removed], joined_body, removed_body, stale.status
+
+    etags, joined_body, removed_body, stale_status = asyncio.run(scenario())
+    assert len(set(etags)) == 3
+    assert joined_body['userCount'] == 7
+    assert removed_body['serverCount'] == 1
+    assert stale_status == 200
+
+
+def test_etag_differs_per_encoding(make_api):
+    bot, _ = make_api()
+    snapshot = StatusSnapshot(bot)
+    _, json_etag = snapshot.render(codec.JSON)
+    _, msgpack_etag = snapshot.render(codec.MSGPACK)
+    assert json_etag != msgpack_etag
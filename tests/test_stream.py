@@ -0,0 +1,72 @@
+import asyncio
+
+from conftest import AUTH, serve
+from monroe_api.stream import EventHub, StatusFeed, Subscriber
+
+
+class FakeSnapshot:
+    def __init__(self):
+        self.listeners = []
+        self.status = {'servers': 1, 'lastSeen': 'now'}
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def payload(self):
+        return dict(self.status)
+
+
+def test_subscriber_keeps_the_latest_event_per_key():
+    subscriber = Subscriber()
+    subscriber.offer('status', 'status', {'servers': 1}, merge=True)
+    subscriber.offer('status', 'status', {'users': 5}, merge=True)
+    subscriber.offer('job:1', 'job', {'sent': 1})
+    subscriber.offer('job:1', 'job', {'sent': 2})
+    assert subscriber.drain() == [('status', {'servers': 1, 'users': 5}), ('job', {'sent': 2})]
+    assert not subscriber.wakeup.is_set()
+
+
+def test_feed_publishes_only_what_changed():
+    hub = EventHub()
+    subscriber = Subscriber()
+    hub.subscribers.add(subscriber)
+    snapshot = FakeSnapshot()
+    feed = StatusFeed(hub, snapshot)
+    feed.push_status()
+    snapshot.status['servers'] = 2
+    feed.push_status()
+    assert subscriber.drain() == [('status', {'servers': 2})]
+
+
+def test_stop_cancels_the_ticker():
+    feed = StatusFeed(EventHub(), FakeSnapshot())
+
+    async def scenario():
+        feed.start()
+        ticker = feed._ticker
+        await feed.stop()
+        await feed.stop()
+        return ticker
+
+    ticker = asyncio.run(scenario())
+    assert ticker.cancelled()
+    assert feed._ticker is None
+
+
+def test_app_cleanup_stops_the_feed(make_api):
+    bot, api = make_api()
+
+    async def scenario():
+        await bot.connect()
+        tickers = []
+        for _ in range(2):
+            async with serve(api) as client:
+                response = await client.get('/api/status', headers=AUTH)
+                assert response.status == 200
+                tickers.append(api.status_feed._ticker)
+        return tickers
+
+    tickers = asyncio.run(scenario())
+    assert tickers[0] is not tickers[1]
+    assert all(ticker.done() for ticker in tickers)
+    assert api.status_feed._ticker is None
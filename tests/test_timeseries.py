@@ -0,0 +1,104 @@
+from monroe_api.timeseries import DAY, HOUR, Bucket, StatsHistory
+
+# 2024-01-01T00:00:00Z
+MIDNIGHT = 1704067200
+
+
+class FakeBot:
+    latency = 0.05
+
+    def __init__(self, ready=True):
+        self.ready = ready
+
+    def is_ready(self):
+        return self.ready
+
+
+class FakeSnapshot:
+    def __init__(self, version=1, users=100, servers=2):
+        self.version = version
+        self.user_count = users
+        self.server_count = servers
+
+
+def rows(history, resolution):
+    with history._lock:
+        return history._connect().execute(
+            'SELECT start, members, guilds, joins, leaves, messages, latency_sum, latency_samples, latency_max '
+            'FROM stats_buckets WHERE resolution = ? ORDER BY start', (resolution,)).fetchall()
+
+
+def make_history(tmp_path, bot=None, snapshot=None):
+    return StatsHistory(bot or FakeBot(), snapshot or FakeSnapshot(), str(tmp_path / 'stats.db'))
+
+
+def test_minutes_roll_up_into_hours_and_days(tmp_path):
+    history = make_history(tmp_path)
+    history.write(Bucket(MIDNIGHT, members=100, guilds=2, joins=1, messages=5,
+                         latency_sum=0.1, latency_samples=2, latency_max=0.06))
+    history.write(Bucket(MIDNIGHT + 60, members=101, guilds=2, joins=2, leaves=1, messages=3,
+                         latency_sum=0.3, latency_samples=2, latency_max=0.2))
+    history.write(Bucket(MIDNIGHT + HOUR, members=102, guilds=3, joins=1))
+
+    assert len(rows(history, 60)) == 3
+    assert rows(history, HOUR) == [
+        (MIDNIGHT, 101, 2, 3, 1, 8, 0.4, 4, 0.2),
+        (MIDNIGHT + HOUR, 102, 3, 1, 0, 0, 0.0, 0, None),
+    ]
+    assert rows(history, DAY) == [(MIDNIGHT, 102, 3, 4, 1, 8, 0.4, 4, 0.2)]
+    history.close()
+
+
+def test_counts_written_before_ready_keep_the_last_value(tmp_path):
+    history = make_history(tmp_path)
+    history.write(Bucket(MIDNIGHT, members=100, guilds=2))
+    history.write(Bucket(MIDNIGHT + 60, joins=1))
+    assert rows(history, HOUR)[0][1:4] == (100, 2, 1)
+    assert rows(history, 60)[1][1:3] == (None, None)
+    history.close()
+
+
+def test_close_leaves_counts_empty_until_ready(tmp_path):
+    history = make_history(tmp_path, FakeBot(ready=False))
+    bucket = history._close()
+    assert (bucket.members, bucket.guilds) == (None, None)
+
+    history = make_history(tmp_path, snapshot=FakeSnapshot(version=0))
+    bucket = history._close()
+    assert (bucket.members, bucket.guilds) == (None, None)
+
+    history = make_history(tmp_path)
+    bucket = history._close()
+    assert (bucket.members, bucket.guilds) == (100, 2)
+    history.close()
+
+
+def test_sample_closes_the_minute(tmp_path):
+    history = make_history(tmp_path)
+    history._current = Bucket(MIDNIGHT)
+    assert history.sample(MIDNIGHT + 15) is None
+    finished = history.sample(MIDNIGHT + 61)
+    assert finished.start == MIDNIGHT
+    # The sample that rolled the minute over belongs to the new one
+    assert finished.latency_samples == 1
+    assert history._current.start == MIDNIGHT + 60
+    assert history._current.latency_samples == 1
+
+
+def test_retention_drops_old_minutes(tmp_path):
+    history = make_history(tmp_path)
+    history.write(Bucket(MIDNIGHT, joins=1))
+    history.write(Bucket(MIDNIGHT + 3 * DAY, joins=1))
+    assert [row[0] for row in rows(history, 60)] == [MIDNIGHT + 3 * DAY]
+    assert len(rows(history, HOUR)) == 2
+    history.close()
+
+
+def test_history_reads_the_range_resolution(tmp_path):
+    history = make_history(tmp_path)
+    history.write(Bucket(MIDNIGHT, members=100, guilds=2, joins=3))
+    resolution, buckets = history.history('24h', now=MIDNIGHT + 2 * HOUR)
+    assert resolution == HOUR
+    assert [bucket.to_dict()['joins'] for bucket in buckets] == [3]
+    assert history.history('24h', now=MIDNIGHT + 2 * DAY)[1] == []
+    history.close()
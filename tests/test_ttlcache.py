@@ -0,0 +1,53 @@
+import time
+
+from monroe_api.ttlcache import MISSING, TTLCache
+
+
+def test_get_returns_missing_for_unknown_key():
+    cache = TTLCache(2, 60)
+    assert cache.get('a') is MISSING
+    assert cache.misses == 1
+
+
+def test_none_is_a_value():
+    cache = TTLCache(2, 60)
+    cache.set('a', None)
+    assert cache.get('a') is None
+    assert cache.hits == 1
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    cache = TTLCache(2, 10)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=1)
+    now[0] += 5
+    assert cache.get('a') == 1
+    assert cache.get('b') is MISSING
+    assert len(cache) == 1
+    now[0] += 10
+    assert cache.get('a') is MISSING
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = TTLCache(2, 60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is MISSING
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_pop_and_clear():
+    cache = TTLCache(3, 60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.pop('a')
+    cache.pop('missing')
+    assert cache.get('a') is MISSING
+    cache.clear()
+    assert len(cache) == 0